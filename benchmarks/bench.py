@@ -0,0 +1,229 @@
+"""
+Benchmark suite HabitTracker: load / save / summary / export / streak / checklist.
+
+Hasil ditulis sebagai JSON supaya bisa dibandingkan antar run:
+    python benchmarks/bench.py --habits 1000 --years 5 -o bench.json
+    python benchmarks/bench.py --habits 1000 --years 5 --compare bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "habit_tracker"))
+
+from datagen import generate_dataset                # noqa: E402
+from storage import JsonStorage, MemoryStorage      # noqa: E402
+from tracker import HabitTracker                    # noqa: E402
+
+
+# tanggal akhir dataset tetap → hasil deterministik antar hari
+DATASET_END = date(2025, 12, 31)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int,
+    ops_per_call: int = 1,
+    setup: Optional[Callable[[], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Jalankan fn `repeat` kali → latency (ms per panggilan), throughput & peak memory.
+    Peak memory diukur di run terpisah (tracemalloc memperlambat timing).
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    total_s = sum(timings) / 1000
+    return {
+        "repeat": repeat,
+        "ops_per_call": ops_per_call,
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "p50_ms": round(_percentile(timings, 50), 4),
+        "p90_ms": round(_percentile(timings, 90), 4),
+        "p99_ms": round(_percentile(timings, 99), 4),
+        "max_ms": round(timings[-1], 4),
+        "ops_per_s": round(repeat * ops_per_call / total_s, 2) if total_s else None,
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    data = generate_dataset(
+        args.habits, args.years, args.completion_density, args.freeze_density, args.seed, DATASET_END
+    )
+    workdir = tempfile.mkdtemp(prefix="habit-bench-")
+    json_path = os.path.join(workdir, "habits.json")
+    csv_path = os.path.join(workdir, "week.csv")
+    JsonStorage(json_path).save(data)
+
+    storage = JsonStorage(json_path)
+    ref = DATASET_END
+    results: Dict[str, Any] = {}
+
+    def loaded(lazy: bool = False, **options: Any) -> HabitTracker:
+        t = HabitTracker(MemoryStorage(storage.load()), **options)
+        t.load(lazy=lazy)
+        return t
+
+    results["json_storage.load"] = measure(storage.load, args.repeat)
+    results["json_storage.save"] = measure(lambda: storage.save(data), args.repeat)
+
+    results["tracker.load"] = measure(lambda: loaded(), args.repeat)
+    results["tracker.load_lazy"] = measure(lambda: loaded(lazy=True), args.repeat)
+
+    # summary / export: warm = tracker yang sama di setiap run (baris diambil dari row cache),
+    # .cold = tracker baru di setup setiap run (row cache kosong, semua baris dihitung)
+    tracker = loaded()
+    habits = tracker.list_habits()
+    cold: List[HabitTracker] = []
+
+    def fresh() -> None:
+        cold[:] = [loaded()]
+
+    def warm_and_cold(name: str, fn: Callable[[HabitTracker], Any]) -> None:
+        fn(tracker)                                 # isi cache dulu → run pertama juga warm
+        results[name] = measure(lambda: fn(tracker), args.repeat)
+        results[name + ".cold"] = measure(lambda: fn(cold[0]), args.repeat, setup=fresh)
+
+    warm_and_cold("tracker.weekly_summary", lambda t: t.weekly_summary(ref))
+    warm_and_cold("tracker.summary_page", lambda t: t.summary_page(ref, 0, 50, sort="streak", descending=True))
+    warm_and_cold("tracker.export_week_csv", lambda t: t.export_week_csv(csv_path, ref))
+
+    results["habit.current_streak"] = measure(
+        lambda: [h.current_streak(ref) for h in habits], args.repeat, ops_per_call=len(habits)
+    )
+    results["habit.longest_streak"] = measure(
+        lambda: [h.longest_streak() for h in habits], args.repeat, ops_per_call=len(habits)
+    )
+
+    replayed = loaded(auto_flush=False)
+    results["tracker.replay_freezes"] = measure(replayed.replay_freezes, args.repeat, ops_per_call=len(habits))
+
+    # checklist: toggle satu hari untuk setiap habit aktif, termasuk biaya persist
+    active_ids = [h.get_id() for h in tracker.list_habits(active_only=True)][: args.toggles]
+    days = [ref - timedelta(days=i) for i in range(7)]
+
+    def toggles(t: HabitTracker) -> Callable[[], None]:
+        def run() -> None:
+            for i, hid in enumerate(active_ids):
+                d = days[i % len(days)]
+                t.set_done_on_date(hid, d, True)
+                t.set_done_on_date(hid, d, False)
+            t.flush()
+        return run
+
+    per_save = HabitTracker(JsonStorage(json_path))
+    per_save.load()
+    results["tracker.set_done_on_date.save_each"] = measure(
+        toggles(per_save), max(1, args.repeat // 5), ops_per_call=len(active_ids) * 2
+    )                                               # satu rewrite file per toggle → repeat dikurangi
+
+    write_behind = HabitTracker(JsonStorage(json_path), flush_every=10_000)
+    write_behind.load()
+    results["tracker.set_done_on_date.write_behind"] = measure(
+        toggles(write_behind), args.repeat, ops_per_call=len(active_ids) * 2
+    )
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                "habits": args.habits,
+                "years": args.years,
+                "completion_density": args.completion_density,
+                "freeze_density": args.freeze_density,
+                "seed": args.seed,
+                "repeat": args.repeat,
+                "toggles": len(active_ids),
+            },
+            "dataset_bytes": os.path.getsize(json_path),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """Cetak perbandingan p50 dengan run sebelumnya; return jumlah regresi."""
+    regressions = 0
+    print(f"{'benchmark':45} {'base p50':>10} {'now p50':>10} {'ratio':>7}")
+    for name, now in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["p50_ms"]:
+            print(f"{name:45} {'-':>10} {now['p50_ms']:>10.3f} {'new':>7}")
+            continue
+        ratio = now["p50_ms"] / base["p50_ms"]
+        flag = "  <-- regresi" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"{name:45} {base['p50_ms']:>10.3f} {now['p50_ms']:>10.3f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark HabitTracker.")
+    p.add_argument("--habits", type=int, default=500)
+    p.add_argument("--years", type=float, default=3.0)
+    p.add_argument("--completion-density", type=float, default=0.7)
+    p.add_argument("--freeze-density", type=float, default=0.3)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--repeat", type=int, default=10)
+    p.add_argument("--toggles", type=int, default=10, help="jumlah habit yang di-toggle per run checklist")
+    p.add_argument("-o", "--output", default="bench_results.json")
+    p.add_argument("--compare", help="file hasil run sebelumnya")
+    p.add_argument("--threshold", type=float, default=1.2, help="rasio p50 yang dianggap regresi")
+    args = p.parse_args()
+
+    report = run_suite(args)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+    else:
+        for name, r in report["results"].items():
+            print(f"{name:45} p50={r['p50_ms']:.3f}ms  p99={r['p99_ms']:.3f}ms  "
+                  f"{r['ops_per_s'] or 0:.0f} ops/s  peak={r['peak_mem_kb']}KB")
+    print(f"hasil → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Generator dataset sintetis (format sama dengan habits.json).
+
+Deterministik: seed + parameter yang sama → file yang sama persis.
+
+Contoh:
+    python benchmarks/datagen.py --habits 1000 --years 5 -o /tmp/habits.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import uuid
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+
+def generate_dataset(
+    habits: int = 100,
+    years: float = 1.0,
+    completion_density: float = 0.7,
+    freeze_density: float = 0.3,
+    seed: int = 42,
+    end: Optional[date] = None,
+    freeze_max_per_week: int = 1,
+) -> Dict[str, Any]:
+    """
+    - completion_density : peluang satu hari dicentang
+    - freeze_density     : peluang hari yang bolong di-freeze
+                           (tetap maksimal `freeze_max_per_week` per minggu)
+    - end                : hari terakhir histori (default: hari ini)
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    days = max(1, int(years * 365))
+    start = end - timedelta(days=days - 1)
+
+    records = []
+    for i in range(habits):
+        # variasi per habit: sebagian rajin, sebagian jarang
+        density = min(1.0, max(0.0, rng.gauss(completion_density, 0.15)))
+        created = start + timedelta(days=rng.randrange(0, max(1, days // 4)))
+
+        done, frozen = [], []
+        week, used = None, 0
+        d = created
+        while d <= end:
+            ws = d - timedelta(days=d.weekday())
+            if ws != week:
+                week, used = ws, 0
+            if rng.random() < density:
+                done.append(d.isoformat())
+            elif used < freeze_max_per_week and rng.random() < freeze_density:
+                frozen.append(d.isoformat())
+                used += 1
+            d += timedelta(days=1)
+
+        records.append({
+            "type": "DailyHabit" if i % 2 else "Habit",
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "name": f"Habit {i:05d}",
+            "created_at": created.isoformat(),
+            "is_active": rng.random() < 0.9,
+            "completion_dates": done,
+            "frozen_dates": frozen,
+        })
+
+    return {"habits": records}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Generate dataset habits.json sintetis.")
+    p.add_argument("--habits", type=int, default=100)
+    p.add_argument("--years", type=float, default=1.0)
+    p.add_argument("--completion-density", type=float, default=0.7)
+    p.add_argument("--freeze-density", type=float, default=0.3)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--end", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default: hari ini)")
+    p.add_argument("-o", "--output", default="habits.json")
+    args = p.parse_args()
+
+    data = generate_dataset(
+        args.habits, args.years, args.completion_density, args.freeze_density, args.seed, args.end
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"{args.habits} habit ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
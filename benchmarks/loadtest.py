@@ -0,0 +1,211 @@
+"""
+Load test untuk server.py: banyak klien keep-alive, campuran baca / tulis.
+
+    python benchmarks/loadtest.py --habits 200 --clients 16 --seconds 5
+    python benchmarks/loadtest.py --url http://127.0.0.1:8765 --mix summary=1
+
+Tanpa --url: dataset sintetis dibuat di folder temp dan server dijalankan
+sebagai subprocess (klien & server tidak berebut GIL yang sama).
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "habit_tracker"))
+
+from bench import DATASET_END, _percentile          # noqa: E402
+from datagen import generate_dataset                # noqa: E402
+from storage import open_storage                    # noqa: E402
+
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "habit_tracker", "server.py")
+
+DEFAULT_MIX = "summary=6,habits=2,checklist=1,checkin=1"
+
+
+def parse_mix(spec: str) -> List[Tuple[str, int]]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("summary", "habits", "checklist", "checkin", "export"):
+            raise SystemExit(f"Endpoint tidak dikenal di --mix: {name}")
+        mix.append((name, int(weight or 1)))
+    return mix
+
+
+def _request(name: str, habit_ids: List[str], rng: random.Random) -> Tuple[str, str, Optional[bytes]]:
+    day = DATASET_END - timedelta(days=rng.randrange(7))        # klien umumnya melihat minggu ini
+    if name == "summary":
+        return "GET", f"/summary?date={day.isoformat()}", None
+    if name == "habits":
+        return "GET", "/habits?active=1", None
+    if name == "checklist":
+        return "GET", f"/checklist?date={day.isoformat()}", None
+    if name == "export":
+        start = day - timedelta(days=6)
+        return "GET", f"/export?start={start.isoformat()}&end={day.isoformat()}&granularity=week", None
+    body = {"habit_id": rng.choice(habit_ids), "date": day.isoformat(), "done": rng.random() < 0.7}
+    return "POST", "/checkin", json.dumps(body).encode("utf-8")
+
+
+def run_client(
+    host: str,
+    port: int,
+    mix: List[Tuple[str, int]],
+    habit_ids: List[str],
+    deadline: float,
+    seed: int,
+    out: Dict[str, List[float]],
+    errors: List[str],
+) -> None:
+    rng = random.Random(seed)
+    names = [n for n, _ in mix]
+    weights = [w for _, w in mix]
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    local: Dict[str, List[float]] = {n: [] for n in names}
+
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        method, path, body = _request(name, habit_ids, rng)
+        headers = {"Content-Type": "application/json"} if body else {}
+        t0 = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{name}: {e}")
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        local[name].append((time.perf_counter() - t0) * 1000)
+        if resp.status >= 400:
+            errors.append(f"{name}: HTTP {resp.status}")
+
+    conn.close()
+    for n, samples in local.items():
+        out.setdefault(n, []).extend(samples)
+
+
+def load_test(url: str, clients: int, seconds: float, mix: List[Tuple[str, int]]) -> Dict[str, Any]:
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    conn.request("GET", "/habits?active=1")
+    habit_ids = [h["id"] for h in json.loads(conn.getresponse().read())["habits"]]
+    conn.close()
+    if not habit_ids:
+        raise SystemExit("Server tidak punya habit aktif.")
+
+    samples: Dict[str, List[float]] = {}
+    errors: List[str] = []
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=run_client, args=(host, port, mix, habit_ids, deadline, i, samples, errors))
+        for i in range(clients)
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    total = sum(len(v) for v in samples.values())
+    report: Dict[str, Any] = {
+        "clients": clients,
+        "seconds": round(elapsed, 2),
+        "requests": total,
+        "req_per_s": round(total / elapsed, 1),
+        "errors": len(errors),
+        "endpoints": {},
+    }
+    for name, values in sorted(samples.items()):
+        values.sort()
+        report["endpoints"][name] = {
+            "count": len(values),
+            "p50_ms": round(_percentile(values, 50), 3),
+            "p90_ms": round(_percentile(values, 90), 3),
+            "p99_ms": round(_percentile(values, 99), 3),
+        }
+    if errors:
+        report["first_errors"] = errors[:5]
+    return report
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(port: int, timeout: float = 30.0) -> None:
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit("Server tidak merespons.")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Load test server HTTP Habit Tracker.")
+    p.add_argument("--url", help="server yang sudah jalan (default: jalankan server sendiri)")
+    p.add_argument("--habits", type=int, default=200)
+    p.add_argument("--years", type=float, default=1.0)
+    p.add_argument("--kind", choices=("json", "journal", "sqlite"), default="journal",
+                   help="storage server yang dijalankan sendiri (default: journal)")
+    p.add_argument("--clients", type=int, default=16)
+    p.add_argument("--seconds", type=float, default=5.0)
+    p.add_argument("--mix", default=DEFAULT_MIX, help=f"bobot endpoint (default: {DEFAULT_MIX})")
+    p.add_argument("-o", "--output", help="tulis hasil JSON ke file")
+    args = p.parse_args()
+    mix = parse_mix(args.mix)
+
+    proc = None
+    tmpdir = None
+    url = args.url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="habit-load-")
+        data_path = os.path.join(tmpdir.name, "habits.db" if args.kind == "sqlite" else "habits.json")
+        open_storage(data_path, args.kind).save(generate_dataset(args.habits, args.years, end=DATASET_END))
+        port = _free_port()
+        proc = subprocess.Popen([sys.executable, SERVER, "-f", data_path, "--kind", args.kind, "--port", str(port)],
+                                stdout=subprocess.DEVNULL)
+        _wait_for(port)
+        url = f"http://127.0.0.1:{port}"
+
+    try:
+        report = load_test(url, args.clients, args.seconds, mix)
+    finally:
+        if proc is not None:
+            proc.send_signal(2)                     # SIGINT → server flush lalu keluar
+            proc.wait(timeout=30)
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Any, Dict, List, Sequence
+
+try:                                    # NumPy opsional: tanpa NumPy tracker tetap jalan
+    import numpy as np
+except ImportError:                     # pragma: no cover
+    np = None
+
+from habit import Habit, DailyHabit
+
+
+def available() -> bool:
+    return np is not None
+
+
+class NumpyAnalytics:
+    """
+    NumpyAnalytics = engine analitik batch (read-only)
+
+    - Semua habit diubah menjadi matrix habit × hari:
+        done[h, i]   → habit h done di hari (start + i)
+        frozen[h, i] → habit h frozen di hari (start + i)
+    - Progress, streak, freeze token & best habit dihitung
+      dengan operasi array sekaligus, bukan loop per habit / per hari
+    - Hasil HARUS sama persis dengan jalur Python di Habit
+
+    Engine ini tidak mengubah data (auto-freeze tetap urusan tracker).
+    """
+
+    def __init__(self, habits: Sequence[Habit], until: date) -> None:
+        if np is None:
+            raise ImportError("NumpyAnalytics membutuhkan paket numpy.")
+
+        self._habits = list(habits)
+        self._until = until.toordinal()
+
+        # rentang matrix: hari paling awal di histori s/d max(until, hari terakhir)
+        first = self._until
+        last = self._until
+        for h in self._habits:
+            for bm in (h._completion_dates, h._frozen_dates):
+                if bm:
+                    first = min(first, bm.base_ordinal)
+                    last = max(last, bm.base_ordinal + len(bm.to_bytes()) * 8 - 1)
+        self._start = first
+        self._days = last - first + 1
+
+        self.done = self._plane("_completion_dates")
+        self.frozen = self._plane("_frozen_dates")
+        self.covered = self.done | self.frozen
+
+    @property
+    def start(self) -> date:
+        return date.fromordinal(self._start)
+
+    # ---------- per-habit vectors ----------
+    def done_counts(self, start: date, end: date) -> Any:
+        return self._window(self.done, start, end).sum(axis=1)
+
+    def frozen_counts(self, start: date, end: date) -> Any:
+        return self._window(self.frozen, start, end).sum(axis=1)
+
+    def completion_rates(self, start: date, end: date) -> Any:
+        """Persentase hari done per habit dalam rentang [start, end]."""
+        days = (end - start).days + 1
+        return self.done_counts(start, end) / days * 100
+
+    def weekly_completion_rates(self, first_week: date, weeks: int) -> Any:
+        """Matrix habit × minggu (persentase), mulai dari first_week (Senin)."""
+        window = self._window(self.done, first_week, first_week + timedelta(days=weeks * 7 - 1))
+        counts = window.reshape(len(self._habits), weeks, 7).sum(axis=2)
+        return counts / 7 * 100
+
+    def monthly_completion_rates(self, year: int, month: int) -> Any:
+        days = monthrange(year, month)[1]
+        return self.completion_rates(date(year, month, 1), date(year, month, days))
+
+    def current_streaks(self, ref: date) -> Any:
+        """Panjang run done-atau-frozen yang berakhir di ref, per habit."""
+        idx = ref.toordinal() - self._start
+        if idx < 0 or idx >= self._days or not self._habits:
+            return np.zeros(len(self._habits), dtype=np.int64)
+
+        rev = self.covered[:, idx::-1]                  # mundur dari ref
+        gaps = ~rev
+        has_gap = gaps.any(axis=1)
+        return np.where(has_gap, gaps.argmax(axis=1), rev.shape[1]).astype(np.int64)
+
+    def longest_streaks(self) -> Any:
+        """Run terpanjang per habit (semua run dicari sekaligus lewat np.diff)."""
+        n = len(self._habits)
+        longest = np.zeros(n, dtype=np.int64)
+        if not n:
+            return longest
+
+        padded = np.zeros((n, self._days + 2), dtype=np.int8)
+        padded[:, 1:-1] = self.covered
+        edges = np.diff(padded, axis=1)
+        starts = np.argwhere(edges == 1)                # urutan row-major,
+        ends = np.argwhere(edges == -1)                 # jadi start & end berpasangan
+        np.maximum.at(longest, starts[:, 0], ends[:, 1] - starts[:, 1])
+        return longest
+
+    def freeze_left(self, ref: date) -> Any:
+        ws = ref - timedelta(days=ref.weekday())
+        used = self.frozen_counts(ws, ws + timedelta(days=6))
+        limit = np.array([h.FREEZE_MAX_PER_WEEK for h in self._habits], dtype=np.int64)
+        return np.maximum(limit - used, 0)
+
+    # ---------- summary ----------
+    def weekly_summary(self, ref: date) -> Dict[str, Any]:
+        """Format sama persis dengan HabitTracker.weekly_summary."""
+        start = ref - timedelta(days=ref.weekday())
+        done = self.done_counts(start, start + timedelta(days=6)).tolist()
+        current_arr = self.current_streaks(ref)
+        longest_arr = self.longest_streaks()
+        current, longest = current_arr.tolist(), longest_arr.tolist()
+        freeze = self.freeze_left(ref).tolist()
+
+        per_habit: List[Dict[str, Any]] = []
+        total_done = total_target = 0
+
+        for i, h in enumerate(self._habits):
+            progress = self._progress(h, start, done[i])
+            per_habit.append({
+                "id": h.get_id(),
+                "name": h.get_name(),
+                **progress,
+                "current_streak": current[i],
+                "longest_streak": longest[i],
+                "freeze_left": freeze[i],
+            })
+            total_done += progress["done_days"]
+            total_target += progress["target_days"]
+
+        overall_rate = (total_done / total_target) * 100 if total_target else 0.0
+
+        return {
+            "week_start": start.isoformat(),
+            "week_end": (start + timedelta(days=6)).isoformat(),
+            "overall_completion_rate": round(overall_rate, 2),
+            "habits": per_habit,
+            "best_longest": self._best(longest_arr),
+            "best_current": self._best(current_arr),
+        }
+
+    # ---------- internal helper ----------
+    def _plane(self, attr: str) -> Any:
+        plane = np.zeros((len(self._habits), self._days), dtype=bool)
+        for row, h in enumerate(self._habits):
+            bm = getattr(h, attr)
+            if not bm:
+                continue
+            bits = np.unpackbits(np.frombuffer(bm.to_bytes(), dtype=np.uint8), bitorder="little")
+            offset = bm.base_ordinal - self._start
+            plane[row, offset:offset + len(bits)] = bits[: self._days - offset]
+        return plane
+
+    def _window(self, plane: Any, start: date, end: date) -> Any:
+        """Potong kolom [start, end]; hari di luar matrix dianggap kosong."""
+        lo = start.toordinal() - self._start
+        hi = end.toordinal() - self._start + 1
+        if lo >= 0 and hi <= self._days:
+            return plane[:, lo:hi]
+
+        out = np.zeros((plane.shape[0], hi - lo), dtype=plane.dtype)
+        src_lo, src_hi = max(lo, 0), min(hi, self._days)
+        if src_lo < src_hi:
+            out[:, src_lo - lo:src_hi - lo] = plane[:, src_lo:src_hi]
+        return out
+
+    @staticmethod
+    def _progress(h: Habit, week_start: date, done: int) -> Dict[str, Any]:
+        method = type(h).calculate_weekly_progress
+        if method not in (Habit.calculate_weekly_progress, DailyHabit.calculate_weekly_progress):
+            return h.calculate_weekly_progress(week_start)      # subclass lain: pakai logic-nya sendiri
+
+        progress: Dict[str, Any] = {
+            "done_days": done,
+            "target_days": 7,
+            "completion_rate": round((done / 7) * 100, 2),
+        }
+        if isinstance(h, DailyHabit):
+            progress["badge"] = DailyHabit.badge_for(done)
+        return progress
+
+    def _best(self, values: Any) -> Dict[str, Any]:
+        # sama dengan loop Python: habit PERTAMA dengan nilai terbesar (> 0)
+        if not len(values):
+            return {"name": "-", "days": 0}
+        i = int(values.argmax())
+        if values[i] <= 0:
+            return {"name": "-", "days": 0}
+        return {"name": self._habits[i].get_name(), "days": int(values[i])}
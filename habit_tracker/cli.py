@@ -0,0 +1,236 @@
+"""
+Entry point headless (tanpa Tkinter) untuk cron / server.
+
+Contoh:
+    python cli.py summary                                   # habits.json di folder ini
+    python cli.py -f a.json -f b.db summary --date 2025-06-04
+    python cli.py checkin "Baca buku" --date 2025-06-04
+    python cli.py bulk-checkin checkins.csv
+    python cli.py -f users/*.json export "out/{name}.csv"
+    python cli.py -f habits.journal --kind journal compact
+    python cli.py -f users/*.json snapshot "snap/{name}.snap"        # snapshot biner untuk analitik
+    python cli.py -f users/*.json replay-freezes                       # setelah import / migrasi
+
+Beberapa file data diproses dalam SATU proses (tanpa start interpreter per user).
+Modul tracker / storage baru di-import saat command jalan,
+jadi `--help` dan error argumen tidak membayar biaya import apa pun.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import sys
+
+
+DEFAULT_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "habits.json")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    files = args.files or [DEFAULT_DATA]
+
+    if args.command in ("export", "snapshot") and len(files) > 1 and "{name}" not in args.output:
+        print(f"{args.command}: pakai placeholder {{name}} di path output untuk banyak file data.", file=sys.stderr)
+        return 2
+
+    command = COMMANDS[args.command]
+    failed = 0
+    for path in files:
+        try:
+            result = _run(path, args, command)
+        except Exception as e:                  # satu file gagal → file lain tetap diproses
+            failed += 1
+            result = {"error": str(e)}
+        _emit(path, result, many=len(files) > 1, indent=args.indent)
+    return 1 if failed else 0
+
+
+# ---------- Commands ----------
+# Setiap command menerima (tracker, args, path) dan mengembalikan hasil yang bisa di-JSON-kan.
+def _cmd_checkin(tracker: Any, args: argparse.Namespace, path: str) -> Dict[str, Any]:
+    habit = _find_habit(tracker, args.habit)
+    day = args.date or date.today()
+    tracker.set_done_on_date(habit.get_id(), day, not args.undo)
+    return {"habit_id": habit.get_id(), "date": day.isoformat(), "done": not args.undo}
+
+
+def _cmd_bulk_checkin(tracker: Any, args: argparse.Namespace, path: str) -> Dict[str, Any]:
+    return {"applied": tracker.import_checkins(args.input)}
+
+
+def _cmd_summary(tracker: Any, args: argparse.Namespace, path: str) -> Dict[str, Any]:
+    if args.habit:
+        return tracker.habit_summary(_find_habit(tracker, args.habit).get_id(), args.date)
+    return tracker.weekly_summary(args.date)
+
+
+def _cmd_export(tracker: Any, args: argparse.Namespace, path: str) -> Dict[str, Any]:
+    name = os.path.splitext(os.path.basename(path))[0]
+    out = args.output.replace("{name}", name)
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+
+    if args.history:
+        end = args.end or date.today()
+        start = args.start or end.replace(day=1)
+        rows = tracker.export_history(out, start, end, args.granularity, active_only=args.active_only)
+        return {"output": out, "rows": rows}
+
+    tracker.export_week_csv(out, args.date)
+    return {"output": out}
+
+
+def _cmd_snapshot(tracker: Any, args: argparse.Namespace, path: str) -> Dict[str, Any]:
+    out = args.output.replace("{name}", os.path.splitext(os.path.basename(path))[0])
+    count = tracker.export_snapshot(out, active_only=args.active_only)
+    return {"output": out, "habits": count, "bytes": os.path.getsize(out)}
+
+
+def _cmd_replay_freezes(tracker: Any, args: argparse.Namespace, path: str) -> Dict[str, Any]:
+    ids = [_find_habit(tracker, key).get_id() for key in args.habit] if args.habit else None
+    return tracker.replay_freezes(ids, reset=not args.keep)
+
+
+def _cmd_compact(tracker: Any, args: argparse.Namespace, path: str) -> Dict[str, Any]:
+    storage = tracker._storage
+    before = _disk_size(path)
+    if hasattr(storage, "compact"):
+        storage.compact()                       # journal / sqlite punya compaction sendiri
+    else:
+        tracker.save()                          # JSON: tulis ulang snapshot yang rapi
+    return {"bytes_before": before, "bytes_after": _disk_size(path)}
+
+
+COMMANDS: Dict[str, Callable[[Any, argparse.Namespace, str], Dict[str, Any]]] = {
+    "checkin": _cmd_checkin,
+    "bulk-checkin": _cmd_bulk_checkin,
+    "summary": _cmd_summary,
+    "export": _cmd_export,
+    "snapshot": _cmd_snapshot,
+    "replay-freezes": _cmd_replay_freezes,
+    "compact": _cmd_compact,
+}
+
+
+# ---------- Internal helper ----------
+def _run(path: str, args: argparse.Namespace, command: Callable[..., Dict[str, Any]]) -> Dict[str, Any]:
+    from storage import open_storage
+    from tracker import HabitTracker
+
+    # storage (misalnya sqlite) akan membuat file baru → salah ketik path jangan jadi data kosong
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File data tidak ditemukan: {path}")
+
+    storage = open_storage(path, args.kind)
+    try:
+        # satu flush di akhir command (auto-freeze dari summary ikut tersimpan)
+        with HabitTracker(storage, auto_flush=False) as tracker:
+            tracker.load(lazy=True, **_load_scope(storage, args))
+            return command(tracker, args, path)
+    finally:
+        wait = getattr(storage, "wait_for_compaction", None)
+        if wait is not None:
+            wait()
+        close = getattr(storage, "close", None)
+        if close is not None:
+            close()
+
+
+def _load_scope(storage: Any, args: argparse.Namespace) -> Dict[str, Any]:
+    # storage streaming (JSON) bisa memuat sebagian; habit lain tidak dibaca ke memori sama sekali
+    if not hasattr(storage, "iter_habits"):
+        return {}
+    if args.command == "summary" and not args.habit:
+        return {"active_only": True}                # summary hanya melihat habit aktif
+    if args.command in ("export", "snapshot") and args.active_only:
+        return {"active_only": True}
+    return {}
+
+
+def _find_habit(tracker: Any, key: str) -> Any:
+    """Cari habit berdasarkan id, atau nama (tidak peka huruf besar/kecil)."""
+    habits = tracker.list_habits()
+    for h in habits:
+        if h.get_id() == key:
+            return h
+    matches = [h for h in habits if h.get_name().lower() == key.strip().lower()]
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        raise ValueError(f"Nama habit ambigu: {key} (pakai id).")
+    raise ValueError(f"Habit tidak ditemukan: {key}")
+
+
+def _disk_size(path: str) -> int:
+    total = 0
+    for p in (path, path + ".journal", path + ".journal.old", path + "-wal"):
+        try:
+            total += os.path.getsize(p)
+        except OSError:
+            pass
+    return total
+
+
+def _emit(path: str, result: Dict[str, Any], many: bool, indent: Optional[int]) -> None:
+    # banyak file → satu baris JSON per file (JSONL), supaya gampang di-pipe
+    if many:
+        print(json.dumps({"file": path, **result}, ensure_ascii=False))
+    elif "error" in result:
+        print(json.dumps(result, ensure_ascii=False), file=sys.stderr)
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=indent))
+
+
+def _iso_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tanggal harus YYYY-MM-DD: {value}") from None
+
+
+def _parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="cli.py", description="Habit Tracker tanpa GUI.")
+    p.add_argument("-f", "--file", dest="files", action="append",
+                   help="file data (boleh diulang; default: habits.json di folder aplikasi)")
+    p.add_argument("--kind", choices=("json", "journal", "sqlite", "snapshot"),
+                   help="jenis storage (default: ditebak dari ekstensi)")
+    p.add_argument("--indent", type=int, default=None, help="indentasi output JSON (satu file saja)")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    c = sub.add_parser("checkin", help="centang / batalkan satu habit")
+    c.add_argument("habit", help="id atau nama habit")
+    c.add_argument("--date", type=_iso_date, help="tanggal (default: hari ini)")
+    c.add_argument("--undo", action="store_true", help="batalkan centang")
+
+    c = sub.add_parser("bulk-checkin", help="import check-in dari CSV / JSONL")
+    c.add_argument("input", help="CSV (habit_id,date[,done]) atau JSONL")
+
+    c = sub.add_parser("summary", help="weekly summary dalam JSON")
+    c.add_argument("--date", type=_iso_date, help="tanggal referensi (default: hari ini)")
+    c.add_argument("--habit", help="hanya satu habit (id atau nama)")
+
+    c = sub.add_parser("export", help="export summary mingguan / histori")
+    c.add_argument("output", help="path output; {name} = nama file data")
+    c.add_argument("--date", type=_iso_date, help="minggu referensi untuk export summary")
+    c.add_argument("--history", action="store_true", help="export histori (CSV / JSONL dari ekstensi)")
+    c.add_argument("--start", type=_iso_date, help="awal histori (default: awal bulan --end)")
+    c.add_argument("--end", type=_iso_date, help="akhir histori (default: hari ini)")
+    c.add_argument("--granularity", choices=("day", "week", "month"), default="day")
+    c.add_argument("--active-only", action="store_true")
+
+    c = sub.add_parser("snapshot", help="tulis snapshot biner (mmap) untuk proses analitik")
+    c.add_argument("output", help="path output (.snap); {name} = nama file data")
+    c.add_argument("--active-only", action="store_true")
+
+    c = sub.add_parser("replay-freezes", help="hitung ulang freeze di seluruh histori")
+    c.add_argument("--habit", action="append", help="hanya habit ini (id atau nama; boleh diulang)")
+    c.add_argument("--keep", action="store_true", help="pertahankan freeze lama (default: hitung dari nol)")
+
+    sub.add_parser("compact", help="rapikan file data (journal / WAL / snapshot)")
+    return p
+
+
+if __name__ == "__main__":
+    sys.exit(main())
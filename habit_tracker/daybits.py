@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Iterator, List, Tuple
+
+# posisi bit 1 untuk setiap nilai byte → iterasi per byte, bukan per bit
+_BIT_POSITIONS = tuple(tuple(b for b in range(8) if byte >> b & 1) for byte in range(256))
+
+
+class DayBitmap:
+    """
+    DayBitmap = himpunan tanggal dalam bentuk bitmap (1 bit per hari)
+
+    - bit ke-i mewakili hari dengan ordinal (base + i)
+    - base selalu kelipatan 8 → dua bitmap bisa digabung per byte
+    - API mirip set[date] (add / discard / in / len / iter),
+      jadi Habit tidak perlu tahu detail penyimpanannya
+
+    5 tahun histori ≈ 230 byte per habit, bukan ribuan objek date.
+    """
+
+    __slots__ = ("_base", "_bits", "_count")
+
+    def __init__(self, days: Iterable[date] = ()) -> None:
+        self._base = 0                  # ordinal hari untuk bit 0
+        self._bits = bytearray()
+        self._count = 0
+        for d in days:
+            self.add(d)
+
+    # ---------- set-like API ----------
+    def add(self, d: date) -> None:
+        self.add_ordinal(d.toordinal())
+
+    def add_ordinal(self, o: int) -> None:
+        self._ensure(o)
+        idx = o - self._base
+        mask = 1 << (idx & 7)
+        if not self._bits[idx >> 3] & mask:
+            self._bits[idx >> 3] |= mask
+            self._count += 1
+
+    def discard(self, d: date) -> None:
+        idx = d.toordinal() - self._base
+        if 0 <= idx < len(self._bits) * 8:
+            mask = 1 << (idx & 7)
+            if self._bits[idx >> 3] & mask:
+                self._bits[idx >> 3] &= ~mask
+                self._count -= 1
+
+    def copy(self) -> DayBitmap:
+        bm = DayBitmap.__new__(DayBitmap)
+        bm._base = self._base
+        bm._bits = bytearray(self._bits)
+        bm._count = self._count
+        return bm
+
+    def clear(self) -> None:
+        self._base = 0
+        self._bits = bytearray()
+        self._count = 0
+
+    def __contains__(self, d: object) -> bool:
+        if not isinstance(d, date):
+            return False
+        return self.has_ordinal(d.toordinal())
+
+    def has_ordinal(self, o: int) -> bool:
+        idx = o - self._base
+        if idx < 0 or idx >= len(self._bits) * 8:
+            return False
+        return bool(self._bits[idx >> 3] & (1 << (idx & 7)))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __iter__(self) -> Iterator[date]:
+        """Tanggal diurutkan naik (tanpa perlu sorted())."""
+        return map(date.fromordinal, self.ordinals())
+
+    def ordinals(self) -> List[int]:
+        """Ordinal semua hari di set, urut naik (byte kosong dilewati, bit dibaca lewat tabel)."""
+        base = self._base
+        table = _BIT_POSITIONS
+        return [
+            off + bit
+            for i, byte in enumerate(self._bits) if byte
+            for off in (base + (i << 3),)
+            for bit in table[byte]
+        ]
+
+    # ---------- bit-level helper ----------
+    @property
+    def base_ordinal(self) -> int:
+        return self._base
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    def to_int(self) -> int:
+        """Bitmap sebagai int (bit 0 = hari base); dipakai untuk operasi per word."""
+        return int.from_bytes(self._bits, "little")
+
+    def count_between(self, start: date, end: date) -> int:
+        """Jumlah hari di set dalam rentang [start, end]."""
+        return self.count_ordinals(start.toordinal(), end.toordinal())
+
+    def count_ordinals(self, lo: int, hi: int) -> int:
+        """Jumlah hari di set dalam rentang ordinal [lo, hi]; hanya byte di rentang itu yang dibaca."""
+        lo = max(lo - self._base, 0)
+        hi = min(hi - self._base, len(self._bits) * 8 - 1)
+        if hi < lo:
+            return 0
+        window = int.from_bytes(self._bits[lo >> 3:(hi >> 3) + 1], "little") >> (lo & 7)
+        return (window & ((1 << (hi - lo + 1)) - 1)).bit_count()
+
+    def union_int(self, other: DayBitmap) -> Tuple[int, int]:
+        """
+        Gabungkan dua bitmap.
+        Return (base_ordinal, bits) dengan bit 0 = base_ordinal.
+        """
+        if not other._bits:
+            return self._base, self.to_int()
+        if not self._bits:
+            return other._base, other.to_int()
+        base = min(self._base, other._base)
+        bits = (self.to_int() << (self._base - base)) | (other.to_int() << (other._base - base))
+        return base, bits
+
+    @classmethod
+    def from_bytes(cls, base_ordinal: int, data: bytes) -> DayBitmap:
+        bm = cls()
+        bm._base = base_ordinal
+        bm._bits = bytearray(data)
+        bm._count = int.from_bytes(data, "little").bit_count()
+        return bm
+
+    # ---------- internal ----------
+    def _ensure(self, o: int) -> None:
+        if not self._bits:
+            self._base = o & ~7
+            self._bits = bytearray(1)
+            return
+
+        if o < self._base:
+            new_base = o & ~7
+            self._bits[0:0] = bytes((self._base - new_base) >> 3)
+            self._base = new_base
+            return
+
+        need = ((o - self._base) >> 3) + 1
+        if need > len(self._bits):
+            self._bits.extend(bytes(need - len(self._bits)))
+
+
+class WeekCounts:
+    """
+    WeekCounts = counter per minggu ISO (Senin-Minggu), 1 byte per minggu
+
+    - byte ke-i = jumlah untuk minggu yang Seninnya (base + 7*i)
+    - nilai maksimal 255 (cukup untuk hitungan hari dalam seminggu)
+    - minggu tanpa hitungan tidak butuh entri dict/int sendiri
+
+    Dipakai Habit untuk token freeze per minggu: cek token O(1),
+    5 tahun histori ≈ 260 byte per habit.
+    """
+
+    __slots__ = ("_base", "_counts")
+
+    def __init__(self) -> None:
+        self._base = 0                  # ordinal Senin untuk byte 0
+        self._counts = bytearray()
+
+    @staticmethod
+    def monday(o: int) -> int:
+        """Ordinal hari Senin di minggu yang sama (ordinal 1 = Senin, 1 Jan tahun 1)."""
+        return o - (o - 1) % 7
+
+    def get(self, o: int) -> int:
+        """Hitungan minggu yang memuat hari ordinal o."""
+        idx = (self.monday(o) - self._base) // 7
+        if idx < 0 or idx >= len(self._counts):
+            return 0
+        return self._counts[idx]
+
+    def add(self, o: int, delta: int = 1) -> None:
+        """Tambah (atau kurangi, delta < 0) hitungan minggu yang memuat hari ordinal o."""
+        monday = self.monday(o)
+        if not self._counts:
+            self._base = monday
+            self._counts = bytearray(1)
+        elif monday < self._base:
+            self._counts[0:0] = bytes((self._base - monday) // 7)
+            self._base = monday
+        idx = (monday - self._base) // 7
+        if idx >= len(self._counts):
+            self._counts.extend(bytes(idx + 1 - len(self._counts)))
+        self._counts[idx] = max(0, self._counts[idx] + delta)
+
+    def copy(self) -> WeekCounts:
+        wc = WeekCounts.__new__(WeekCounts)
+        wc._base = self._base
+        wc._counts = bytearray(self._counts)
+        return wc
+
+    def items(self) -> List[Tuple[int, int]]:
+        """(ordinal Senin, hitungan) untuk minggu yang hitungannya > 0, urut naik."""
+        return [(self._base + 7 * i, c) for i, c in enumerate(self._counts) if c]
+
+    @classmethod
+    def from_ordinals(cls, ordinals: Iterable[int]) -> WeekCounts:
+        """Bangun counter sekali jalan dari ordinal hari (misalnya DayBitmap.ordinals())."""
+        wc = cls()
+        for o in ordinals:
+            wc.add(o)
+        return wc
+
+
+def iter_runs(bits: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (posisi_awal, panjang) untuk setiap deretan bit 1, urut naik.
+    Satu iterasi per run, bukan per hari.
+    """
+    pos = 0
+    while bits:
+        skip = (bits & -bits).bit_length() - 1          # buang trailing zero
+        bits >>= skip
+        pos += skip
+        run = (~bits & (bits + 1)).bit_length() - 1     # hitung trailing one
+        yield pos, run
+        bits >>= run
+        pos += run
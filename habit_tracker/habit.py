@@ -1,16 +1,51 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
-from typing import Dict, Any, Set
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import itertools
 import uuid
 
+from daybits import DayBitmap, WeekCounts
+from streaks import StreakIndex
+
 
 def _parse_iso_date(s: str) -> date:
     """
     Parse ISO date string (YYYY-MM-DD) menjadi date object.
     Dipakai SAAT load dari storage.
+
+    date.fromisoformat (C) jauh lebih cepat dari strptime;
+    strptime hanya fallback untuk format lama tanpa zero-padding.
     """
-    return datetime.strptime(s, "%Y-%m-%d").date()
+    try:
+        return date.fromisoformat(s)
+    except ValueError:
+        return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+def _iso_to_ordinal(s: str) -> int:
+    """ISO string → ordinal hari (dipakai saat hydrate histori ke bitmap)."""
+    return _parse_iso_date(s).toordinal()
+
+
+# versi habit diambil dari satu counter global: (id, versi) tidak pernah dipakai ulang,
+# jadi salinan (clone) dengan versi sama pasti isinya sama → cache bisa dipakai bersama
+_VERSIONS = itertools.count(1)
+
+
+class _IsoDays(dict):
+    """
+    Cache ordinal hari → string ISO, dipakai bersama semua habit saat serialisasi.
+    Habit-habit berbagi rentang tanggal yang sama → beberapa ribu entri saja,
+    dan to_dict() cukup satu lookup dict per hari (bukan fromordinal + isoformat).
+    """
+
+    def __missing__(self, o: int) -> str:
+        s = self[o] = date.fromordinal(o).isoformat()
+        return s
+
+
+_ISO_DAYS = _IsoDays()
 
 
 def _date_to_iso(d: date) -> str:
@@ -36,8 +71,18 @@ class Habit:
     """
 
     # domain rule maksimal freeze yang boleh dipakai dalam satu minggu
+    # (boleh di-override per subclass, misalnya habit mingguan)
     FREEZE_MAX_PER_WEEK = 1  
 
+    # tanpa __dict__ per instance → hemat memori untuk ribuan habit
+    __slots__ = (
+        "__id", "__name", "_created_at", "__is_active",
+        "_done_days", "_frozen_days", "_streak_index",
+        "_freeze_counts",   # token freeze terpakai per minggu (1 byte per minggu)
+        "_version",         # naik setiap mutasi (dipakai cache analitik di tracker)
+        "_raw_history",     # (completion_dates, frozen_dates) mentah selama belum di-hydrate
+    )
+
     def __init__(self, habit_id: str, name: str, created_at: date, is_active: bool = True) -> None:
         self.__id = habit_id
 
@@ -47,9 +92,64 @@ class Habit:
         self._created_at = created_at
         self.__is_active = is_active
 
-        self._completion_dates: Set[date] = set()
-        self._frozen_dates: Set[date] = set()
+        # histori disimpan sebagai bitmap per hari (lihat daybits.py)
+        self._done_days = DayBitmap()
+        self._frozen_days = DayBitmap()
+
+        # run done-atau-frozen, di-update oleh mark/unmark/freeze
+        self._streak_index = StreakIndex()
+
+        # token freeze terpakai per minggu, di-update oleh try_freeze_date / merge / replay
+        self._freeze_counts = WeekCounts()
+
+        # versi mutasi: hasil analitik yang di-cache valid selama angka ini sama
+        self._version = next(_VERSIONS)
 
+        # lazy load: list ISO string dari storage, di-decode saat pertama dipakai
+        self._raw_history: Optional[Tuple[List[str], List[str]]] = None
+
+    # ---------- History (lazy) ----------
+    @property
+    def _completion_dates(self) -> DayBitmap:
+        if self._raw_history is not None:
+            self._hydrate()
+        return self._done_days
+
+    @property
+    def _frozen_dates(self) -> DayBitmap:
+        if self._raw_history is not None:
+            self._hydrate()
+        return self._frozen_days
+
+    @property
+    def _streaks(self) -> StreakIndex:
+        if self._raw_history is not None:
+            self._hydrate()
+        return self._streak_index
+
+    @property
+    def _freeze_weeks(self) -> WeekCounts:
+        if self._raw_history is not None:
+            self._hydrate()
+        return self._freeze_counts
+
+    def is_hydrated(self) -> bool:
+        return self._raw_history is None
+
+    def _hydrate(self) -> None:
+        completion, frozen = self._raw_history
+        self._raw_history = None
+
+        for s in completion:
+            self._done_days.add_ordinal(_iso_to_ordinal(s))
+        for s in frozen:
+            self._frozen_days.add_ordinal(_iso_to_ordinal(s))
+
+        # index streak dibangun sekali dari bitmap, bukan per tanggal
+        self._streak_index = StreakIndex.from_bitmaps(self._done_days, self._frozen_days)
+
+        # counter token freeze dibangun sekali dari histori freeze
+        self._freeze_counts = WeekCounts.from_ordinals(self._frozen_days.ordinals())
 
     # ---------- Factory ----------
     @staticmethod
@@ -71,17 +171,46 @@ class Habit:
     def get_name(self) -> str:
         return self.__name
 
+    def version(self) -> int:
+        """
+        Versi mutasi; berubah setiap kali nama, status, atau histori berubah.
+        Unik antar habit & antar objek (counter global), sama hanya untuk clone().
+        """
+        return self._version
+
+    def clone(self) -> Habit:
+        """
+        Salinan murah untuk dibaca di thread lain (snapshot tracker, job simpan):
+        bitmap, index streak & counter freeze per minggu disalin apa adanya (tanpa deepcopy generik),
+        versi ikut sama sehingga baris summary yang sudah di-cache tetap berlaku.
+        Histori yang belum di-hydrate dipakai bersama (list mentah tidak pernah diubah).
+        """
+        c = object.__new__(type(self))
+        c.__id = self.__id
+        c.__name = self.__name
+        c._created_at = self._created_at
+        c.__is_active = self.__is_active
+        c._done_days = self._done_days.copy()
+        c._frozen_days = self._frozen_days.copy()
+        c._streak_index = self._streak_index.copy()
+        c._freeze_counts = self._freeze_counts.copy()
+        c._version = self._version
+        c._raw_history = self._raw_history
+        return c
+
     def set_name(self, new_name: str) -> None:
         new_name = (new_name or "").strip()
         if len(new_name) < 2:
             raise ValueError("Nama habit minimal 2 karakter.")
         self.__name = new_name
+        self._version = next(_VERSIONS)
 
     def is_active(self) -> bool:
         return self.__is_active
 
     def set_active(self, active: bool) -> None:
         self.__is_active = bool(active)
+        self._version = next(_VERSIONS)
 
     # ---------- Completion ----------
     # tndai habit selesai di tanggal tertentu
@@ -89,23 +218,34 @@ class Habit:
         if not self.is_active():
             raise ValueError("Habit non-aktif tidak bisa dicentang.")
         self._completion_dates.add(on_date)
+        self._streaks.add(on_date.toordinal())
+        self._version = next(_VERSIONS)
 
     # Batalkan checklist pada tanggal tertentu
     def unmark_done(self, on_date: date) -> None:
         self._completion_dates.discard(on_date)
+        if on_date not in self._frozen_dates:       # hari frozen tetap menyambung streak
+            self._streaks.remove(on_date.toordinal())
+        self._version = next(_VERSIONS)
 
     def is_done_on(self, d: date) -> bool:
         return d in self._completion_dates
 
+    def count_done_between(self, start: date, end: date) -> int:
+        """Jumlah hari done dalam rentang [start, end] (dibaca per byte dari bitmap)."""
+        return self._completion_dates.count_between(start, end)
+
     # ---------- Freeze logic ----------
     def is_frozen_on(self, d: date) -> bool:
         return d in self._frozen_dates
 
-    # hitung sisa freeze token dalam minggu ref_date
+    def count_frozen_between(self, start: date, end: date) -> int:
+        """Jumlah hari frozen dalam rentang [start, end]."""
+        return self._frozen_dates.count_between(start, end)
+
+    # hitung sisa freeze token dalam minggu ref_date (satu lookup counter per minggu)
     def freeze_remaining_for_week(self, ref: date) -> int:
-        ws = self._week_start(ref)
-        used = sum(1 for fd in self._frozen_dates if self._week_start(fd) == ws)
-        return max(0, self.FREEZE_MAX_PER_WEEK - used)
+        return max(0, self.FREEZE_MAX_PER_WEEK - self._freeze_weeks.get(ref.toordinal()))
 
     def try_freeze_date(self, missed_date: date) -> bool:
         """
@@ -120,11 +260,97 @@ class Habit:
 
         # cek token minggu tersebut
         if self.freeze_remaining_for_week(missed_date) > 0:
+            o = missed_date.toordinal()
             self._frozen_dates.add(missed_date)
+            self._streaks.add(o)
+            self._freeze_weeks.add(o)
+            self._version = next(_VERSIONS)
             return True
 
         return False
 
+    def try_freeze_dates(self, missed_dates: Iterable[date]) -> List[date]:
+        """
+        Bulk backfill freeze (urut tanggal, aturan token tetap berlaku).
+        Return tanggal yang BARU di-freeze.
+        """
+        frozen = []
+        for d in sorted(set(missed_dates)):
+            if d not in self._frozen_dates and self.try_freeze_date(d):
+                frozen.append(d)
+        return frozen
+
+    def replay_freezes(self, reset: bool = True) -> Tuple[List[date], List[date]]:
+        """
+        Jalankan aturan auto-freeze di SELURUH histori, seolah
+        auto_freeze_yesterday_if_needed dipanggil setiap hari secara berurutan.
+
+        - reset=True  → freeze lama dibuang dulu; hasilnya hanya bergantung pada histori done
+          (tidak tergantung hari apa saja aplikasi kebetulan dibuka)
+        - reset=False → freeze lama dipertahankan dan tetap memakai token minggunya
+
+        Satu pass di atas bitmap done + counter token per minggu → linear terhadap panjang histori.
+        Return (tanggal yang baru di-freeze, tanggal yang freeze-nya dibuang).
+        """
+        done = self._completion_dates
+        old = self._frozen_dates
+
+        if reset:
+            frozen, weeks = DayBitmap(), WeekCounts()
+        else:
+            frozen, weeks = old.copy(), self._freeze_weeks.copy()
+
+        cap = self.FREEZE_MAX_PER_WEEK
+        for o in done.ordinals():                   # urut naik → token dipakai sesuai urutan hari
+            prev = o - 1
+            if done.has_ordinal(prev) or frozen.has_ordinal(prev):
+                continue
+            if weeks.get(prev) < cap:
+                frozen.add_ordinal(prev)
+                weeks.add(prev)
+
+        before = set(old.ordinals())
+        after = set(frozen.ordinals())
+        added = [date.fromordinal(o) for o in sorted(after - before)]
+        removed = [date.fromordinal(o) for o in sorted(before - after)]
+        if added or removed:
+            self._frozen_days = frozen
+            self._freeze_counts = weeks
+            self._streak_index = StreakIndex.from_bitmaps(done, frozen)
+            self._version = next(_VERSIONS)
+        return added, removed
+
+    def merge_history(
+        self,
+        done: Iterable[date] = (),
+        undone: Iterable[date] = (),
+        frozen: Iterable[date] = (),
+        unfrozen: Iterable[date] = (),
+    ) -> None:
+        """
+        Terapkan histori dari luar apa adanya (hasil merge storage, bukan aksi user):
+        tanpa cek habit aktif & tanpa aturan token freeze.
+        """
+        for d in done:
+            self._completion_dates.add(d)
+            self._streaks.add(d.toordinal())
+        for d in frozen:
+            if d not in self._frozen_dates:
+                self._frozen_dates.add(d)
+                self._streaks.add(d.toordinal())
+                self._freeze_weeks.add(d.toordinal())
+        for d in undone:
+            self._completion_dates.discard(d)
+            if d not in self._frozen_dates:
+                self._streaks.remove(d.toordinal())
+        for d in unfrozen:
+            if d in self._frozen_dates:
+                self._frozen_dates.discard(d)
+                self._freeze_weeks.add(d.toordinal(), -1)
+                if d not in self._completion_dates:
+                    self._streaks.remove(d.toordinal())
+        self._version = next(_VERSIONS)
+
     def auto_freeze_yesterday_if_needed(self, ref_date: date) -> bool:
         """
         Auto-freeze (streak psychology):
@@ -137,14 +363,19 @@ class Habit:
         Tracker yang memanggil method ini,
         bukan UI
         """
+        if self.would_auto_freeze(ref_date):
+            return self.try_freeze_date(ref_date - timedelta(days=1))
+        return False
+
+    def would_auto_freeze(self, ref_date: date) -> bool:
+        """READ-ONLY: True jika auto_freeze_yesterday_if_needed(ref_date) akan mem-freeze kemarin."""
         yesterday = ref_date - timedelta(days=1)
-        if (
+        return (
             self.is_done_on(ref_date)
             and not self.is_done_on(yesterday)
             and not self.is_frozen_on(yesterday)
-        ):
-            return self.try_freeze_date(yesterday)
-        return False
+            and self.freeze_remaining_for_week(yesterday) > 0
+        )
 
     # ---------- Streak ----------
     def current_streak(self, ref_date: date) -> int:
@@ -155,14 +386,7 @@ class Habit:
         - hari itu done
         - ATAU hari itu frozen
         """
-        streak = 0
-        d = ref_date
-
-        while self.is_done_on(d) or self.is_frozen_on(d):
-            streak += 1
-            d -= timedelta(days=1)
-
-        return streak
+        return self._streaks.run_ending_at(ref_date.toordinal())
 
     def longest_streak(self) -> int:
         """
@@ -172,20 +396,7 @@ class Habit:
         - completion_dates
         - frozen_dates
         """
-        if not self._completion_dates and not self._frozen_dates:
-            return 0
-
-        all_days = sorted(self._completion_dates | self._frozen_dates)
-        best = run = 1
-
-        for i in range(1, len(all_days)):
-            if all_days[i] == all_days[i - 1] + timedelta(days=1):
-                run += 1
-                best = max(best, run)
-            else:
-                run = 1
-
-        return best
+        return self._streaks.longest()
 
     # ---------- Weekly progress ----------
     def calculate_weekly_progress(self, week_start: date) -> Dict[str, Any]:
@@ -209,18 +420,32 @@ class Habit:
         Serialize domain object menjadi dict mentah.
         Yang dipakai oleh storage.
         """
+        if self._raw_history is not None:
+            # belum pernah disentuh → tulis balik string mentah tanpa parsing
+            completion = sorted(set(self._raw_history[0]))
+            frozen = sorted(set(self._raw_history[1]))
+        else:
+            # bitmap sudah urut; ordinal → ISO lewat cache bersama
+            completion = list(map(_ISO_DAYS.__getitem__, self._done_days.ordinals()))
+            frozen = list(map(_ISO_DAYS.__getitem__, self._frozen_days.ordinals()))
+
         return {
             "type": "Habit",
             "id": self.get_id(),
             "name": self.get_name(),
             "created_at": _date_to_iso(self._created_at),
             "is_active": self.is_active(),
-            "completion_dates": sorted(_date_to_iso(d) for d in self._completion_dates),
-            "frozen_dates": sorted(_date_to_iso(d) for d in self._frozen_dates),
+            "completion_dates": completion,
+            "frozen_dates": frozen,
         }
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> Habit:       # Rebuild domain object dari dict mentah
+    def from_dict(data: Dict[str, Any], lazy: bool = False) -> Habit:   # Rebuild domain object dari dict mentah
+        """
+        lazy=True → histori tanggal disimpan sebagai string mentah
+        dan baru di-decode saat pertama kali dibutuhkan.
+        Startup jadi sebanding jumlah habit, bukan jumlah hari histori.
+        """
         habit_type = data.get("type", "Habit")
         habit_id = data["id"]
         name = data["name"]
@@ -233,11 +458,12 @@ class Habit:
         else:
             habit = Habit(habit_id, name, created_at, is_active)
 
-        for s in data.get("completion_dates", []):
-            habit._completion_dates.add(_parse_iso_date(s))
-
-        for s in data.get("frozen_dates", []):
-            habit._frozen_dates.add(_parse_iso_date(s))
+        completion = data.get("completion_dates") or []
+        frozen = data.get("frozen_dates") or []
+        if completion or frozen:
+            habit._raw_history = (completion, frozen)
+            if not lazy:
+                habit._hydrate()
 
         return habit
 
@@ -252,19 +478,20 @@ class DailyHabit(Habit):
     Child class: adds weekly badge logic only.
     """
 
+    __slots__ = ()
+
     def calculate_weekly_progress(self, week_start: date) -> Dict[str, Any]:
         base = super().calculate_weekly_progress(week_start)
-        done = base["done_days"]
+        base["badge"] = self.badge_for(base["done_days"])
+        return base
 
+    @staticmethod
+    def badge_for(done: int) -> str:
         # streak psychology via badge
         if done == 7:
-            badge = "Perfect Week 🏆"
-        elif done >= 5:
-            badge = "Great Week ⭐"
-        elif done >= 3:
-            badge = "Good Momentum 👍"
-        else:
-            badge = "Keep Going 💪"
-
-        base["badge"] = badge
-        return base
+            return "Perfect Week 🏆"
+        if done >= 5:
+            return "Great Week ⭐"
+        if done >= 3:
+            return "Good Momentum 👍"
+        return "Keep Going 💪"
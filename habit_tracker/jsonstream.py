@@ -0,0 +1,210 @@
+"""
+Baca / tulis file data JSON besar secara bertahap (stdlib saja).
+
+- Kompresi transparan: gzip / xz dikenali dari magic bytes, .lzma (tanpa magic) dari ekstensi
+- iter_array_items: elemen satu array (misalnya "habits") di-yield satu per satu
+  lewat json.JSONDecoder.raw_decode per potongan buffer;
+  memori ≈ satu potongan + satu elemen, bukan seluruh file
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, Optional, TextIO, Tuple, Type
+import io
+import json
+import os
+import re
+
+
+CHUNK_SIZE = 1 << 16
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+_EXT_CODECS = {".gz": "gzip", ".gzip": "gzip", ".xz": "xz", ".lzma": "lzma"}
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+def codec_for_path(filepath: str) -> Optional[str]:
+    """Kompresi dari ekstensi file: "gzip" | "xz" | "lzma" | None (JSON biasa)."""
+    return _EXT_CODECS.get(os.path.splitext(filepath)[1].lower())
+
+
+def sniff_codec(raw: BinaryIO) -> Optional[str]:
+    """Kompresi dari magic bytes (posisi file dikembalikan ke awal)."""
+    head = raw.read(len(XZ_MAGIC))
+    raw.seek(0)
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(XZ_MAGIC):
+        return "xz"
+    return None
+
+
+def decode_errors(codec: Optional[str]) -> Tuple[Type[BaseException], ...]:
+    """Exception yang berarti isi file rusak (JSON, UTF-8, atau data terkompresi)."""
+    errors: Tuple[Type[BaseException], ...] = (ValueError, OSError, EOFError)
+    if codec in ("xz", "lzma"):
+        import lzma
+        errors += (lzma.LZMAError,)
+    return errors
+
+
+@contextmanager
+def text_reader(raw: BinaryIO, codec: Optional[str]) -> Iterator[TextIO]:
+    """Teks UTF-8 dari file biner yang sudah dibuka (didekompresi jika perlu)."""
+    stream = _decompressor(raw, codec) if codec else raw
+    f = io.TextIOWrapper(stream, encoding="utf-8")
+    try:
+        yield f
+    finally:
+        f.detach()                      # file biner tetap milik pemanggil
+        if stream is not raw:
+            stream.close()
+
+
+@contextmanager
+def text_writer(raw: BinaryIO, codec: Optional[str]) -> Iterator[TextIO]:
+    """
+    Tulis teks UTF-8 ke file biner yang sudah dibuka (dikompresi jika perlu).
+    Keluar dari blok = semua data (termasuk trailer kompresi) sudah ada di `raw`,
+    jadi pemanggil bisa langsung fsync.
+    """
+    stream = _compressor(raw, codec) if codec else raw
+    f = io.TextIOWrapper(stream, encoding="utf-8", newline="\n")
+    try:
+        yield f
+    finally:
+        f.flush()
+        f.detach()
+        if stream is not raw:
+            stream.close()              # trailer gzip / xz; raw tidak ikut ditutup
+
+
+def iter_array_items(
+    f: TextIO,
+    key: str,
+    meta: Optional[Dict[str, Any]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Tuple[Any, str]]:
+    """
+    Parse objek JSON top-level secara bertahap.
+
+    - Elemen array `key` di-yield sebagai (nilai, teks JSON elemen itu)
+    - Field top-level lain dimasukkan ke `meta` (jika diberikan)
+    - JSON tidak valid → json.JSONDecodeError
+    """
+    s = _Scanner(f, chunk_size)
+    s.expect("{")
+    if s.peek() == "}":
+        return
+    while True:
+        name, _ = s.value()
+        if not isinstance(name, str):
+            raise s.error("nama field harus string")
+        s.expect(":")
+
+        if name == key:
+            s.expect("[")
+            if s.peek() == "]":
+                s.pos += 1
+            else:
+                while True:
+                    yield s.value()
+                    if s.separator("]"):
+                        break
+        else:
+            value, _ = s.value()
+            if meta is not None:
+                meta[name] = value
+
+        if s.separator("}"):
+            return
+
+
+class _Scanner:
+    """Buffer teks bergeser: bagian yang sudah di-parse dibuang saat potongan baru dibaca."""
+
+    def __init__(self, f: TextIO, chunk_size: int) -> None:
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def peek(self) -> str:
+        """Karakter non-spasi berikutnya ("" di akhir file), tanpa mengonsumsinya."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise self.error(f"'{ch}' diharapkan")
+        self.pos += 1
+
+    def separator(self, close: str) -> bool:
+        """Konsumsi ',' (return False) atau penutup `close` (return True)."""
+        ch = self.peek()
+        if ch == close:
+            self.pos += 1
+            return True
+        if ch != ",":
+            raise self.error(f"',' atau '{close}' diharapkan")
+        self.pos += 1
+        return False
+
+    def value(self) -> Tuple[Any, str]:
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # elemen belum lengkap → baca lagi (minimal sebesar yang tertunda: total tetap linear)
+                if self._more(len(self.buf) - self.pos):
+                    continue
+                raise
+            if end == len(self.buf) and self._more():
+                continue                # angka di ujung buffer bisa saja masih terpotong
+            text = self.buf[self.pos:end]
+            self.pos = end
+            return obj, text
+
+    def error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self.buf, self.pos)
+
+    def _more(self, at_least: int = 0) -> bool:
+        if self.eof:
+            return False
+        data = self._f.read(max(self._chunk_size, at_least))
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+
+def _decompressor(raw: BinaryIO, codec: str) -> BinaryIO:
+    if codec == "gzip":
+        import gzip
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if codec in ("xz", "lzma"):
+        import lzma
+        return lzma.LZMAFile(raw, "rb")          # FORMAT_AUTO: xz & lzma lama
+    raise ValueError(f"Kompresi tidak dikenal: {codec}")
+
+
+def _compressor(raw: BinaryIO, codec: str) -> BinaryIO:
+    if codec == "gzip":
+        import gzip
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0)
+    if codec in ("xz", "lzma"):
+        import lzma
+        fmt = lzma.FORMAT_XZ if codec == "xz" else lzma.FORMAT_ALONE
+        return lzma.LZMAFile(raw, "wb", format=fmt, preset=3)
+    raise ValueError(f"Kompresi tidak dikenal: {codec}")
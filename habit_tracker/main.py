@@ -1,9 +1,5 @@
+from contextlib import ExitStack
 import os
-import tkinter as tk
-
-from storage import JsonStorage
-from tracker import HabitTracker
-from ui import HabitTrackerUI
 
 
 def main() -> None:
@@ -19,18 +15,66 @@ def main() -> None:
     - Menghitung streak
     - Mengelola habit
     - Menyentuh data mentah
+
+    Tkinter & UI di-import di sini, bukan di level modul:
+    mode headless (cli.py) tidak ikut membayar import GUI.
     """
+    import tkinter as tk
+
+    from storage import JsonStorage
+    from tracker import HabitTracker
+    from ui import HabitTrackerUI
+    from watcher import DataWatcher
+
     # Tentukan lokasi file data
     base_dir = os.path.dirname(os.path.abspath(__file__))
     json_path = os.path.join(base_dir, "habits.json")
 
     storage = JsonStorage(json_path)    # Setup Persistence Layer
-    tracker = HabitTracker(storage)     # Setup Application Service
-    tracker.load()                      # Load state awal dari storage
+    tracker = HabitTracker(             # Setup Application Service
+        storage,
+        flush_every=20,                 # burst toggle → satu kali tulis
+        flush_interval_ms=1500,         # ...atau paling lambat 1.5 detik
+        auto_flush=False,               # UI yang memicu flush lewat worker thread
+    )
+
+    with ExitStack() as stack:
+        _setup_instrumentation(stack, tracker)
+
+        tracker.load(lazy=True)         # Load state awal (histori di-decode saat dipakai)
+
+        root = tk.Tk()                  # Setup UI
+        ui = HabitTrackerUI(            # UI menerima tracker (dependency injection)
+            root,
+            tracker,
+            background=True,            # simpan / summary / export di worker thread
+            watcher=DataWatcher(tracker, storage),  # habits.json diubah proses lain → hot reload
+        )
+        try:
+            root.mainloop()             # Start application loop
+        finally:
+            ui.close()                  # stop hot reload, lepas callback render, tunggu job simpan
+            tracker.flush()             # mutasi pending jangan sampai hilang (widget sudah tidak disentuh)
+
+
+def _setup_instrumentation(stack: ExitStack, tracker) -> None:
+    """
+    Opt-in lewat env var (tanpa env var → tidak ada wrapper sama sekali):
+    - HABIT_METRICS=path.json → dump metrics saat keluar
+    - HABIT_PROFILE=path.prof → dump cProfile (pstats) saat keluar
+    """
+    metrics_path = os.environ.get("HABIT_METRICS")
+    profile_path = os.environ.get("HABIT_PROFILE")
+    if not (metrics_path or profile_path):
+        return
+
+    from metrics import Instrumentation
 
-    root = tk.Tk()                      # Setup UI
-    HabitTrackerUI(root, tracker)       # UI menerima tracker (dependency injection)
-    root.mainloop()                     # Start application loop
+    instrumentation = stack.enter_context(Instrumentation(tracker))
+    if profile_path:
+        stack.enter_context(Instrumentation.profile(profile_path))
+    if metrics_path:
+        stack.callback(instrumentation.dump_json, metrics_path)
 
 
 if __name__ == "__main__":              # Python entry guard
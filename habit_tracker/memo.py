@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Tuple
+import threading
+
+from habit import Habit
+
+
+class HabitRowCache:
+    """
+    HabitRowCache = memo hasil analitik per habit (baris weekly summary)
+
+    - Key   : tanggal ref → (id habit → baris)
+    - Valid : selama Habit.version() sama (versi unik global, lihat habit.py)
+      → habit yang tidak disentuh tidak dihitung ulang,
+        habit yang berubah otomatis dihitung ulang (tanpa invalidasi manual)
+      → satu cache dipakai bersama tracker & snapshot-nya (clone punya versi yang sama)
+    - LRU   : per tanggal ref, maksimal `max_refs` minggu/ref yang disimpan;
+      satu ref selalu memuat SEMUA habit yang pernah dihitung untuknya,
+      jadi satu pass summary tidak pernah mengusir barisnya sendiri
+      (batasnya ikut jumlah habit, bukan angka tetap)
+    - Thread-safe (summary juga dihitung di worker thread UI)
+
+    Cache tidak tahu cara menghitung; fungsi hitung diberikan pemanggil (tracker).
+    """
+
+    def __init__(self, max_refs: int = 8) -> None:
+        if max_refs < 1:
+            raise ValueError("max_refs minimal 1.")
+        self._max_refs = max_refs
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[date, Dict[str, Tuple[int, Dict[str, Any]]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        habit: Habit,
+        ref: date,
+        compute: Callable[[Habit], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        hid = habit.get_id()
+        version = habit.version()
+        with self._lock:
+            rows = self._entries.get(ref)
+            if rows is not None:
+                self._entries.move_to_end(ref)
+                entry = rows.get(hid)
+                if entry is not None and entry[0] == version:
+                    self.hits += 1
+                    return dict(entry[1])           # salinan: pemanggil boleh mengubah hasilnya
+            self.misses += 1
+
+        row = compute(habit)                        # dihitung di luar lock
+
+        with self._lock:
+            rows = self._entries.get(ref)
+            if rows is None:
+                rows = self._entries[ref] = {}
+                while len(self._entries) > self._max_refs:
+                    self._entries.popitem(last=False)
+            self._entries.move_to_end(ref)
+            rows[hid] = (version, row)
+        return dict(row)
+
+    def discard(self, habit_id: str) -> None:
+        """Buang semua entry satu habit (misalnya setelah habit dihapus)."""
+        with self._lock:
+            for rows in self._entries.values():
+                rows.pop(habit_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._entries.values())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": sum(len(rows) for rows in self._entries.values()),
+                "refs": len(self._entries),
+                "max_refs": self._max_refs,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
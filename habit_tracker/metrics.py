@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+
+from habit import Habit
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class Metrics:
+    """
+    Metrics = registry angka in-process
+
+    - timer   : jumlah panggilan, total waktu, persentil (dari N sampel terakhir)
+    - counter : angka kumulatif (bytes dibaca / ditulis, dsb.)
+    - actions : berapa kali storage menulis untuk setiap aksi user
+    Thread-safe (dipakai juga oleh worker thread UI).
+    """
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        self._lock = threading.Lock()
+        self._max_samples = max_samples
+        self._timers: Dict[str, Tuple[int, float, Deque[float]]] = {}
+        self._counters: Dict[str, int] = {}
+        self._actions: Dict[str, List[int]] = {}         # aksi → [jumlah aksi, jumlah tulis]
+
+    def record(self, name: str, ms: float) -> None:
+        with self._lock:
+            count, total, samples = self._timers.get(name) or (0, 0.0, deque(maxlen=self._max_samples))
+            samples.append(ms)
+            self._timers[name] = (count + 1, total + ms, samples)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def record_action(self, action: str, writes: int) -> None:
+        with self._lock:
+            stats = self._actions.setdefault(action, [0, 0])
+            stats[0] += 1
+            stats[1] += writes
+
+    def record_action_writes(self, action: str, writes: int) -> None:
+        """Tulis yang terjadi SESUDAH aksi selesai (write-behind / job flush di thread lain)."""
+        with self._lock:
+            self._actions.setdefault(action, [0, 0])[1] += writes
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self._actions.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            timers = {name: (c, t, sorted(s)) for name, (c, t, s) in self._timers.items()}
+            counters = dict(self._counters)
+            actions = {name: tuple(v) for name, v in self._actions.items()}
+
+        return {
+            "timers": {
+                name: {
+                    "count": count,
+                    "total_ms": round(total, 3),
+                    "mean_ms": round(total / count, 4) if count else 0.0,
+                    "p50_ms": round(_percentile(samples, 50), 4),
+                    "p90_ms": round(_percentile(samples, 90), 4),
+                    "p99_ms": round(_percentile(samples, 99), 4),
+                    "max_ms": round(samples[-1], 4) if samples else 0.0,
+                }
+                for name, (count, total, samples) in sorted(timers.items())
+            },
+            "counters": counters,
+            "writes_per_action": {
+                name: {"actions": n, "writes": w, "mean": round(w / n, 3) if n else 0.0}
+                for name, (n, w) in sorted(actions.items())
+            },
+        }
+
+    def dump_json(self, filepath: str) -> None:
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+class Instrumentation:
+    """
+    Instrumentation = pasang / lepas pengukuran di sekitar HabitTracker & storage-nya
+
+    - Opt-in: method dibungkus HANYA saat enable(); saat disable()
+      method asli dikembalikan → overhead nol ketika tidak aktif
+    - Yang diukur:
+        tracker : load, save, flush, summary, export, mutasi (per aksi user)
+        storage : load / iter_habits, save, apply_changes (+ bytes dibaca / ditulis dari ukuran file)
+        habit   : current_streak, longest_streak (per_habit=True, dipasang di level class)
+    - writes_per_action: tulis di dalam aksi dihitung langsung; aksi yang selesai dengan
+      mutasi pending (write-behind) menunggu flush berikutnya. Job flush yang diambil di luar
+      aksi (detach_flush, dijalankan di worker / flusher) dihitung untuk aksi-aksi itu
+    """
+
+    TRACKER_METHODS = (
+        "load", "save", "flush", "weekly_summary", "habit_summary",
+        "summary_page", "habit_page", "checklist_page",
+        "export_week_csv", "export_history",
+    )
+    # aksi user: dihitung juga berapa kali storage menulis selama aksi berjalan
+    ACTION_METHODS = (
+        "add_habit", "edit_habit", "delete_habit", "set_habit_active",
+        "set_done_on_date", "bulk_set_done", "import_checkins",
+    )
+    STORAGE_METHODS = ("load", "save", "apply_changes")
+    # generator (streaming load): yang diukur waktu di dalam generator saja, bukan pemakai record
+    STORAGE_STREAMS = ("iter_habits",)
+    HABIT_METHODS = ("current_streak", "longest_streak")
+
+    _habit_patch_lock = threading.Lock()
+    _habit_patch_users = 0
+    _habit_originals: Dict[str, Callable[..., Any]] = {}
+
+    def __init__(self, tracker: Any, metrics: Optional[Metrics] = None, per_habit: bool = True) -> None:
+        self.metrics = metrics or Metrics()
+        self._tracker = tracker
+        self._per_habit = per_habit
+        self._patched: List[Tuple[Any, str]] = []
+        self._local = threading.local()                 # state aksi per thread
+        self._pending_lock = threading.Lock()
+        self._pending_actions: Dict[str, None] = {}     # aksi yang mutasinya belum ditulis
+        self._enabled = False
+
+    # ---------- lifecycle ----------
+    def enable(self) -> Instrumentation:
+        if self._enabled:
+            return self
+        tracker = self._tracker
+        storage = tracker._storage
+
+        for name in self.TRACKER_METHODS:
+            self._patch(tracker, name, self._timed(f"tracker.{name}", getattr(tracker, name)))
+        for name in self.ACTION_METHODS:
+            self._patch(tracker, name, self._action(name, getattr(tracker, name)))
+        self._patch(tracker, "detach_flush", self._detach(tracker.detach_flush))
+        for name in self.STORAGE_METHODS:
+            self._patch(storage, name, self._storage_call(name, getattr(storage, name)))
+        for name in self.STORAGE_STREAMS:
+            if hasattr(storage, name):                  # tracker.load() memakai iter_habits jika ada
+                self._patch(storage, name, self._storage_stream(name, getattr(storage, name)))
+
+        if self._per_habit:
+            self._patch_habit_class()
+        self._enabled = True
+        return self
+
+    def disable(self) -> None:
+        if not self._enabled:
+            return
+        for obj, name in self._patched:
+            try:
+                delattr(obj, name)                      # method class terlihat lagi
+            except AttributeError:
+                pass
+        self._patched.clear()
+        if self._per_habit:
+            self._unpatch_habit_class()
+        self._enabled = False
+
+    def __enter__(self) -> Instrumentation:
+        return self.enable()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.disable()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self.metrics.snapshot()
+
+    def dump_json(self, filepath: str) -> None:
+        self.metrics.dump_json(filepath)
+
+    @staticmethod
+    @contextmanager
+    def profile(filepath: Optional[str] = None) -> Iterator[cProfile.Profile]:
+        """cProfile di sekitar blok; hasil di-dump ke filepath (format pstats) jika diberikan."""
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield prof
+        finally:
+            prof.disable()
+            if filepath:
+                prof.dump_stats(filepath)
+
+    # ---------- wrapper ----------
+    def _patch(self, obj: Any, name: str, wrapper: Callable[..., Any]) -> None:
+        setattr(obj, name, wrapper)                     # atribut instance menutupi method class
+        self._patched.append((obj, name))
+
+    def _timed(self, metric: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        record = self.metrics.record
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(metric, (time.perf_counter() - t0) * 1000)
+
+        return wrapper
+
+    def _action(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        timed = self._timed(f"tracker.{name}", fn)
+        local = self._local
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if getattr(local, "writes", None) is not None:  # aksi di dalam aksi → ikut aksi luar
+                return timed(*args, **kwargs)
+            local.writes = 0
+            try:
+                return timed(*args, **kwargs)
+            finally:
+                writes, local.writes = local.writes, None
+                self.metrics.record_action(name, writes)
+                if not writes and self._tracker.is_dirty():    # ditulis nanti oleh flush
+                    with self._pending_lock:
+                        self._pending_actions[name] = None
+
+        return wrapper
+
+    def _detach(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """detach_flush: job yang diambil di luar aksi → tulisnya milik aksi yang masih pending."""
+        local = self._local
+        metrics = self.metrics
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            job = fn(*args, **kwargs)
+            if job is None:
+                return None
+            with self._pending_lock:
+                owners = list(self._pending_actions)
+                self._pending_actions.clear()
+            if getattr(local, "writes", None) is not None or not owners:
+                return job                              # flush di dalam aksi → ikut aksi itu
+
+            def attributed() -> None:
+                outer = getattr(local, "writes", None)  # thread yang menjalankan job (bisa worker)
+                local.writes = 0
+                try:
+                    job()
+                finally:
+                    writes, local.writes = local.writes, outer
+                    for name in owners:
+                        metrics.record_action_writes(name, writes)
+
+            return attributed
+
+        return wrapper
+
+    def _storage_call(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        timed = self._timed(f"storage.{name}", fn)
+        storage = self._tracker._storage
+        local = self._local
+        metrics = self.metrics
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            before = self._storage_bytes(storage)
+            result = timed(*args, **kwargs)
+            if name == "load":
+                metrics.incr("storage.bytes_read", self._storage_bytes(storage))
+                return result
+
+            metrics.incr("storage.writes")
+            metrics.incr("storage.bytes_written", max(0, self._storage_bytes(storage) - before)
+                         if name == "apply_changes" else self._storage_bytes(storage))
+            if getattr(local, "writes", None) is not None:
+                local.writes += 1
+            return result
+
+        return wrapper
+
+    def _storage_stream(self, name: str, fn: Callable[..., Iterator[Any]]) -> Callable[..., Iterator[Any]]:
+        metric = f"storage.{name}"
+        storage = self._tracker._storage
+        metrics = self.metrics
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            elapsed = 0.0
+            try:
+                t0 = time.perf_counter()
+                it = iter(fn(*args, **kwargs))
+                elapsed += time.perf_counter() - t0
+                while True:
+                    t0 = time.perf_counter()
+                    try:
+                        item = next(it)
+                    except StopIteration:
+                        break
+                    finally:
+                        elapsed += time.perf_counter() - t0
+                    yield item
+            finally:                                    # habis, berhenti di tengah, atau error baca
+                metrics.record(metric, elapsed * 1000)
+                metrics.incr("storage.bytes_read", self._storage_bytes(storage))
+
+        return wrapper
+
+    @staticmethod
+    def _storage_bytes(storage: Any) -> int:
+        """Ukuran file yang dipakai storage (snapshot + journal / WAL jika ada)."""
+        base = getattr(storage, "_filepath", None)
+        if not base:
+            return 0
+        total = 0
+        for path in (base, base + ".journal", base + "-wal"):
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def _patch_habit_class(self) -> None:
+        cls = Instrumentation
+        with cls._habit_patch_lock:
+            cls._habit_patch_users += 1
+            if cls._habit_patch_users > 1:
+                return
+            # dipasang sekali untuk semua instance aktif; metrics milik instance pertama
+            for name in self.HABIT_METHODS:
+                original = getattr(Habit, name)
+                cls._habit_originals[name] = original
+                setattr(Habit, name, self._timed(f"habit.{name}", original))
+
+    def _unpatch_habit_class(self) -> None:
+        cls = Instrumentation
+        with cls._habit_patch_lock:
+            cls._habit_patch_users -= 1
+            if cls._habit_patch_users:
+                return
+            for name, original in cls._habit_originals.items():
+                setattr(Habit, name, original)
+            cls._habit_originals.clear()
+
+
+def instrument(tracker: Any, metrics: Optional[Metrics] = None, per_habit: bool = True) -> Instrumentation:
+    """Shortcut: pasang instrumentasi ke tracker dan langsung aktifkan."""
+    return Instrumentation(tracker, metrics, per_habit).enable()
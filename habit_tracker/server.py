@@ -0,0 +1,498 @@
+"""
+Server HTTP/JSON lokal (stdlib saja) di atas SATU HabitTracker in-memory.
+
+Endpoint:
+    GET  /habits[?active=1]                        → daftar habit
+    GET  /checklist[?date=YYYY-MM-DD]              → checklist satu tanggal
+         (keduanya: &offset=&limit=&prefix= → satu halaman + "total"; /habits juga &sort=&desc=1)
+    POST /checkin   {"habit_id", "date"?, "done"?} → satu check-in
+                    {"checkins": [{...}, ...]}     → bulk (validasi semua dulu)
+    GET  /summary[?date=...&habit=...]             → weekly summary (JSON)
+    GET  /export?start=...&end=...[&granularity=day|week|month&format=csv|jsonl&active=1]
+         (body di-stream: Transfer-Encoding chunked)
+    GET  /export?week=YYYY-MM-DD                   → CSV weekly summary
+
+Contoh:
+    python server.py -f habits.json --port 8765
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+import csv
+import io
+import itertools
+import json
+import threading
+
+from tracker import HabitTracker
+from watcher import DataWatcher
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 64 * 1024                       # byte teks per chunk HTTP saat export
+
+
+class RWLock:
+    """
+    RWLock = reader-writer lock (writer diprioritaskan)
+
+    - Banyak reader boleh jalan bersamaan (summary, list, export)
+    - Writer eksklusif (check-in, auto-freeze, ambil job flush)
+    - Writer yang menunggu menahan reader BARU → writer tidak kelaparan
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class HabitService:
+    """
+    HabitService = akses thread-safe ke satu HabitTracker
+
+    - Baca (list / summary) di bawah read lock → paralel;
+      export histori di-stream dari snapshot, tanpa menahan lock selama mengirim
+    - Tulis (check-in) di bawah write lock → berurutan, hanya di memori
+    - Disk ditulis oleh SATU thread flusher (write-behind):
+      job flush diambil di bawah write lock (hanya clone habit yang berubah),
+      serialisasi + I/O terjadi di luar lock
+      → reader & check-in tidak menunggu to_dict/JSON/disk, urutan tulis tetap terjaga
+    - watcher (opsional) dicek oleh thread flusher yang sama: file dibaca di luar lock,
+      delta per habit diterapkan di bawah write lock
+
+    Tracker harus dibuat dengan auto_flush=False dan di-load eager
+    (lazy hydrate = mutasi saat baca, tidak aman di bawah read lock).
+
+    Semua mutasi lewat service → `generation` naik di setiap write;
+    JSON summary di-cache per (ref, habit) selama generation belum berubah.
+    """
+
+    RESPONSE_CACHE_SIZE = 256
+
+    def __init__(
+        self,
+        tracker: HabitTracker,
+        flush_interval_ms: int = 200,
+        watcher: Optional[DataWatcher] = None,
+    ) -> None:
+        self._tracker = tracker
+        self._watcher = watcher
+        self._lock = RWLock()
+        self._generation = 0                        # naik setiap mutasi (di bawah write lock)
+        self._responses: OrderedDict[Tuple[date, Optional[str]], Tuple[int, bytes]] = OrderedDict()
+        self._responses_lock = threading.Lock()
+        self._flush_interval = flush_interval_ms / 1000
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="habit-flusher", daemon=True)
+        self._flusher.start()
+
+    # ---------- read ----------
+    def list_habits(self, active_only: bool = False) -> List[Dict[str, Any]]:
+        with self._lock.read():
+            habits = self._tracker.list_habits(active_only=active_only)
+            return [{"id": h.get_id(), "name": h.get_name(), "is_active": h.is_active()} for h in habits]
+
+    def habit_page(self, active_only: bool, **page: Any) -> Tuple[List[Dict[str, Any]], int]:
+        with self._lock.read():
+            habits, total = self._tracker.habit_page(active_only=active_only, **page)
+            return [{"id": h.get_id(), "name": h.get_name(), "is_active": h.is_active()} for h in habits], total
+
+    def checklist(self, day: date) -> List[Dict[str, Any]]:
+        with self._lock.read():
+            rows = self._tracker.get_checklist_for_date(day)
+        return [{"id": hid, "name": name, "done": done} for hid, name, done in rows]
+
+    def checklist_page(self, day: date, **page: Any) -> Tuple[List[Dict[str, Any]], int]:
+        with self._lock.read():
+            rows, total = self._tracker.checklist_page(day, **page)
+        return [{"id": hid, "name": name, "done": done} for hid, name, done in rows], total
+
+    def summary(self, ref: date, habit_id: Optional[str] = None) -> Dict[str, Any]:
+        return self._summary(ref, habit_id)[1]
+
+    def summary_json(self, ref: date, habit_id: Optional[str] = None) -> bytes:
+        """Summary yang sudah di-encode; request berulang tanpa mutasi = satu lookup dict."""
+        key = (ref, habit_id)
+        with self._responses_lock:
+            hit = self._responses.get(key)
+            if hit is not None and hit[0] == self._generation:
+                self._responses.move_to_end(key)
+                return hit[1]
+
+        generation, summary = self._summary(ref, habit_id)
+        body = json.dumps(summary, ensure_ascii=False).encode("utf-8")
+        with self._responses_lock:
+            self._responses[key] = (generation, body)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return body
+
+    def _summary(self, ref: date, habit_id: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+        tracker = self._tracker
+        while True:
+            with self._lock.read():
+                # auto-freeze = mutasi → hanya naik ke write lock jika memang ada yang di-freeze
+                if not tracker.auto_freeze_pending(ref):
+                    if habit_id is not None:
+                        return self._generation, tracker.habit_summary(habit_id, ref, auto_freeze=False)
+                    return self._generation, tracker.weekly_summary(ref, auto_freeze=False)
+            with self._lock.write():
+                tracker.apply_auto_freeze(ref)
+                self._generation += 1
+
+    def history_rows(self, start: date, end: date, granularity: str, active_only: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Generator baris histori dari snapshot tracker → boleh di-stream ke client
+        tanpa menahan lock (check-in baru tidak ikut ke export yang sedang jalan).
+        """
+        with self._lock.write():                    # snapshot() memperbarui cache clone milik tracker
+            snap = self._tracker.snapshot()
+        rows = snap.iter_history_rows(start, end, granularity, active_only)
+        first = next(rows, None)                    # parameter salah → ValueError sebelum header terkirim
+        return rows if first is None else itertools.chain([first], rows)
+
+    # ---------- write ----------
+    def checkin(self, items: List[Tuple[str, date, bool]]) -> int:
+        with self._lock.write():
+            self._generation += 1
+            if len(items) == 1:
+                self._tracker.set_done_on_date(*items[0])
+                return 1
+            return self._tracker.bulk_set_done(items)
+
+    # ---------- lifecycle ----------
+    def flush(self) -> bool:
+        """Tulis mutasi pending sekarang (dipanggil flusher & saat shutdown)."""
+        with self._lock.write():
+            job = self._tracker.detach_flush()      # murah: clone per habit, belum serialisasi
+        if job is None:
+            return False
+        try:
+            job()                                   # to_dict + tulis file, tanpa lock
+        except Exception:
+            with self._lock.write():
+                self._tracker.mark_unsaved()        # coba lagi di putaran berikutnya (snapshot penuh)
+            raise
+        with self._lock.write():
+            if self._tracker.sync_external():       # check-in proses lain yang ikut di-merge storage
+                self._generation += 1
+        return True
+
+    def reload_external(self) -> bool:
+        """Hot reload perubahan file oleh proses lain (dipanggil thread flusher, setelah flush)."""
+        if self._watcher is None or not self._watcher.due() or not self._watcher.check():
+            return False
+        with self._lock.write():
+            if not self._watcher.apply():
+                return False
+            self._generation += 1
+        return True
+
+    def close(self) -> None:
+        self._stop.set()
+        self._flusher.join()
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            try:
+                self.flush()
+                self.reload_external()              # sesudah flush: tidak ada job simpan yang membawa data lama
+            except Exception:
+                pass                                # state tetap dirty, dicoba lagi
+
+
+class HabitRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"                   # keep-alive: satu koneksi untuk banyak request
+    disable_nagle_algorithm = True                  # header & body terkirim tanpa jeda delayed-ACK
+    server: HabitHTTPServer
+
+    def do_GET(self) -> None:
+        self._dispatch({
+            "/habits": self._get_habits,
+            "/checklist": self._get_checklist,
+            "/summary": self._get_summary,
+            "/export": self._get_export,
+        })
+
+    def do_POST(self) -> None:
+        self._dispatch({"/checkin": self._post_checkin})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    # ---------- endpoint ----------
+    def _get_habits(self, q: Dict[str, str]) -> None:
+        service = self.server.service
+        page = _page_params(q)
+        if page is None:
+            self._send_json({"habits": service.list_habits(_flag(q, "active"))})
+            return
+        if "sort" in q:
+            page.update(sort=q["sort"], descending=_flag(q, "desc"))
+        habits, total = service.habit_page(_flag(q, "active"), **page)
+        self._send_json({"habits": habits, "total": total, "offset": page["offset"]})
+
+    def _get_checklist(self, q: Dict[str, str]) -> None:
+        service = self.server.service
+        day = _date_param(q, "date") or date.today()
+        page = _page_params(q)
+        if page is None:
+            self._send_json({"date": day.isoformat(), "habits": service.checklist(day)})
+            return
+        rows, total = service.checklist_page(day, **page)
+        self._send_json({"date": day.isoformat(), "habits": rows, "total": total, "offset": page["offset"]})
+
+    def _get_summary(self, q: Dict[str, str]) -> None:
+        ref = _date_param(q, "date") or date.today()
+        body = self.server.service.summary_json(ref, q.get("habit"))
+        self._send(200, body, "application/json; charset=utf-8")
+
+    def _get_export(self, q: Dict[str, str]) -> None:
+        service = self.server.service
+        if "week" in q:
+            buf = io.StringIO()
+            summary = service.summary(_date_param(q, "week") or date.today())
+            csv.writer(buf).writerows(HabitTracker.week_csv_rows(summary))
+            self._send(200, buf.getvalue().encode("utf-8"), "text/csv; charset=utf-8")
+            return
+
+        start, end = _date_param(q, "start"), _date_param(q, "end")
+        if start is None or end is None:
+            raise ValueError("Parameter start & end (atau week) wajib diisi.")
+        fmt = q.get("format", "csv")
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError("Format export harus 'csv' atau 'jsonl'.")
+
+        rows = service.history_rows(start, end, q.get("granularity", "day"), _flag(q, "active"))
+        if fmt == "csv":
+            self._send_stream(_csv_lines(rows, HabitTracker.HISTORY_COLUMNS), "text/csv; charset=utf-8")
+        else:
+            lines = (json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+            self._send_stream(lines, "application/x-ndjson")
+
+    def _post_checkin(self, q: Dict[str, str]) -> None:
+        body = self._read_json()
+        records = body.get("checkins") if isinstance(body, dict) and "checkins" in body else [body]
+        if not isinstance(records, list) or not records:
+            raise ValueError("Body harus objek check-in atau {\"checkins\": [...]}.")
+
+        items = [_parse_checkin(n, rec) for n, rec in enumerate(records, start=1)]
+        self._send_json({"applied": self.server.service.checkin(items)})
+
+    # ---------- internal helper ----------
+    def _dispatch(self, routes: Dict[str, Callable[[Dict[str, str]], None]]) -> None:
+        url = urlsplit(self.path)
+        handler = routes.get(url.path.rstrip("/") or "/")
+        if handler is None:
+            self._send_json({"error": f"Endpoint tidak dikenal: {url.path}"}, 404)
+            return
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            handler(query)
+        except ValueError as e:                     # input salah / habit tidak ditemukan
+            self._send_json({"error": str(e)}, 400)
+        except Exception as e:
+            self._send_json({"error": f"{type(e).__name__}: {e}"}, 500)
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Body bukan JSON valid ({e}).") from None
+
+    def _send_json(self, payload: Any, status: int = 200) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, lines: Iterable[str], content_type: str) -> None:
+        """
+        Kirim body chunked, ±STREAM_CHUNK_SIZE per chunk → memori tidak tumbuh dengan ukuran export.
+        Error di tengah jalan tidak bisa jadi status 500 lagi (header sudah terkirim):
+        koneksi ditutup tanpa chunk penutup, jadi client tahu body tidak lengkap.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        buf: List[str] = []
+        size = 0
+        try:
+            for line in lines:
+                buf.append(line)
+                size += len(line)
+                if size >= STREAM_CHUNK_SIZE:
+                    self._write_chunk("".join(buf).encode("utf-8"))
+                    buf.clear()
+                    size = 0
+            if buf:
+                self._write_chunk("".join(buf).encode("utf-8"))
+        except Exception:
+            self.close_connection = True
+            return
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+
+class HabitHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: HabitService, quiet: bool = True) -> None:
+        super().__init__(address, HabitRequestHandler)
+        self.service = service
+        self.quiet = quiet
+
+
+def serve(
+    tracker: HabitTracker,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    flush_interval_ms: int = 200,
+    quiet: bool = True,
+    watcher: Optional[DataWatcher] = None,
+) -> HabitHTTPServer:
+    """Buat server (belum jalan); panggil serve_forever() lalu shutdown() + service.close()."""
+    return HabitHTTPServer((host, port), HabitService(tracker, flush_interval_ms, watcher), quiet)
+
+
+def _csv_lines(rows: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    """Baris CSV (header dulu) satu per satu, tanpa menampung seluruh file."""
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=columns)
+    w.writeheader()
+    yield buf.getvalue()
+    for row in rows:
+        buf.seek(0)
+        buf.truncate()
+        w.writerow(row)
+        yield buf.getvalue()
+
+
+# ---------- parsing ----------
+def _flag(q: Dict[str, str], name: str) -> bool:
+    return q.get(name, "").strip().lower() in ("1", "true", "yes")
+
+
+def _date_param(q: Dict[str, str], name: str) -> Optional[date]:
+    value = q.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Parameter {name} harus YYYY-MM-DD.") from None
+
+
+def _page_params(q: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """offset / limit / prefix dari query; None jika tidak ada (respons lama tanpa paging)."""
+    if not any(k in q for k in ("offset", "limit", "prefix", "sort")):
+        return None
+    try:
+        offset = int(q.get("offset", 0))
+        limit = int(q.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("Parameter offset & limit harus angka.") from None
+    if limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit maksimal {MAX_PAGE_SIZE}.")
+    return {"offset": offset, "limit": limit, "prefix": q.get("prefix") or None}
+
+
+def _parse_checkin(n: int, rec: Any) -> Tuple[str, date, bool]:
+    if not isinstance(rec, dict) or "habit_id" not in rec:
+        raise ValueError(f"Check-in {n}: habit_id wajib diisi.")
+    try:
+        day = date.fromisoformat(rec["date"]) if rec.get("date") else date.today()
+    except (TypeError, ValueError):
+        raise ValueError(f"Check-in {n}: tanggal harus YYYY-MM-DD.") from None
+    done = rec.get("done", True)
+    if done not in (True, False) or isinstance(done, float):     # bool, 0 / 1; "false" / "0" ditolak
+        raise ValueError(f"Check-in {n}: done harus true/false (atau 0/1).")
+    return str(rec["habit_id"]), day, bool(done)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+    import os
+
+    from storage import open_storage
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    p = argparse.ArgumentParser(description="Server HTTP/JSON Habit Tracker.")
+    p.add_argument("-f", "--file", default=os.path.join(base_dir, "habits.json"))
+    p.add_argument("--kind", choices=("json", "journal", "sqlite", "snapshot"))
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--flush-ms", type=int, default=200, help="interval flush write-behind")
+    p.add_argument("--watch-ms", type=int, default=1000,
+                   help="interval cek perubahan file oleh proses lain (0 = mati; JSON saja)")
+    p.add_argument("--verbose", action="store_true", help="log setiap request")
+    args = p.parse_args(argv)
+
+    storage = open_storage(args.file, args.kind)
+    tracker = HabitTracker(storage, auto_flush=False)
+    tracker.load()                                  # eager: baca paralel tanpa hydrate
+    watcher = None
+    if args.watch_ms > 0 and DataWatcher.supported(storage):
+        watcher = DataWatcher(tracker, storage, interval_ms=args.watch_ms)
+    httpd = serve(tracker, args.host, args.port, args.flush_ms, quiet=not args.verbose, watcher=watcher)
+    print(f"Listening on http://{args.host}:{httpd.server_address[1]}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        httpd.service.close()                       # mutasi pending jangan sampai hilang
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import re
+
+from storage import BaseStorage, open_storage
+from tracker import HabitTracker
+
+
+_USER_ID = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+# ---------- Worker (jalan di proses lain) ----------
+# Harus fungsi level modul supaya bisa di-pickle oleh ProcessPoolExecutor.
+# Proses pool dipakai ulang untuk banyak shard → storage selalu ditutup (koneksi SQLite / WAL).
+def _summarize_shard(path: str, kind: Optional[str], ref_iso: str) -> Dict[str, Any]:
+    storage = open_storage(path, kind)
+    try:
+        with HabitTracker(storage) as tracker:         # auto-freeze ikut tersimpan di shard-nya
+            tracker.load(lazy=True)
+            return tracker.weekly_summary(date.fromisoformat(ref_iso))
+    finally:
+        storage.close()
+
+
+def _export_shard(path: str, kind: Optional[str], ref_iso: str, out_path: str) -> str:
+    storage = open_storage(path, kind)
+    try:
+        with HabitTracker(storage) as tracker:
+            tracker.load(lazy=True)
+            tracker.export_week_csv(out_path, date.fromisoformat(ref_iso))
+    finally:
+        storage.close()
+    return out_path
+
+
+class ShardedTracker:
+    """
+    ShardedTracker = banyak user, satu shard storage per user
+
+    - Shard  : <root_dir>/<user_id><ext> (JsonStorage / JournalStorage / SqliteStorage)
+    - Tracker: HabitTracker per user, dibuka sesuai kebutuhan,
+      maksimal `max_open` sekaligus (LRU, yang tergusur di-flush dulu)
+    - Batch  : summary / export semua user dijalankan paralel
+      di ProcessPoolExecutor, satu shard per job
+
+    Gagal di satu shard (termasuk user id yang tidak valid) TIDAK menghentikan shard lain:
+    hasilnya dilaporkan sebagai {"user": ..., "error": ...}.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        kind: Optional[str] = None,
+        ext: str = ".json",
+        max_open: int = 32,
+    ) -> None:
+        self._root = root_dir
+        self._kind = kind
+        self._ext = ext
+        self._max_open = max(1, max_open)
+        self._open: OrderedDict[str, Tuple[HabitTracker, BaseStorage]] = OrderedDict()
+
+        os.makedirs(root_dir, exist_ok=True)
+
+    # ---------- Shard ----------
+    def shard_path(self, user_id: str) -> str:
+        if not _USER_ID.match(user_id or ""):
+            raise ValueError("User id hanya boleh huruf, angka, '_', '.', '-'.")
+        return os.path.join(self._root, user_id + self._ext)
+
+    def users(self) -> List[str]:
+        return sorted(
+            name[: -len(self._ext)]
+            for name in os.listdir(self._root)
+            if name.endswith(self._ext)
+        )
+
+    def tracker(self, user_id: str) -> HabitTracker:
+        """HabitTracker milik user (dibuat / di-load saat pertama dipakai)."""
+        entry = self._open.get(user_id)
+        if entry is not None:
+            self._open.move_to_end(user_id)
+            return entry[0]
+
+        storage = open_storage(self.shard_path(user_id), self._kind)
+        try:
+            tracker = HabitTracker(storage)
+            tracker.load(lazy=True)
+        except BaseException:
+            storage.close()
+            raise
+        self._open[user_id] = (tracker, storage)
+
+        while len(self._open) > self._max_open:
+            _, evicted = self._open.popitem(last=False)
+            self._release(*evicted)
+        return tracker
+
+    def flush_all(self) -> None:
+        for tracker, _ in self._open.values():
+            tracker.flush()
+
+    def close(self) -> None:
+        """Flush lalu tutup storage semua tracker yang terbuka."""
+        while self._open:
+            _, entry = self._open.popitem(last=False)
+            self._release(*entry)
+
+    def __enter__(self) -> ShardedTracker:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---------- Batch ----------
+    def weekly_summaries(
+        self,
+        ref: Optional[date] = None,
+        users: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield {"user", "summary"} (atau {"user", "error"}) per user,
+        urutan sesuai selesainya job.
+        """
+        ref_iso = (ref or date.today()).isoformat()
+
+        def args(user: str) -> Tuple[Any, ...]:
+            return self.shard_path(user), self._kind, ref_iso
+
+        for user, result, error in self._run_batch(_summarize_shard, self._batch_users(users), args, max_workers):
+            yield {"user": user, "error": error} if error else {"user": user, "summary": result}
+
+    def export_week_csv_all(
+        self,
+        out_dir: str,
+        ref: Optional[date] = None,
+        users: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Export CSV mingguan per user ke <out_dir>/<user_id>.csv."""
+        os.makedirs(out_dir, exist_ok=True)
+        ref_iso = (ref or date.today()).isoformat()
+
+        def args(user: str) -> Tuple[Any, ...]:
+            return self.shard_path(user), self._kind, ref_iso, os.path.join(out_dir, user + ".csv")
+
+        for user, result, error in self._run_batch(_export_shard, self._batch_users(users), args, max_workers):
+            yield {"user": user, "error": error} if error else {"user": user, "path": result}
+
+    # ---------- internal helper ----------
+    @staticmethod
+    def _release(tracker: HabitTracker, storage: BaseStorage) -> None:
+        try:
+            tracker.flush()
+        finally:
+            storage.close()
+
+    def _batch_users(self, users: Optional[Iterable[str]]) -> Iterable[str]:
+        # worker membaca & menulis shard langsung dari disk:
+        # state in-memory di-flush lalu dilepas supaya tidak basi / saling timpa
+        self.close()
+        return self.users() if users is None else users
+
+    def _run_batch(
+        self,
+        fn: Callable[..., Any],
+        users: Iterable[str],
+        args_for: Callable[[str], Tuple[Any, ...]],
+        max_workers: Optional[int],
+    ) -> Iterator[Tuple[str, Any, Optional[str]]]:
+        """
+        Jalankan fn(*args_for(user)) per user. Argumen (path shard) di-resolve per user
+        di dalam blok try yang sama → user id tidak valid = error shard itu saja.
+        """
+        if max_workers == 1:                            # tanpa pool (debug / mesin 1 core)
+            for user in users:
+                try:
+                    yield user, fn(*args_for(user)), None
+                except Exception as e:
+                    yield user, None, _error_text(e)
+            return
+
+        workers = max_workers or os.cpu_count() or 1
+        window = workers * 2                            # job in-flight dibatasi → memori terbatas
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: OrderedDict[Future, str] = OrderedDict()
+            for user in users:
+                try:
+                    args = args_for(user)
+                except Exception as e:
+                    yield user, None, _error_text(e)
+                    continue
+                pending[pool.submit(fn, *args)] = user
+                if len(pending) >= window:
+                    yield self._collect(pending)
+            while pending:
+                yield self._collect(pending)
+
+    @staticmethod
+    def _collect(pending: OrderedDict[Future, str]) -> Tuple[str, Any, Optional[str]]:
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        future = next(iter(done))
+        user = pending.pop(future)
+        try:
+            return user, future.result(), None
+        except Exception as e:
+            return user, None, _error_text(e)
+
+
+def _error_text(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
@@ -0,0 +1,357 @@
+"""
+Format file snapshot biner (little-endian), read-only untuk proses analitik:
+
+    header     : magic "HABITSNP", versi, jumlah habit, offset tiap bagian
+    directory  : satu entry ukuran tetap per habit
+                 (id, nama, flag, created, freeze max, lokasi bitmap, longest streak)
+    strings    : id & nama habit (UTF-8), ditunjuk oleh directory
+    bitmaps    : bitmap done & frozen per habit (format DayBitmap: bit i = hari base + i)
+
+Reader membuka file lewat mmap; query dijawab langsung dari buffer
+(memoryview + int.from_bytes), tanpa objek date per hari.
+Beberapa proses yang membuka file yang sama berbagi page cache OS.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import mmap
+import os
+import struct
+
+from daybits import DayBitmap
+from habit import Habit, DailyHabit
+from storage import BaseStorage
+
+
+MAGIC = b"HABITSNP"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIQQQ")
+# id_off, name_off, id_len, name_len, flags, freeze_max, created,
+# done_base, done_off, done_len, done_count, frozen_base, frozen_off, frozen_len, frozen_count, longest
+_ENTRY = struct.Struct("<IIHHBBxxI IIII IIII I")
+
+_FLAG_ACTIVE = 1
+_FLAG_DAILY = 2
+
+# jendela hari yang dibaca sekaligus saat menghitung current streak mundur
+_STREAK_WINDOW = 512
+
+
+def write_snapshot(filepath: str, habits: Iterable[Habit]) -> int:
+    """
+    Tulis snapshot biner dari objek Habit (atomik: file sementara + rename).
+    Reader yang masih memegang mmap file lama tetap aman (inode lama tidak ditimpa).
+    Return jumlah habit yang ditulis.
+    """
+    strings = bytearray()
+    bitmaps = bytearray()
+    entries: List[bytes] = []
+
+    for h in habits:
+        hid = h.get_id().encode("utf-8")
+        name = h.get_name().encode("utf-8")
+        id_off = len(strings)
+        strings += hid
+        name_off = len(strings)
+        strings += name
+
+        flags = (_FLAG_ACTIVE if h.is_active() else 0) | (_FLAG_DAILY if isinstance(h, DailyHabit) else 0)
+        planes = []
+        for bm in (h._completion_dates, h._frozen_dates):
+            raw = bm.to_bytes()
+            planes.extend((bm.base_ordinal, len(bitmaps), len(raw), len(bm)))
+            bitmaps += raw
+
+        entries.append(_ENTRY.pack(
+            id_off, name_off, len(hid), len(name), flags, h.FREEZE_MAX_PER_WEEK,
+            h._created_at.toordinal(), *planes, h.longest_streak(),
+        ))
+
+    dir_off = _HEADER.size
+    str_off = dir_off + _ENTRY.size * len(entries)
+    bm_off = str_off + len(strings)
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(entries), dir_off, str_off, bm_off)
+
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    tmp = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(b"".join(entries))
+            f.write(strings)
+            f.write(bitmaps)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filepath)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return len(entries)
+
+
+class SnapshotReader:
+    """
+    SnapshotReader = query read-only langsung dari file snapshot yang di-mmap
+
+    - Directory di-decode sekali saat open (satu tuple per habit)
+    - Bitmap TIDAK pernah di-decode: bit dibaca dari memoryview sesuai kebutuhan
+    - Hasil weekly_summary sama dengan HabitTracker.weekly_summary(ref, auto_freeze=False)
+    """
+
+    def __init__(self, filepath: str) -> None:
+        self._file = open(filepath, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:                          # file kosong
+            self._file.close()
+            raise ValueError(f"Snapshot kosong: {filepath}") from None
+        self._buf = memoryview(self._map)
+
+        # header / directory rusak → file & mmap ditutup dulu sebelum error diteruskan
+        try:
+            self._open_directory(filepath)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open_directory(self, filepath: str) -> None:
+        try:
+            magic, version, _, count, dir_off, str_off, bm_off = _HEADER.unpack_from(self._buf, 0)
+        except struct.error:
+            raise ValueError(f"Bukan file snapshot habit: {filepath}") from None
+        if magic != MAGIC:
+            raise ValueError(f"Bukan file snapshot habit: {filepath}")
+        if version != VERSION:
+            raise ValueError(f"Versi snapshot tidak didukung: {version}")
+
+        try:
+            self._entries = [
+                _ENTRY.unpack_from(self._buf, dir_off + i * _ENTRY.size) for i in range(count)
+            ]
+            self._index: Dict[str, int] = {}
+            for i, e in enumerate(self._entries):
+                self._index[self._string(str_off, e[0], e[2])] = i
+        except (struct.error, UnicodeDecodeError):
+            raise ValueError(f"Snapshot rusak / terpotong: {filepath}") from None
+        self._bm_off = bm_off
+        self._str_off = str_off
+
+    # ---------- lifecycle ----------
+    def close(self) -> None:
+        buf = getattr(self, "_buf", None)
+        if buf is not None:
+            buf.release()
+            self._buf = None
+        m = getattr(self, "_map", None)
+        if m is not None:
+            m.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> SnapshotReader:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---------- directory ----------
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def habit_ids(self, active_only: bool = False) -> List[str]:
+        return [hid for hid, i in self._index.items()
+                if not active_only or self._entries[i][4] & _FLAG_ACTIVE]
+
+    def name(self, habit_id: str) -> str:
+        e = self._entry(habit_id)
+        return self._string(self._str_off, e[1], e[3])
+
+    def is_active(self, habit_id: str) -> bool:
+        return bool(self._entry(habit_id)[4] & _FLAG_ACTIVE)
+
+    def created_at(self, habit_id: str) -> date:
+        return date.fromordinal(self._entry(habit_id)[6])
+
+    # ---------- query per habit ----------
+    def is_done_on(self, habit_id: str, d: date) -> bool:
+        e = self._entry(habit_id)
+        return self._bit(e[7], e[8], e[9], d.toordinal())
+
+    def is_frozen_on(self, habit_id: str, d: date) -> bool:
+        e = self._entry(habit_id)
+        return self._bit(e[11], e[12], e[13], d.toordinal())
+
+    def done_count(self, habit_id: str, start: Optional[date] = None, end: Optional[date] = None) -> int:
+        e = self._entry(habit_id)
+        if start is None and end is None:
+            return e[10]
+        lo = start.toordinal() if start else e[7]
+        hi = end.toordinal() if end else e[7] + e[9] * 8 - 1
+        return self._window(e[7], e[8], e[9], lo, hi).bit_count()
+
+    def frozen_count(self, habit_id: str, start: date, end: date) -> int:
+        e = self._entry(habit_id)
+        return self._window(e[11], e[12], e[13], start.toordinal(), end.toordinal()).bit_count()
+
+    def current_streak(self, habit_id: str, ref: date) -> int:
+        """Run done-atau-frozen yang berakhir di ref, dibaca mundur per jendela bit."""
+        e = self._entry(habit_id)
+        earliest = min(self._first_day(e[7], e[9]), self._first_day(e[11], e[13]))
+        hi = ref.toordinal()
+        streak = 0
+        while hi >= earliest:
+            lo = hi - _STREAK_WINDOW + 1
+            bits = self._window(e[7], e[8], e[9], lo, hi) | self._window(e[11], e[12], e[13], lo, hi)
+            full = (1 << _STREAK_WINDOW) - 1
+            if bits == full:
+                streak += _STREAK_WINDOW
+                hi = lo - 1
+                continue
+            gap = (~bits & full).bit_length() - 1       # hari bolong terakhir dalam jendela
+            return streak + (_STREAK_WINDOW - 1 - gap)
+        return streak
+
+    def longest_streak(self, habit_id: str) -> int:
+        return self._entry(habit_id)[15]
+
+    def freeze_left(self, habit_id: str, ref: date) -> int:
+        e = self._entry(habit_id)
+        ws = ref - timedelta(days=ref.weekday())
+        used = self._window(e[11], e[12], e[13], ws.toordinal(), ws.toordinal() + 6).bit_count()
+        return max(0, e[5] - used)
+
+    def weekly_progress(self, habit_id: str, week_start: date) -> Dict[str, Any]:
+        """Format sama dengan Habit / DailyHabit.calculate_weekly_progress."""
+        e = self._entry(habit_id)
+        lo = week_start.toordinal()
+        done = self._window(e[7], e[8], e[9], lo, lo + 6).bit_count()
+        progress: Dict[str, Any] = {
+            "done_days": done,
+            "target_days": 7,
+            "completion_rate": round((done / 7) * 100, 2),
+        }
+        if e[4] & _FLAG_DAILY:
+            progress["badge"] = DailyHabit.badge_for(done)
+        return progress
+
+    # ---------- summary ----------
+    def weekly_summary(self, ref: date) -> Dict[str, Any]:
+        """Weekly summary habit aktif (read-only: auto-freeze tidak diterapkan)."""
+        start = ref - timedelta(days=ref.weekday())
+        rows = []
+        for hid in self.habit_ids(active_only=True):
+            rows.append({
+                "id": hid,
+                "name": self.name(hid),
+                **self.weekly_progress(hid, start),
+                "current_streak": self.current_streak(hid, ref),
+                "longest_streak": self.longest_streak(hid),
+                "freeze_left": self.freeze_left(hid, ref),
+            })
+
+        total_done = sum(r["done_days"] for r in rows)
+        total_target = sum(r["target_days"] for r in rows)
+        overall_rate = (total_done / total_target) * 100 if total_target else 0.0
+        return {
+            "week_start": start.isoformat(),
+            "week_end": (start + timedelta(days=6)).isoformat(),
+            "overall_completion_rate": round(overall_rate, 2),
+            "habits": rows,
+            "best_longest": self._best(rows, "longest_streak"),
+            "best_current": self._best(rows, "current_streak"),
+        }
+
+    # ---------- konversi ----------
+    def bitmaps(self, habit_id: str) -> Tuple[DayBitmap, DayBitmap]:
+        """Salinan bitmap (done, frozen) sebagai DayBitmap, misalnya untuk membangun Habit."""
+        e = self._entry(habit_id)
+        start = self._bm_off
+        return (
+            DayBitmap.from_bytes(e[7], self._buf[start + e[8]:start + e[8] + e[9]]),
+            DayBitmap.from_bytes(e[11], self._buf[start + e[12]:start + e[12] + e[13]]),
+        )
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Record habit mentah (format Habit.to_dict) untuk semua habit."""
+        for hid in self._index:
+            done, frozen = self.bitmaps(hid)
+            yield {
+                "type": "DailyHabit" if self._entry(hid)[4] & _FLAG_DAILY else "Habit",
+                "id": hid,
+                "name": self.name(hid),
+                "created_at": self.created_at(hid).isoformat(),
+                "is_active": self.is_active(hid),
+                "completion_dates": [d.isoformat() for d in done],
+                "frozen_dates": [d.isoformat() for d in frozen],
+            }
+
+    # ---------- internal helper ----------
+    def _entry(self, habit_id: str) -> Tuple[int, ...]:
+        i = self._index.get(habit_id)
+        if i is None:
+            raise ValueError("Habit tidak ditemukan.")
+        return self._entries[i]
+
+    def _string(self, str_off: int, off: int, length: int) -> str:
+        return bytes(self._buf[str_off + off:str_off + off + length]).decode("utf-8")
+
+    def _bit(self, base: int, off: int, length: int, o: int) -> bool:
+        idx = o - base
+        if idx < 0 or idx >= length * 8:
+            return False
+        return bool(self._buf[self._bm_off + off + (idx >> 3)] & (1 << (idx & 7)))
+
+    def _window(self, base: int, off: int, length: int, lo: int, hi: int) -> int:
+        """Bit hari [lo, hi] sebagai int (bit 0 = hari lo); di luar bitmap = 0."""
+        if hi < lo or not length:
+            return 0
+        first = max(lo - base, 0)
+        last = min(hi - base, length * 8 - 1)
+        if last < first:
+            return 0
+        start = self._bm_off + off
+        chunk = self._buf[start + (first >> 3):start + (last >> 3) + 1]
+        bits = int.from_bytes(chunk, "little") >> (first & 7)
+        bits &= (1 << (last - first + 1)) - 1
+        return bits << (base + first - lo)
+
+    @staticmethod
+    def _first_day(base: int, length: int) -> int:
+        return base if length else 1 << 62
+
+    @staticmethod
+    def _best(rows: List[Dict[str, Any]], key: str) -> Dict[str, Any]:
+        # sama dengan tracker: habit PERTAMA dengan nilai terbesar (> 0)
+        best_name, best = "-", 0
+        for r in rows:
+            if r[key] > best:
+                best, best_name = r[key], r["name"]
+        return {"name": best_name, "days": best}
+
+
+class SnapshotStorage(BaseStorage):
+    """
+    SnapshotStorage = snapshot biner sebagai storage tracker (pengganti habits.json)
+
+    - save(): record habit → file snapshot biner (atomik)
+    - load(): snapshot → record habit mentah (format sama dengan JsonStorage)
+    Cocok untuk data yang lebih sering dibaca proses analitik daripada ditulis.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        self._filepath = filepath
+
+    def load(self) -> Dict[str, Any]:
+        if not os.path.exists(self._filepath):
+            return {"habits": []}
+        try:
+            with SnapshotReader(self._filepath) as reader:
+                return {"habits": list(reader.records())}
+        except (ValueError, OSError, struct.error):
+            return {"habits": []}
+
+    def save(self, data: Dict[str, Any]) -> None:
+        write_snapshot(self._filepath, (Habit.from_dict(h) for h in data.get("habits", [])))
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
 import json
 import os
+import threading
+import time
+
+from jsonstream import codec_for_path, decode_errors, iter_array_items, sniff_codec, text_reader, text_writer
+
+try:                                    # file lock antar proses: fcntl (POSIX) / msvcrt (Windows)
+    import fcntl
+except ImportError:                     # pragma: no cover
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 
 class BaseStorage(ABC):
@@ -24,6 +38,9 @@ class BaseStorage(ABC):
     TANPA mengubah HabitTracker / UI
     """
 
+    # True → apply_changes() selalu diterima (tidak perlu snapshot penuh)
+    incremental = False
+
     @abstractmethod
     def load(self) -> Dict[str, Any]:               # ambil data mentah dari storage
         raise NotImplementedError
@@ -32,6 +49,52 @@ class BaseStorage(ABC):
     def save(self, data: Dict[str, Any]) -> None:   # simpan snapshot data
         raise NotImplementedError
 
+    def apply_changes(self, changes: List[Dict[str, Any]]) -> bool:
+        """
+        Simpan perubahan secara inkremental (opsional).
+
+        Format change record (dibuat oleh HabitTracker):
+        - {"op": "add",    "habit": {...}}          → tambah / timpa satu habit
+        - {"op": "delete", "id": ...}
+        - {"op": "rename", "id": ..., "name": ...}
+        - {"op": "active", "id": ..., "value": bool}
+        - {"op": "done" | "undone" | "freeze" | "unfreeze", "id": ..., "day": "YYYY-MM-DD"}
+
+        Return False → storage tidak mendukung,
+        tracker akan fallback ke save() snapshot penuh.
+        """
+        return False
+
+    def pop_external_changes(self) -> List[Dict[str, Any]]:
+        """
+        Perubahan dari proses LAIN yang ikut di-merge saat save() terakhir
+        (format sama dengan apply_changes). Tracker menerapkannya ke memori
+        lewat HabitTracker.sync_external(); setelah dipanggil, daftar dikosongkan.
+        """
+        return []
+
+    def refresh_external(self) -> bool:
+        """
+        Cek perubahan dari proses LAIN tanpa menunggu save() (hot reload, opsional).
+        True → ada change record baru yang bisa diambil lewat pop_external_changes().
+        Storage yang tidak mendukung selalu return False.
+        """
+        return False
+
+    def close(self) -> None:
+        """
+        Lepas resource yang dipegang storage (koneksi DB, thread background).
+        Storage berbasis file biasa tidak memegang apa-apa → default tidak melakukan apa pun.
+        """
+
+
+class CorruptDataError(ValueError):
+    """File data ada tapi tidak bisa dibaca (JSON rusak, kompresi rusak, encoding salah)."""
+
+
+class LockTimeoutError(TimeoutError):
+    """File lock dipegang proses lain melewati batas tunggu; data tetap di memori, simpan dicoba lagi."""
+
 
 class JsonStorage(BaseStorage):
     """
@@ -45,27 +108,836 @@ class JsonStorage(BaseStorage):
         - logic streak / freeze
     - Jika file rusak / hilang:
         aplikasi tetap bisa jalan
+
+    Aman dipakai beberapa proses sekaligus (misalnya GUI + cron):
+    - save() memegang file lock (<file>.lock) selama cek + tulis;
+      menunggu lock maksimal `lock_timeout` detik (None = tanpa batas) → LockTimeoutError
+    - tulis ke file sementara lalu os.replace → crash tidak merusak file lama
+    - file diberi "version"; jika file berubah sejak load / save terakhir
+      (stat berbeda & version berbeda), isi disk di-merge 3 arah
+      (base = terakhir dilihat, ours = data baru, theirs = disk) per habit & per tanggal
+    - perubahan milik proses lain yang ikut hasil merge tersedia lewat pop_external_changes()
+    - refresh_external(): hot reload tanpa menunggu save (lihat watcher.py)
+
+    File besar:
+    - dibaca bertahap (lihat jsonstream.py), satu habit per langkah; iter_habits() bisa memfilter
+    - gzip / xz / lzma dibaca transparan (magic bytes / ekstensi);
+      ditulis terkompresi jika ekstensinya .gz / .xz / .lzma atau file yang dibaca memang terkompresi
+    - satu habit per baris di file; base merge disimpan sebagai teks JSON per habit (ringkas)
     """
 
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, lock_timeout: Optional[float] = 10.0) -> None:
         self._filepath = filepath  # protected
+        self._lock_path = filepath + ".lock"
+        self._lock_timeout = lock_timeout
+        self._mutex = threading.Lock()                          # antar thread dalam satu proses
+        self._codec = codec_for_path(filepath)                  # kompresi saat tulis
 
-    def load(self) -> Dict[str, Any]:               # Load data dari file JSON
-        if not os.path.exists(self._filepath):
-            return {"habits": []}
+        # state terakhir yang dilihat proses ini (dasar merge)
+        self._base: Optional[Dict[str, str]] = None             # id → teks JSON record habit
+        self._stamp: Optional[Tuple[int, int, int]] = None      # (inode, mtime_ns, size)
+        self._version = 0
+        self._partial = False                                   # load terfilter → save selalu merge
+        self._external: List[Dict[str, Any]] = []
+
+        # hot reload: isi disk yang sudah dibaca refresh_external() tapi belum diambil tracker
+        self._pending: Optional[Tuple[Tuple[int, int, int], int, Dict[str, str]]] = None   # (stamp, version, base)
+        self._polled: Optional[Tuple[int, int, int]] = None     # stamp terakhir yang sudah diperiksa
 
+    def load(self) -> Dict[str, Any]:               # Load data dari file JSON
+        meta: Dict[str, Any] = {}
         try:
-            with open(self._filepath, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-            if not isinstance(raw, dict):
-                return {"habits": []}
-            raw.setdefault("habits", [])
-            return raw
-        except (json.JSONDecodeError, OSError):
+            habits = list(self._stream(meta))
+        except CorruptDataError:
             return {"habits": []}
+        return {**meta, "habits": habits}
+
+    def iter_habits(self, active_only: bool = False, ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming load: record habit di-yield satu per satu selama file dibaca.
+
+        - Filter (active_only / ids) diterapkan saat membaca → habit lain tidak pernah disimpan
+        - Dengan filter, save() berikutnya selalu di-merge ke isi disk:
+          habit yang tidak dimuat tetap utuh di file
+        - File belum ada → tidak ada record; file rusak → CorruptDataError
+        - Generator harus dihabiskan (dasar merge baru dicatat di akhir)
+        """
+        wanted = set(ids) if ids is not None else None
+
+        def keep(rec: Any) -> bool:
+            if not isinstance(rec, dict):
+                return wanted is None and not active_only
+            if active_only and not rec.get("is_active", True):
+                return False
+            return wanted is None or rec.get("id") in wanted
+
+        return self._stream({}, keep, partial=active_only or wanted is not None)
 
     # simpan data ke file JSON
     def save(self, data: Dict[str, Any]) -> None:
+        with self._mutex, _file_lock(self._lock_path, self._lock_timeout):
+            habits = data.get("habits", [])
+            version = self._version
+            owned = {h["id"] for h in habits} if self._partial else None
+
+            if self._base is not None and (self._partial or _stat_stamp(self._filepath) != self._stamp):
+                theirs = self._read()
+                if theirs is not None and (self._partial or theirs.get("version") != self._version):
+                    base = {hid: json.loads(text) for hid, text in self._base.items()}
+                    habits, external = merge_habit_records(base, habits, theirs["habits"])
+                    if owned is not None:               # habit di luar filter bukan urusan tracker ini
+                        external = [c for c in external if _change_id(c) in owned]
+                    self._external.extend(external)
+                    version = max(version, theirs.get("version") or 0)
+
+            meta = {k: v for k, v in data.items() if k not in ("habits", "version")}
+            texts, stamp = self._write_atomic(meta, version + 1, habits)
+            if owned is not None:
+                texts = {hid: text for hid, text in texts.items() if hid in owned}
+            self._base = texts
+            self._stamp = stamp
+            self._version = version + 1
+            self._pending = None                        # isi disk sudah ikut di-merge di atas
+
+    def pop_external_changes(self) -> List[Dict[str, Any]]:
+        """
+        Selain mengosongkan antrean: isi disk dari refresh_external() menjadi dasar merge baru
+        (pemanggil akan menerapkan perubahannya ke memori).
+        Panggil saat tidak ada job simpan yang masih membawa data lama.
+        """
+        with self._mutex:
+            changes, self._external = self._external, []
+            if self._pending is not None:
+                self._stamp, self._version, self._base = self._pending
+                self._pending = None
+        return changes
+
+    def refresh_external(self) -> bool:
+        """
+        Hot reload: deteksi & hitung perubahan file oleh proses lain, tanpa save.
+
+        - Stat file (inode, mtime, size) sama dengan yang terakhir dilihat → selesai, tanpa baca file
+        - Berubah → file dibaca bertahap; teks JSON tiap habit dibandingkan dengan teks
+          yang terakhir dilihat → hanya habit yang berbeda yang di-decode & di-diff
+        - Load terfilter → hanya habit yang dimuat yang diperhatikan
+        - Change record masuk antrean pop_external_changes(); return True jika ada
+        - Dasar merge baru baru berlaku saat antrean diambil: save() sebelum itu
+          tetap merge dari dasar lama, jadi perubahan proses lain tidak tertimpa
+        """
+        stamp = _stat_stamp(self._filepath)
+        with self._mutex:
+            if self._base is None or stamp is None:
+                return False
+            seen, _, base = self._pending or (self._stamp, self._version, self._base)
+            if stamp in (seen, self._polled):
+                return False
+            partial = self._partial
+
+        meta: Dict[str, Any] = {}
+        info: Dict[str, Any] = {"meta": meta}
+        texts: Dict[str, str] = {}
+        changes: List[Dict[str, Any]] = []
+        try:
+            for rec, text in self._scan(info):
+                if not isinstance(rec, dict) or "id" not in rec:
+                    continue
+                hid = rec["id"]
+                old = base.get(hid)
+                if old is None and partial:
+                    continue                            # di luar filter load
+                texts[hid] = text
+                if text != old:                         # teks sama = record sama, tanpa decode
+                    changes.extend(_record_diff(hid, json.loads(old) if old is not None else None, rec))
+        except (FileNotFoundError, CorruptDataError):
+            # file hilang / rusak: biarkan, save berikutnya yang menentukan; cek lagi saat stat berubah
+            with self._mutex:
+                self._polled = stamp
+            return False
+        changes.extend({"op": "delete", "id": hid} for hid in base if hid not in texts)
+
+        with self._mutex:
+            if (self._pending or (self._stamp,))[0] != seen:
+                return False                            # save / refresh lain jalan selama file dibaca
+            self._polled = info["stamp"]
+            if not changes and not self._external and self._pending is None:
+                # isi sama dengan memori (misalnya hanya disentuh) → langsung jadi dasar merge
+                self._stamp, self._version, self._base = info["stamp"], meta.get("version") or 0, texts
+                return False
+            self._pending = (info["stamp"], meta.get("version") or 0, texts)
+            self._external.extend(changes)
+        return bool(changes)
+
+    # ---------- internal helper ----------
+    def _stream(
+        self,
+        meta: Dict[str, Any],
+        keep: Optional[Callable[[Any], bool]] = None,
+        partial: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        base: Dict[str, str] = {}
+        info: Dict[str, Any] = {"meta": meta}
+        try:
+            for rec, text in self._scan(info):
+                if keep is not None and not keep(rec):
+                    continue
+                if isinstance(rec, dict) and "id" in rec:
+                    base[rec["id"]] = text
+                yield rec
+        except FileNotFoundError:
+            # file belum ada → base kosong (file yang muncul kemudian tetap di-merge)
+            info = {"meta": meta}
+        except CorruptDataError:
+            # file rusak → tanpa base, save berikutnya menimpa
+            with self._mutex:
+                self._external.clear()
+                self._pending = self._polled = None
+                self._base, self._stamp, self._version, self._partial = None, None, 0, partial
+            raise
+
+        with self._mutex:
+            self._external.clear()
+            self._pending = self._polled = None
+            self._base = base
+            self._stamp = info.get("stamp")
+            self._version = meta.get("version") or 0
+            self._partial = partial
+            if "codec" in info and info["codec"] is not None:
+                self._codec = info["codec"]             # file terkompresi tetap ditulis terkompresi
+
+    def _scan(self, info: Dict[str, Any]) -> Iterator[Tuple[Any, str]]:
+        """(record, teks JSON record) dari file; stat & kompresi dicatat di `info`."""
+        try:
+            raw = open(self._filepath, "rb")
+        except FileNotFoundError:
+            raise
+        except OSError as e:
+            raise CorruptDataError(f"File data tidak bisa dibaca: {e}") from e
+
+        with raw:
+            info["stamp"] = _stamp_of(os.fstat(raw.fileno()))     # stat file yang SAMA dengan yang dibaca
+            codec = sniff_codec(raw) or codec_for_path(self._filepath)
+            info["codec"] = codec
+            try:
+                with text_reader(raw, codec) as f:
+                    yield from iter_array_items(f, "habits", info["meta"])
+            except decode_errors(codec) as e:                     # JSON / UTF-8 / kompresi rusak
+                raise CorruptDataError(f"File data rusak: {e}") from e
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        meta: Dict[str, Any] = {}
+        try:
+            habits = [rec for rec, _ in self._scan({"meta": meta})]
+        except (FileNotFoundError, CorruptDataError):
+            return None
+        return {**meta, "habits": habits}
+
+    def _write_atomic(
+        self, meta: Dict[str, Any], version: int, habits: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, str], Tuple[int, int, int]]:
+        """
+        Tulis file (satu habit per baris).
+        Return (id → teks JSON tiap habit, stat file yang ditulis) = dasar merge berikutnya.
+        """
         os.makedirs(os.path.dirname(self._filepath) or ".", exist_ok=True)
-        with open(self._filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        tmp = f"{self._filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        texts: Dict[str, str] = {}
+        try:
+            with open(tmp, "wb") as raw:
+                with text_writer(raw, self._codec) as f:
+                    f.write("{\n")
+                    for k, v in meta.items():
+                        f.write(f"  {json.dumps(k)}: {json.dumps(v, ensure_ascii=False)},\n")
+                    f.write(f'  "version": {version},\n  "habits": [')
+                    for n, h in enumerate(habits):
+                        text = json.dumps(h, ensure_ascii=False)
+                        f.write(",\n    " if n else "\n    ")
+                        f.write(text)
+                        if isinstance(h, dict) and "id" in h:
+                            texts[h["id"]] = text
+                    f.write("\n  ]\n}\n" if habits else "]\n}\n")
+                raw.flush()
+                os.fsync(raw.fileno())
+                # stat dari file sendiri (rename tidak mengubah inode / mtime):
+                # tulis proses lain tepat setelah os.replace tetap terdeteksi
+                stamp = _stamp_of(os.fstat(raw.fileno()))
+            os.replace(tmp, self._filepath)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return texts, stamp
+
+
+def _stamp_of(st: os.stat_result) -> Tuple[int, int, int]:
+    # os.replace selalu membuat inode baru → tulis dari proses lain pasti terlihat
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _stat_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        return _stamp_of(os.stat(path))
+    except OSError:
+        return None
+
+
+def _change_id(change: Dict[str, Any]) -> Optional[str]:
+    if change.get("op") == "add":
+        return change["habit"].get("id")
+    return change.get("id")
+
+
+@contextmanager
+def _file_lock(lock_path: str, timeout: Optional[float] = None) -> Iterator[None]:
+    """
+    Lock eksklusif antar proses. Tanpa fcntl / msvcrt → hanya lock antar thread.
+    timeout=None → tunggu sampai dapat; selain itu coba non-blocking berulang
+    sampai batas waktu, lalu LockTimeoutError (proses lain macet tidak membekukan save).
+    """
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            if timeout is None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                _retry_lock(lock_path, timeout, lambda: fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB))
+        elif msvcrt is not None:                    # pragma: no cover
+            f.seek(0)
+            if timeout is None:
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:                 # LK_LOCK menyerah setelah ~10 detik → coba lagi
+                        continue
+            else:
+                _retry_lock(lock_path, timeout, lambda: msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1))
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:                # pragma: no cover
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _retry_lock(lock_path: str, timeout: float, try_lock: Callable[[], None]) -> None:
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while True:
+        try:
+            try_lock()
+            return
+        except OSError:                             # dipegang proses lain (EWOULDBLOCK / EACCES)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LockTimeoutError(f"File data sedang dikunci proses lain: {lock_path}") from None
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.1)
+
+
+_DATE_FIELDS = ("completion_dates", "frozen_dates")
+
+
+def merge_habit_records(
+    base: Dict[str, Dict[str, Any]],
+    ours: List[Dict[str, Any]],
+    theirs: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Merge 3 arah daftar habit mentah.
+
+    Aturan per habit:
+    - hanya satu sisi yang berubah dari base → ambil sisi itu (termasuk hapus)
+    - dua-duanya berubah:
+        - satu menghapus, satu mengubah → perubahan menang (check-in tidak hilang)
+        - field biasa (name, is_active, ...) → sisi yang mengubah; bentrok → ours
+        - tanggal: per tanggal, sisi yang mengubah status tanggal itu yang menang
+
+    Return (habits hasil merge, change record ours → hasil merge).
+    Urutan: urutan ours, habit baru dari theirs di akhir.
+    """
+    ours_by_id = {h["id"]: h for h in ours}
+    theirs_by_id = {h["id"]: h for h in theirs if isinstance(h, dict) and "id" in h}
+    order = list(ours_by_id) + [hid for hid in theirs_by_id if hid not in ours_by_id]
+
+    merged: List[Dict[str, Any]] = []
+    external: List[Dict[str, Any]] = []
+    for hid in order:
+        o, t = ours_by_id.get(hid), theirs_by_id.get(hid)
+        m = _merge_record(base.get(hid), o, t)
+        if m is not None:
+            merged.append(m)
+        external.extend(_record_diff(hid, o, m))
+    return merged, external
+
+
+def _merge_record(
+    b: Optional[Dict[str, Any]],
+    o: Optional[Dict[str, Any]],
+    t: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    if o == b:
+        return t
+    if t == b or t == o:
+        return o
+    if o is None or t is None:
+        return o if t is None else t
+
+    b = b or {}
+    m = dict(o)
+    for key in set(o) | set(t):
+        if key not in _DATE_FIELDS and o.get(key) == b.get(key):
+            m[key] = t.get(key)
+
+    for key in _DATE_FIELDS:
+        bs, os_, ts = set(b.get(key) or ()), set(o.get(key) or ()), set(t.get(key) or ())
+        m[key] = sorted((os_ - bs) | (ts - bs) | (bs & os_ & ts))
+    return m
+
+
+def _record_diff(
+    hid: str,
+    o: Optional[Dict[str, Any]],
+    m: Optional[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Change record yang mengubah o menjadi m."""
+    if o == m:
+        return []
+    if m is None:
+        return [{"op": "delete", "id": hid}]
+    if o is None:
+        return [{"op": "add", "habit": m}]
+
+    changes: List[Dict[str, Any]] = []
+    if m.get("name") != o.get("name"):
+        changes.append({"op": "rename", "id": hid, "name": m.get("name")})
+    if bool(m.get("is_active", True)) != bool(o.get("is_active", True)):
+        changes.append({"op": "active", "id": hid, "value": bool(m.get("is_active", True))})
+    for key, add_op, remove_op in (("completion_dates", "done", "undone"), ("frozen_dates", "freeze", "unfreeze")):
+        before, after = set(o.get(key) or ()), set(m.get(key) or ())
+        changes.extend({"op": add_op, "id": hid, "day": d} for d in sorted(after - before))
+        changes.extend({"op": remove_op, "id": hid, "day": d} for d in sorted(before - after))
+    return changes
+
+
+def _replay_change(records: Dict[str, Dict[str, Any]], change: Dict[str, Any]) -> None:
+    """
+    Terapkan satu change record ke dict habit mentah (id → record).
+    Tanggal disimpan sebagai set selama replay, diurutkan lagi di akhir.
+    """
+    op = change.get("op")
+
+    if op == "add":
+        rec = dict(change["habit"])
+        rec["completion_dates"] = set(rec.get("completion_dates", []))
+        rec["frozen_dates"] = set(rec.get("frozen_dates", []))
+        records[rec["id"]] = rec
+        return
+
+    if op == "delete":
+        records.pop(change["id"], None)
+        return
+
+    rec = records.get(change.get("id"))
+    if rec is None:                     # habit sudah dihapus → abaikan
+        return
+
+    if op == "rename":
+        rec["name"] = change["name"]
+    elif op == "active":
+        rec["is_active"] = bool(change["value"])
+    elif op == "done":
+        rec["completion_dates"].add(change["day"])
+    elif op == "undone":
+        rec["completion_dates"].discard(change["day"])
+    elif op == "freeze":
+        rec["frozen_dates"].add(change["day"])
+    elif op == "unfreeze":
+        rec["frozen_dates"].discard(change["day"])
+
+
+class MemoryStorage(BaseStorage):
+    """
+    MemoryStorage = storage di memori saja (tidak ada file)
+    Dipakai untuk snapshot read-only tracker & job yang tidak perlu persist.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        self._data = data or {"habits": []}
+
+    def load(self) -> Dict[str, Any]:
+        return self._data
+
+    def save(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+
+class JournalStorage(BaseStorage):
+    """
+    JournalStorage = Snapshot + append-only log
+
+    - Snapshot  : file JSON biasa (format sama dengan JsonStorage)
+    - Journal   : <snapshot>.journal, satu change record per baris (JSONL)
+    - Checklist satu hari = append satu baris, bukan rewrite seluruh file
+
+    Load = snapshot terakhir + replay journal.
+    Jika journal melewati `compact_threshold` byte, journal di-rotate
+    menjadi <snapshot>.journal.old lalu dilebur ke snapshot baru
+    di background thread (append berikutnya tetap jalan ke journal baru).
+
+    Durability:
+    - apply_changes() baru return setelah baris journal di-fsync
+    - snapshot ditulis ke file sementara + fsync lalu os.replace
+    - compaction membaca snapshot secara ketat: snapshot rusak → CorruptDataError,
+      compaction dibatalkan (snapshot & journal.old tidak disentuh).
+      compact() melempar error itu; compaction otomatis mencatatnya di `compaction_error`
+      dan mencoba lagi pada trigger berikutnya
+    """
+
+    incremental = True
+
+    def __init__(
+        self,
+        filepath: str,
+        compact_threshold: int = 1024 * 1024,
+        background: bool = True,
+    ) -> None:
+        self._filepath = filepath
+        self._journal_path = filepath + ".journal"
+        self._old_journal_path = filepath + ".journal.old"
+        self._compact_threshold = compact_threshold
+        self._background = background
+
+        self._lock = threading.Lock()       # jaga swap file vs load / append
+        # cek "compactor masih jalan?" + start thread harus atomik → maksimal satu compaction;
+        # save() / compact() juga memegangnya supaya tidak ada compaction baru di tengah jalan
+        self._compaction_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self.compaction_error: Optional[CorruptDataError] = None   # error compaction otomatis terakhir
+
+    # ---------- BaseStorage ----------
+    def load(self) -> Dict[str, Any]:
+        with self._lock:
+            records = self._read_snapshot()
+            self._replay_file(records, self._old_journal_path)
+            self._replay_file(records, self._journal_path)
+        return {"habits": self._finalize(records)}
+
+    def save(self, data: Dict[str, Any]) -> None:
+        """Snapshot penuh: tulis ulang snapshot, journal dikosongkan."""
+        with self._compaction_lock:
+            self.wait_for_compaction()
+            with self._lock:
+                self._write_snapshot(data)
+                for path in (self._journal_path, self._old_journal_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def apply_changes(self, changes: List[Dict[str, Any]]) -> bool:
+        lines = "".join(
+            json.dumps(c, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for c in changes
+        )
+        with self._lock:
+            os.makedirs(os.path.dirname(self._filepath) or ".", exist_ok=True)
+            with open(self._journal_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())        # "tersimpan" = sudah di disk, bukan di page cache
+            size = os.path.getsize(self._journal_path)
+
+        if size >= self._compact_threshold:
+            self._start_compaction()
+        return True
+
+    # ---------- Compaction ----------
+    def compact(self) -> None:
+        """Compaction sinkron (misalnya dari CLI / saat shutdown)."""
+        with self._compaction_lock:
+            self.wait_for_compaction()
+            with self._lock:
+                self._rotate_journal()
+            self._compact_old_journal()
+
+    def close(self) -> None:
+        """Tunggu compaction yang masih jalan (thread daemon mati bersama prosesnya)."""
+        self.wait_for_compaction()
+
+    def wait_for_compaction(self) -> None:
+        t = self._compactor
+        if t is not None:
+            t.join()
+
+    def _start_compaction(self) -> None:
+        with self._compaction_lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+
+            with self._lock:
+                # journal.old sisa crash sebelumnya dilebur dulu,
+                # journal aktif di-rotate pada trigger berikutnya
+                if not os.path.exists(self._old_journal_path):
+                    self._rotate_journal()
+
+            if not self._background:
+                self._auto_compact()
+                return
+
+            self._compactor = threading.Thread(
+                target=self._auto_compact,
+                name="journal-compactor",
+                daemon=True,
+            )
+            self._compactor.start()             # masih di bawah lock: thread lain melihat is_alive()
+
+    def _rotate_journal(self) -> None:      # caller memegang _lock
+        if os.path.exists(self._journal_path) and not os.path.exists(self._old_journal_path):
+            os.replace(self._journal_path, self._old_journal_path)
+
+    def _auto_compact(self) -> None:
+        """Compaction dari trigger apply_changes: append-nya sudah tersimpan, jadi error tidak dilempar ke sana."""
+        try:
+            self._compact_old_journal()
+        except CorruptDataError as e:
+            self.compaction_error = e
+        else:
+            self.compaction_error = None
+
+    def _compact_old_journal(self) -> None:
+        if not os.path.exists(self._old_journal_path):
+            return
+
+        # bagian berat (parse + serialize) di luar lock;
+        # hanya snapshot & journal.old yang disentuh, append tetap jalan.
+        # snapshot rusak → CorruptDataError di sini, sebelum apa pun ditulis
+        records = self._read_snapshot(strict=True)
+        self._replay_file(records, self._old_journal_path)
+        data = {"habits": self._finalize(records)}
+
+        with self._lock:
+            self._write_snapshot(data)
+            os.remove(self._old_journal_path)
+
+    # ---------- internal helper ----------
+    def _read_snapshot(self, strict: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        strict=False (load) → snapshot rusak dibaca sebagai kosong, aplikasi tetap jalan.
+        strict=True (compaction) → CorruptDataError; snapshot baru dari journal saja
+        akan membuang semua habit di snapshot lama.
+        """
+        source = JsonStorage(self._filepath)
+        habits = source.iter_habits() if strict else source.load().get("habits", [])
+        records: Dict[str, Dict[str, Any]] = {}
+        for h in habits:
+            _replay_change(records, {"op": "add", "habit": h})
+        return records
+
+    def _replay_file(self, records: Dict[str, Dict[str, Any]], path: str) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    change = json.loads(line)
+                except json.JSONDecodeError:
+                    continue                # baris terpotong (crash saat append)
+                _replay_change(records, change)
+
+    def _write_snapshot(self, data: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self._filepath) or ".", exist_ok=True)
+        tmp = self._filepath + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())            # isi snapshot di disk sebelum journal.old dihapus
+        os.replace(tmp, self._filepath)
+
+    @staticmethod
+    def _finalize(records: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        habits = []
+        for rec in records.values():
+            rec["completion_dates"] = sorted(rec["completion_dates"])
+            rec["frozen_dates"] = sorted(rec["frozen_dates"])
+            habits.append(rec)
+        return habits
+
+
+class SqliteStorage(BaseStorage):
+    """
+    SqliteStorage = Database persistence (stdlib sqlite3, WAL mode)
+
+    Skema ter-normalisasi:
+    - habits      : satu baris per habit (urutan dijaga lewat kolom position)
+    - completions : satu baris per (habit_id, day) yang dicentang
+    - freezes     : satu baris per (habit_id, day) yang di-freeze
+
+    Tracker mengirim change record → satu INSERT / DELETE per perubahan,
+    bukan rewrite seluruh data; satu flush = satu transaksi (semua atau tidak sama sekali).
+    """
+
+    incremental = True
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS habits (
+            id          TEXT PRIMARY KEY,
+            type        TEXT NOT NULL DEFAULT 'Habit',
+            name        TEXT NOT NULL,
+            created_at  TEXT NOT NULL,
+            is_active   INTEGER NOT NULL DEFAULT 1,
+            position    INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS completions (
+            habit_id    TEXT NOT NULL REFERENCES habits(id) ON DELETE CASCADE,
+            day         TEXT NOT NULL,
+            PRIMARY KEY (habit_id, day)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS freezes (
+            habit_id    TEXT NOT NULL REFERENCES habits(id) ON DELETE CASCADE,
+            day         TEXT NOT NULL,
+            PRIMARY KEY (habit_id, day)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, filepath: str) -> None:
+        self._filepath = filepath
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+
+        import sqlite3                  # di-import saat dipakai (startup CLI tetap ringan)
+
+        # satu koneksi dipakai bersama, akses diserialisasi lewat lock
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def compact(self) -> None:
+        """VACUUM lalu lebur WAL ke file utama (misalnya dari CLI)."""
+        with self._lock:
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    # ---------- BaseStorage ----------
+    def load(self) -> Dict[str, Any]:
+        with self._lock:
+            habits = self._conn.execute(
+                "SELECT id, type, name, created_at, is_active FROM habits ORDER BY position"
+            ).fetchall()
+            completions = self._days_by_habit("completions")
+            freezes = self._days_by_habit("freezes")
+
+        return {
+            "habits": [
+                {
+                    "type": htype,
+                    "id": hid,
+                    "name": name,
+                    "created_at": created_at,
+                    "is_active": bool(is_active),
+                    "completion_dates": completions.get(hid, []),
+                    "frozen_dates": freezes.get(hid, []),
+                }
+                for hid, htype, name, created_at, is_active in habits
+            ]
+        }
+
+    def save(self, data: Dict[str, Any]) -> None:
+        """Snapshot penuh: isi tabel diganti dalam satu transaksi."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM habits")    # cascade ke completions & freezes
+            for h in data.get("habits", []):
+                self._put_habit(h)
+
+    def apply_changes(self, changes: List[Dict[str, Any]]) -> bool:
+        with self._lock, self._conn:                    # satu transaksi per flush
+            for c in changes:
+                self._apply(c)
+        return True
+
+    # ---------- internal helper ----------
+    def _days_by_habit(self, table: str) -> Dict[str, List[str]]:     # caller memegang _lock
+        result: Dict[str, List[str]] = {}
+        for hid, day in self._conn.execute(f"SELECT habit_id, day FROM {table} ORDER BY habit_id, day"):
+            result.setdefault(hid, []).append(day)
+        return result
+
+    def _put_habit(self, h: Dict[str, Any]) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO habits (id, type, name, created_at, is_active, position)
+            VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(position), 0) + 1 FROM habits))
+            ON CONFLICT(id) DO UPDATE SET
+                type = excluded.type,
+                name = excluded.name,
+                created_at = excluded.created_at,
+                is_active = excluded.is_active
+            """,
+            (h["id"], h.get("type", "Habit"), h["name"], h["created_at"], int(bool(h.get("is_active", True)))),
+        )
+        self._conn.execute("DELETE FROM completions WHERE habit_id = ?", (h["id"],))
+        self._conn.execute("DELETE FROM freezes WHERE habit_id = ?", (h["id"],))
+        self._insert_days("completions", h["id"], h.get("completion_dates", []))
+        self._insert_days("freezes", h["id"], h.get("frozen_dates", []))
+
+    def _insert_days(self, table: str, habit_id: str, days: Iterable[str]) -> None:
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO {table} (habit_id, day) VALUES (?, ?)",
+            ((habit_id, d) for d in days),
+        )
+
+    def _apply(self, c: Dict[str, Any]) -> None:
+        op = c.get("op")
+        if op == "add":
+            self._put_habit(c["habit"])
+        elif op == "delete":
+            self._conn.execute("DELETE FROM habits WHERE id = ?", (c["id"],))
+        elif op == "rename":
+            self._conn.execute("UPDATE habits SET name = ? WHERE id = ?", (c["name"], c["id"]))
+        elif op == "active":
+            self._conn.execute("UPDATE habits SET is_active = ? WHERE id = ?", (int(bool(c["value"])), c["id"]))
+        elif op == "done":
+            self._insert_days("completions", c["id"], [c["day"]])
+        elif op == "undone":
+            self._conn.execute("DELETE FROM completions WHERE habit_id = ? AND day = ?", (c["id"], c["day"]))
+        elif op == "freeze":
+            self._insert_days("freezes", c["id"], [c["day"]])
+        elif op == "unfreeze":
+            self._conn.execute("DELETE FROM freezes WHERE habit_id = ? AND day = ?", (c["id"], c["day"]))
+
+
+def open_storage(filepath: str, kind: Optional[str] = None) -> BaseStorage:
+    """
+    Factory storage berdasarkan jenis / ekstensi file.
+    kind: "json" | "journal" | "sqlite" | "snapshot" (default: ditebak dari ekstensi)
+    JSON boleh terkompresi: habits.json.gz / .xz / .lzma
+    """
+    if kind is None:
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext in (".db", ".sqlite", ".sqlite3"):
+            kind = "sqlite"
+        elif ext == ".snap":
+            kind = "snapshot"
+        else:
+            kind = "json"
+
+    if kind == "json":
+        return JsonStorage(filepath)
+    if kind == "journal":
+        return JournalStorage(filepath)
+    if kind == "sqlite":
+        return SqliteStorage(filepath)
+    if kind == "snapshot":
+        from snapshot import SnapshotStorage    # snapshot.py meng-import modul ini
+        return SnapshotStorage(filepath)
+    raise ValueError(f"Jenis storage tidak dikenal: {kind}")
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from operator import sub
+from typing import Optional
+
+from daybits import DayBitmap, iter_runs
+
+
+class StreakIndex:
+    """
+    StreakIndex = daftar run (interval) hari yang "menyambung streak"
+
+    - Menyimpan run terurut & tidak overlap: [start, end] dalam ordinal hari,
+      di dua array('i') (4 byte per angka, bukan objek int per elemen)
+    - Hari masuk index jika done ATAU frozen (aturan streak di Habit)
+    - add / remove satu hari → cari run lewat bisect (O(log n)),
+      lalu gabung / pecah run di sekitarnya
+    - Gabung / pecah run = insert / del di tengah array → geser elemen, O(jumlah run).
+      Geserannya memmove di buffer C (ratusan run ≈ beberapa ratus byte),
+      dan kasus umum (centang hari terbaru) menyentuh ujung array → praktis murah
+    - Longest streak dijaga terus saat run tumbuh; hanya jika run terpanjang
+      menyusut / pecah, nilainya dihitung ulang (sekali scan array) saat longest() dipanggil
+    """
+
+    __slots__ = ("_starts", "_ends", "_best")
+
+    def __init__(self) -> None:
+        self._starts = array("i")
+        self._ends = array("i")
+        self._best: Optional[int] = 0          # None → perlu dihitung ulang dari array
+
+    @classmethod
+    def from_bitmaps(cls, done: DayBitmap, frozen: DayBitmap) -> StreakIndex:
+        """Bangun index sekali jalan dari gabungan bitmap done & frozen."""
+        idx = cls()
+        base, bits = done.union_int(frozen)
+        runs = list(iter_runs(bits))
+        idx._starts = array("i", [base + pos for pos, _ in runs])     # pas ukuran, tanpa over-alokasi append
+        idx._ends = array("i", [base + pos + length - 1 for pos, length in runs])
+        idx._best = max((length for _, length in runs), default=0)
+        return idx
+
+    def copy(self) -> StreakIndex:
+        idx = StreakIndex.__new__(StreakIndex)
+        idx._starts = array("i", self._starts)
+        idx._ends = array("i", self._ends)
+        idx._best = self._best
+        return idx
+
+    # ---------- query ----------
+    def run_ending_at(self, o: int) -> int:
+        """Panjang streak yang berakhir di hari ordinal o (0 jika o bolong)."""
+        i = bisect_right(self._starts, o) - 1
+        if i >= 0 and self._ends[i] >= o:
+            return o - self._starts[i] + 1
+        return 0
+
+    def longest(self) -> int:
+        if self._best is None:
+            self._best = max(map(sub, self._ends, self._starts), default=-1) + 1
+        return self._best
+
+    def __len__(self) -> int:          # jumlah run
+        return len(self._starts)
+
+    # ---------- update ----------
+    def add(self, o: int) -> None:
+        starts, ends = self._starts, self._ends
+        i = bisect_right(starts, o) - 1
+        if i >= 0 and ends[i] >= o:
+            return                                      # sudah tercakup
+
+        join_left = i >= 0 and ends[i] == o - 1
+        join_right = i + 1 < len(starts) and starts[i + 1] == o + 1
+
+        # run hanya tumbuh → cukup _grow, maksimum tidak mungkin turun
+        if join_left and join_right:                    # o menyambung dua run
+            ends[i] = ends[i + 1]
+            del starts[i + 1], ends[i + 1]
+            self._grow(ends[i] - starts[i] + 1)
+        elif join_left:
+            ends[i] = o
+            self._grow(ends[i] - starts[i] + 1)
+        elif join_right:
+            starts[i + 1] = o
+            self._grow(ends[i + 1] - starts[i + 1] + 1)
+        else:
+            starts.insert(i + 1, o)
+            ends.insert(i + 1, o)
+            self._grow(1)
+
+    def remove(self, o: int) -> None:
+        starts, ends = self._starts, self._ends
+        i = bisect_right(starts, o) - 1
+        if i < 0 or ends[i] < o:
+            return                                      # memang tidak ada
+
+        start, end = starts[i], ends[i]
+        self._shrink(end - start + 1)
+        del starts[i], ends[i]
+
+        # pecah run menjadi (start, o-1) dan (o+1, end)
+        if o + 1 <= end:
+            starts.insert(i, o + 1)
+            ends.insert(i, end)
+            self._grow(end - o)
+        if start <= o - 1:
+            starts.insert(i, start)
+            ends.insert(i, o - 1)
+            self._grow(o - start)
+
+    # ---------- internal ----------
+    def _grow(self, length: int) -> None:
+        """Ada run (baru / lebih panjang) sepanjang length."""
+        if self._best is not None and length > self._best:
+            self._best = length
+
+    def _shrink(self, length: int) -> None:
+        """Run sepanjang length hilang (dihapus / dipecah)."""
+        if length == self._best:
+            self._best = None
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import date, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from itertools import islice
+from typing import List, Dict, Any, Callable, Collection, Iterable, Iterator, Optional, Set, Tuple
+import heapq
+import time
 
 from habit import Habit, DailyHabit
+from storage import CorruptDataError, MemoryStorage
+from memo import HabitRowCache
 
 
 class HabitTracker:
@@ -19,30 +25,297 @@ class HabitTracker:
     - menjadi satu-satunya pintu masuk UI ke domain
     """
 
-    def __init__(self, storage) -> None:
+    def __init__(
+        self,
+        storage,
+        flush_every: int = 1,
+        flush_interval_ms: Optional[int] = None,
+        use_numpy: bool = False,
+        auto_flush: bool = True,
+        summary_cache_refs: int = 8,
+    ) -> None:
         """
         storage:
         - instance dari BaseStorage (JsonStorage sekarang, SqlStorage nanti)
+
+        Write-behind policy (mutasi ditandai dirty, disk ditulis belakangan):
+        - flush_every       → flush setelah N mutasi pending
+        - flush_interval_ms → flush jika mutasi tertua sudah menunggu T ms
+        - flush() / keluar dari `with tracker:` → flush paksa
+        - auto_flush=False  → mutasi tidak pernah menulis sendiri;
+          pemanggil yang cek flush_due() (misalnya UI dengan worker thread)
+
+        Default flush_every=1 = perilaku lama (tulis setiap mutasi).
+
+        use_numpy=True → weekly_summary dihitung batch oleh analytics.NumpyAnalytics
+        (untuk laporan puluhan ribu habit; butuh paket numpy).
+
+        summary_cache_refs → jumlah tanggal ref (minggu) yang baris summary-nya di-cache;
+        tiap ref memuat semua habit (lihat memo.HabitRowCache), habit yang tidak berubah
+        tidak dihitung ulang berapa pun jumlah habitnya.
         """
+        if flush_every < 1:
+            raise ValueError("flush_every minimal 1.")
+        if use_numpy and not _analytics().available():
+            raise ImportError("use_numpy=True membutuhkan paket numpy.")
+
         self._storage = storage             # protected: hanya tracker & subclass
-        self.__habits: List[Habit] = []     # private: UI tidak boleh sentuh kesini
+        self.__habits: Dict[str, Habit] = {}    # private: id → Habit (urutan insert dijaga dict)
+        self.__active_ids: Set[str] = set()     # index habit aktif
+        self.__active_cache: Optional[List[Habit]] = None   # list aktif terurut, dibangun ulang saat berubah
+
+        # write-behind state
+        self._flush_every = flush_every
+        self._flush_interval_ms = flush_interval_ms
+        self._pending = 0                           # jumlah mutasi belum ditulis
+        self._changes: List[Dict[str, Any]] = []    # change record untuk storage inkremental
+        self._dirty_since: Optional[float] = None   # waktu mutasi pending pertama
+        self._batch_depth = 0                       # >0 → auto flush ditahan
+        self._force_snapshot = False                # True → flush berikutnya wajib snapshot penuh
+        self._auto_flush = auto_flush
+
+        self._use_numpy = use_numpy
+        self._row_cache = HabitRowCache(summary_cache_refs)
+        self._clones: Dict[str, Habit] = {}     # salinan read-only terakhir per habit (lihat _frozen_habits)
+        self._copy_on_write = False             # True di snapshot(): habit dipakai bersama, mutasi → clone dulu
+
+        # dipanggil (di thread pemilik tracker) setelah perubahan proses lain diterapkan;
+        # argumen: id habit yang terdampak (misalnya UI me-refresh baris tersebut)
+        self.on_external_change: Optional[Callable[[List[str]], None]] = None
 
     # -------- Load / Save --------
-    def load(self) -> None:
-        raw = self._storage.load()
-        habits_raw = raw.get("habits", [])
-        self.__habits = [Habit.from_dict(h) for h in habits_raw]
+    def load(self, lazy: bool = False, active_only: bool = False, ids: Optional[Iterable[str]] = None) -> None:
+        """
+        lazy=True → histori tanggal tiap habit baru di-decode saat dipakai
+        (lihat Habit.from_dict).
+
+        Storage yang punya iter_habits() (JsonStorage) dibaca bertahap:
+        setiap record langsung jadi Habit, list record mentah tidak pernah utuh di memori.
+        active_only / ids → hanya habit itu yang dimuat (habit lain tetap utuh saat save);
+        butuh storage dengan iter_habits().
+        """
+        stream = getattr(self._storage, "iter_habits", None)
+        if stream is not None:
+            records = stream(active_only=active_only, ids=ids)
+        elif active_only or ids is not None:
+            raise ValueError("Storage ini tidak mendukung load sebagian (active_only / ids).")
+        else:
+            records = self._storage.load().get("habits", [])
+
+        habits: Dict[str, Habit] = {}
+        try:
+            for h in records:
+                habit = Habit.from_dict(h, lazy=lazy)
+                habits[habit.get_id()] = habit
+        except CorruptDataError:
+            habits = {}                     # sama seperti storage.load(): file rusak → data kosong
+        self.__habits = habits
+        self._reindex_active()
+        self._row_cache.clear()
+        self._clones.clear()
+        self._clear_dirty()
 
     def save(self) -> None:
-        payload = {"habits": [h.to_dict() for h in self.__habits]}
-        self._storage.save(payload)
+        """Tulis snapshot penuh SEKARANG (tanpa melihat policy)."""
+        self._storage.save(self._snapshot_payload())
+        self._clear_dirty()
+        self.sync_external()
+
+    def is_dirty(self) -> bool:
+        return self._pending > 0
+
+    def changed_ids(self) -> List[str]:
+        """Id habit yang dimutasi sejak flush terakhir (dari change record, tanpa duplikat)."""
+        ids: Dict[str, None] = {}
+        for c in self._changes:
+            hid = c["habit"].get("id") if c.get("op") == "add" else c.get("id")
+            if hid is not None:
+                ids[hid] = None
+        return list(ids)
+
+    def flush(self) -> bool:
+        """
+        Tulis mutasi pending ke storage.
+        Return True jika memang ada yang ditulis.
+        """
+        job = self.detach_flush()
+        if job is None:
+            return False
+        try:
+            job()
+        except Exception:
+            self.mark_unsaved()
+            raise
+        self.sync_external()
+        return True
+
+    def detach_flush(self) -> Optional[Callable[[], None]]:
+        """
+        Ambil mutasi pending sebagai job tulis yang boleh dijalankan di thread lain.
+
+        - Data yang ditulis di-snapshot SEKARANG → konsisten walau tracker terus berubah;
+          snapshot = clone per habit (hanya habit yang berubah yang disalin ulang),
+          serialisasi to_dict() terjadi di dalam job, bukan di thread pemanggil
+        - Tracker langsung dianggap bersih; mutasi berikutnya masuk job berikutnya
+        - Jika job gagal, panggil mark_unsaved() supaya flush berikutnya menulis snapshot penuh
+        - Jika job sukses, panggil sync_external() (di thread pemilik tracker)
+        """
+        if not self.is_dirty():
+            return None
+
+        storage = self._storage
+        changes = [] if self._force_snapshot else list(self._changes)
+
+        # storage inkremental (journal, SQL) cukup menerima perubahan;
+        # storage snapshot (JSON) → snapshot penuh
+        habits = None
+        if not changes or not storage.incremental:
+            habits = self._frozen_habits()
+        self._clear_dirty()
+
+        def write() -> None:
+            if habits is None:
+                storage.apply_changes(changes)
+            else:
+                storage.save({"habits": [h.to_dict() for h in habits]})
+
+        return write
+
+    def sync_external(self) -> List[str]:
+        """
+        Ambil perubahan proses lain yang ikut di-merge storage saat menulis
+        atau terdeteksi hot reload (lihat BaseStorage.pop_external_changes / refresh_external)
+        lalu terapkan ke memori. Return id habit yang terdampak.
+        """
+        changes = self._storage.pop_external_changes()
+        if not changes:
+            return []
+        return self.apply_external_changes(changes)
+
+    def apply_external_changes(self, changes: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Terapkan change record yang SUDAH ada di storage (dari proses lain) ke memori.
+        Tidak menandai dirty: data ini tidak perlu ditulis ulang.
+        """
+        touched: Dict[str, None] = {}                   # urutan dijaga, tanpa duplikat
+        history: Dict[str, Dict[Tuple[str, date], str]] = {}
+        days_key = {"done": "done", "undone": "undone", "freeze": "frozen", "unfreeze": "unfrozen"}
+        day_kind = {"done": "done", "undone": "done", "freeze": "frozen", "unfreeze": "frozen"}
+
+        for c in changes:
+            op = c.get("op")
+            if op == "add":
+                habit = Habit.from_dict(c["habit"])
+                hid = habit.get_id()
+                self.__habits[hid] = habit
+                self._reindex_active()
+                history.pop(hid, None)
+                touched[hid] = None
+                continue
+
+            hid = c.get("id")
+            if op == "delete":
+                if self.__habits.pop(hid, None) is not None:
+                    self.__active_ids.discard(hid)
+                    self.__active_cache = None
+                    self._row_cache.discard(hid)
+                    touched[hid] = None
+                history.pop(hid, None)
+                continue
+
+            habit = self.__habits.get(hid)
+            if habit is None:
+                continue
+            touched[hid] = None
+            if op == "rename":
+                habit.set_name(c["name"])
+            elif op == "active":
+                habit.set_active(c["value"])
+                self._set_active_index(habit)
+            elif op in days_key:
+                # beberapa batch (hot reload + merge) bisa menyentuh tanggal yang sama → yang terakhir menang
+                day = date.fromisoformat(c["day"])
+                history.setdefault(hid, {})[(day_kind[op], day)] = days_key[op]
+
+        # histori per habit diterapkan sekali (bukan per tanggal)
+        for hid, ops in history.items():
+            days: Dict[str, List[date]] = {}
+            for (_, day), key in ops.items():
+                days.setdefault(key, []).append(day)
+            self.__habits[hid].merge_history(**days)
+
+        ids = list(touched)
+        if ids and self.on_external_change is not None:
+            self.on_external_change(ids)
+        return ids
+
+    def mark_unsaved(self) -> None:
+        """Tandai state memori belum tersimpan (misalnya setelah job tulis gagal)."""
+        self._force_snapshot = True
+        self._pending += 1
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+
+    def flush_due(self) -> bool:
+        """True jika policy write-behind sudah minta flush."""
+        return not self._batch_depth and self._flush_due()
+
+    def flush_if_due(self) -> bool:
+        """
+        Flush hanya jika policy sudah terpenuhi.
+        Dipanggil berkala (misalnya lewat `after()` di UI)
+        supaya flush berbasis waktu tetap jalan walau tidak ada mutasi baru.
+        """
+        if not self.flush_due():
+            return False
+        return self.flush()
+
+    def snapshot(self) -> HabitTracker:
+        """
+        Salinan tracker (habit di-clone, storage di memori) untuk dibaca di thread lain.
+        Perubahan di salinan TIDAK ikut tersimpan.
+
+        - Murah untuk dipanggil berulang: clone dipakai ulang selama versi habit sama
+        - Row cache dipakai bersama → summary di salinan tidak mulai dari nol,
+          dan baris yang dihitung di salinan ikut menghangatkan cache tracker ini
+        - Auto-freeze di salinan mengubah clone pribadi (copy-on-write);
+          changed_ids() memberi tahu habit mana yang perlu di-freeze juga di tracker asli
+        """
+        snap = HabitTracker(MemoryStorage(), auto_flush=False, use_numpy=self._use_numpy)
+        snap._row_cache = self._row_cache
+        snap._copy_on_write = True
+        snap.__habits = {h.get_id(): h for h in self._frozen_habits()}
+        snap._reindex_active()
+        return snap
+
+    @contextmanager
+    def batch(self) -> Iterator[HabitTracker]:
+        """
+        Kelompokkan banyak mutasi → maksimal satu penulisan di akhir
+        (tetap mengikuti policy, jadi bisa saja ditunda lagi).
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush_if_due()
+
+    def __enter__(self) -> HabitTracker:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
 
     # -------- Habit CRUD --------
     # mengambil list habit
     def list_habits(self, active_only: bool = False) -> List[Habit]:
-        if not active_only:
-            return list(self.__habits)
-        return [h for h in self.__habits if h.is_active()]
+        return list(self._habit_view(active_only))
+
+    def iter_habits(self, active_only: bool = False) -> Iterator[Habit]:
+        """Seperti list_habits tapi tanpa menyalin list (jangan tambah / hapus habit selama iterasi)."""
+        return iter(self._habit_view(active_only))
 
     # menambah habit baru
     def add_habit(self, name: str) -> Habit:
@@ -54,46 +327,301 @@ class HabitTracker:
         - Tracker tahu habit apa yang dibuat,
         - UI tidak perlu tahu subclass-nya'''
         habit = DailyHabit.new(name)  # type: ignore[attr-defined]
-        self.__habits.append(habit)
-        self.save()
+        self.__habits[habit.get_id()] = habit
+        self._set_active_index(habit)
+        self._mark_dirty({"op": "add", "habit": habit.to_dict()})
         return habit
 
     def edit_habit(self, habit_id: str, new_name: str) -> None:
         habit = self._require_habit(habit_id)
         habit.set_name(new_name)
-        self.save()
+        self._mark_dirty({"op": "rename", "id": habit_id, "name": habit.get_name()})
 
     def delete_habit(self, habit_id: str) -> None:
-        self.__habits = [h for h in self.__habits if h.get_id() != habit_id]
-        self.save()
+        if self.__habits.pop(habit_id, None) is not None:
+            self.__active_ids.discard(habit_id)
+            self.__active_cache = None
+            self._row_cache.discard(habit_id)
+        self._mark_dirty({"op": "delete", "id": habit_id})
 
     def set_habit_active(self, habit_id: str, active: bool) -> None:
         habit = self._require_habit(habit_id)
         habit.set_active(active)
-        self.save()
+        self._set_active_index(habit)
+        self._mark_dirty({"op": "active", "id": habit_id, "value": habit.is_active()})
 
     # -------- Checklist (Tanggal Bebas) --------
     def get_checklist_for_date(self, target_date: date) -> List[Tuple[str, str, bool]]:
         result = []
-        for h in self.list_habits(active_only=True):
+        for h in self._habit_view(active_only=True):
             result.append((h.get_id(), h.get_name(), h.is_done_on(target_date)))
         return result
 
+    def checklist_page(
+        self,
+        target_date: date,
+        offset: int = 0,
+        limit: int = 50,
+        prefix: Optional[str] = None,
+    ) -> Tuple[List[Tuple[str, str, bool]], int]:
+        """
+        Satu halaman get_checklist_for_date (urutan sama).
+        Return (baris halaman ini, total habit aktif yang cocok dengan prefix).
+        """
+        habits, total = self.habit_page(offset, limit, active_only=True, prefix=prefix)
+        return [(h.get_id(), h.get_name(), h.is_done_on(target_date)) for h in habits], total
+
     def set_done_on_date(self, habit_id: str, target_date: date, done: bool) -> None:
         habit = self._require_habit(habit_id)
         if done:
             habit.mark_done(target_date)
         else:
             habit.unmark_done(target_date)
-        self.save()
+        self._mark_dirty({
+            "op": "done" if done else "undone",
+            "id": habit_id,
+            "day": target_date.isoformat(),
+        })
+
+    # -------- Paging (ribuan habit) --------
+    # sort → key untuk Habit dan untuk baris summary (None = urutan habit dibuat)
+    SORT_KEYS = ("name", "streak", "longest", "rate")
+
+    def habit_page(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        active_only: bool = False,
+        prefix: Optional[str] = None,
+        sort: Optional[str] = None,
+        descending: bool = False,
+        ref: Optional[date] = None,
+    ) -> Tuple[List[Habit], int]:
+        """
+        Satu halaman habit untuk UI / API yang menampilkan ribuan habit.
+
+        - prefix → filter awalan nama (tidak peka huruf besar/kecil)
+        - sort   → None (urutan dibuat), "name", "streak" (current streak di ref),
+                   "longest", atau "rate" (completion minggu ref)
+        - Tanpa sort: hanya habit di halaman itu yang disentuh (tidak ada salinan list penuh);
+          dengan sort: top-(offset+limit) lewat heap, bukan sort penuh
+
+        Return (habit di halaman ini, total habit yang cocok).
+        """
+        key = self._habit_sort_key(sort, ref or date.today())
+        habits = self._habit_view(active_only)
+        if prefix:
+            habits = self._match_prefix(habits, prefix)
+        elif key is None and not descending:
+            _check_page(offset, limit)
+            return list(islice(habits, offset, offset + limit)), len(habits)
+        return self._page(habits, offset, limit, key, descending), len(habits)
+
+    def summary_page(
+        self,
+        ref: Optional[date] = None,
+        offset: int = 0,
+        limit: int = 50,
+        prefix: Optional[str] = None,
+        sort: Optional[str] = None,
+        descending: bool = False,
+        auto_freeze: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        weekly_summary versi halaman:
+        - angka agregat (overall rate, best streak) tetap dari SEMUA habit aktif yang cocok
+        - "habits" hanya berisi baris halaman ini, "total" = jumlah baris keseluruhan
+        Baris tidak berubah diambil dari row cache, jadi pindah halaman / ganti sort murah.
+        """
+        if sort is not None and sort not in self.SORT_KEYS:
+            raise ValueError(f"Sort tidak dikenal: {sort}")
+        ref = ref or date.today()
+        habits = self._habit_view(active_only=True)
+        if prefix:
+            habits = self._match_prefix(habits, prefix)
+
+        if auto_freeze:
+            habits = self._apply_auto_freeze(habits, ref)
+
+        if self._use_numpy:
+            summary = _analytics().NumpyAnalytics(habits, until=ref).weekly_summary(ref)
+        else:
+            start = self.week_start(ref)
+            summary = self.aggregate_summary([self._cached_row(h, start, ref) for h in habits], ref)
+
+        rows = summary["habits"]
+        summary["habits"] = self._page(rows, offset, limit, _ROW_SORT_KEYS.get(sort), descending)
+        summary["total"] = len(rows)
+        summary["offset"] = offset
+        return summary
+
+    # -------- Bulk (import / backfill) --------
+    def bulk_set_done(self, changes: Iterable[Tuple[str, date, bool]]) -> int:
+        """
+        Terapkan banyak (habit_id, tanggal, done) sekaligus.
+
+        Urutan:
+        1. Validasi SEMUA item dulu (habit ada, tanggal valid, habit aktif jika done)
+           → satu item salah = tidak ada yang diubah
+        2. Terapkan di memori
+        3. Aturan freeze dijalankan sekali per habit untuk tanggal yang baru dicentang
+        4. Persist sekali (satu record per habit yang tersentuh, bukan per check-in);
+           dengan auto_flush=False penulisan diserahkan ke pemanggil seperti mutasi lain
+
+        Return jumlah item yang diterapkan.
+        """
+        items: List[Tuple[Habit, date, bool]] = []
+        for n, (habit_id, target_date, done) in enumerate(changes, start=1):
+            if not isinstance(target_date, date):
+                raise ValueError(f"Item {n}: tanggal tidak valid.")
+            habit = self._require_habit(habit_id)
+            if done and not habit.is_active():
+                raise ValueError(f"Item {n}: habit non-aktif tidak bisa dicentang.")
+            items.append((habit, target_date, bool(done)))
+
+        touched: Dict[str, Habit] = {}
+        newly_done: Dict[str, List[date]] = {}
+        for habit, target_date, done in items:
+            hid = habit.get_id()
+            touched[hid] = habit
+            if done:
+                if not habit.is_done_on(target_date):
+                    newly_done.setdefault(hid, []).append(target_date)
+                habit.mark_done(target_date)
+            else:
+                habit.unmark_done(target_date)
+
+        # freeze rules: seolah auto-freeze dijalankan di setiap hari yang dicentang
+        for hid, days in newly_done.items():
+            habit = touched[hid]
+            for d in sorted(days):
+                habit.auto_freeze_yesterday_if_needed(d)
+
+        if touched:
+            self._mark_dirty(*({"op": "add", "habit": h.to_dict()} for h in touched.values()))
+            if self._auto_flush:
+                self.flush()
+        return len(items)
+
+    def bulk_set_done_range(self, habit_id: str, start: date, end: date, done: bool = True) -> int:
+        """Centang / batalkan semua tanggal [start, end] untuk satu habit."""
+        if end < start:
+            raise ValueError("Tanggal akhir tidak boleh sebelum tanggal awal.")
+        days = (end - start).days + 1
+        return self.bulk_set_done(
+            (habit_id, start + timedelta(days=i), done) for i in range(days)
+        )
+
+    def import_checkins(self, filepath: str) -> int:
+        """
+        Import check-in dari file lalu terapkan lewat bulk_set_done.
+
+        - CSV  : header habit_id,date[,done]
+        - JSONL: satu objek per baris {"habit_id": ..., "date": ..., "done": ...}
+        `done` opsional (default True); boleh true/false/1/0/yes/no.
+        """
+        import csv
+        import json
+
+        def parse(n: int, rec: Any) -> Tuple[str, date, bool]:
+            if not isinstance(rec, dict):
+                raise ValueError(f"Baris {n}: check-in harus berupa objek, bukan {type(rec).__name__}.")
+            try:
+                if rec["habit_id"] is None:             # baris CSV pendek: kolom tidak terisi
+                    raise KeyError("habit_id")
+                hid = str(rec["habit_id"]).strip()
+                day = date.fromisoformat(str(rec["date"]).strip())
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"Baris {n}: data check-in tidak valid ({e}).") from None
+
+            done = rec.get("done")
+            if done is None:                            # kolom / key tidak ada → default True
+                return hid, day, True
+            if isinstance(done, str):
+                value = done.strip().lower()
+                if value not in ("", "1", "0", "true", "false", "yes", "no"):
+                    raise ValueError(f"Baris {n}: nilai done tidak valid ({done}).")
+                return hid, day, value in ("", "1", "true", "yes")
+            if done not in (True, False) or isinstance(done, float):
+                raise ValueError(f"Baris {n}: nilai done tidak valid ({done!r}).")
+            return hid, day, bool(done)
+
+        changes: List[Tuple[str, date, bool]] = []
+        with open(filepath, "r", newline="", encoding="utf-8") as f:
+            if filepath.lower().endswith((".jsonl", ".ndjson")):
+                for n, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"Baris {n}: JSON tidak valid ({e.msg}).") from None
+                    changes.append(parse(n, rec))
+            else:
+                for n, rec in enumerate(csv.DictReader(f), start=2):
+                    changes.append(parse(n, rec))
+
+        return self.bulk_set_done(changes)
+
+    def replay_freezes(self, habit_ids: Optional[Iterable[str]] = None, reset: bool = True) -> Dict[str, int]:
+        """
+        Terapkan ulang aturan freeze di seluruh histori (lihat Habit.replay_freezes),
+        misalnya setelah bulk import atau migrasi data.
+
+        - Semua habit (atau habit_ids saja) diproses dalam satu batch
+        - Persist sekali: satu record "add" per habit yang berubah
+          (bisa ribuan freeze; tidak dikirim sebagai record per tanggal)
+
+        Return ringkasan: jumlah habit diproses / berubah, freeze ditambah / dibuang.
+        """
+        if habit_ids is None:
+            habits = self.list_habits()
+        else:
+            habits = [self._require_habit(hid) for hid in habit_ids]
+
+        stats = {"habits": len(habits), "changed": 0, "frozen": 0, "unfrozen": 0}
+        changed: List[Habit] = []
+        for h in habits:
+            added, removed = h.replay_freezes(reset=reset)
+            if added or removed:
+                changed.append(h)
+                stats["frozen"] += len(added)
+                stats["unfrozen"] += len(removed)
+        stats["changed"] = len(changed)
+
+        if changed:
+            self._mark_dirty(*({"op": "add", "habit": h.to_dict()} for h in changed))
+            if self._auto_flush:
+                self.flush()
+        return stats
 
     # -------- Analytics --------
+    def apply_auto_freeze(self, ref: Optional[date] = None, habit_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Terapkan auto-freeze untuk semua habit aktif (bagian pertama weekly_summary).
+        habit_ids → hanya habit itu, misalnya hasil snapshot().changed_ids() setelah
+        summary dihitung di thread lain (habit lain tidak perlu disentuh sama sekali).
+        """
+        if habit_ids is None:
+            habits: Iterable[Habit] = self._habit_view(active_only=True)
+        else:
+            habits = [h for h in map(self.__habits.get, habit_ids) if h is not None and h.is_active()]
+        self._apply_auto_freeze(habits, ref or date.today())
+
+    def auto_freeze_pending(self, ref: Optional[date] = None) -> bool:
+        """
+        READ-ONLY: apakah apply_auto_freeze(ref) akan mengubah sesuatu?
+        Dipakai server: summary cukup read lock, write lock hanya jika ini True.
+        """
+        ref = ref or date.today()
+        return any(h.would_auto_freeze(ref) for h in self._habit_view(active_only=True))
+
     # Hitung tanggal awal minggu (Senin)
     def week_start(self, ref: Optional[date] = None) -> date:
         ref = ref or date.today()
         return ref - timedelta(days=ref.weekday())
 
-    def weekly_summary(self, ref: Optional[date] = None) -> Dict[str, Any]:
+    def weekly_summary(self, ref: Optional[date] = None, auto_freeze: bool = True) -> Dict[str, Any]:
         """
         Weekly summary seluruh habit
         Dengan urutan eksekusi:
@@ -101,14 +629,42 @@ class HabitTracker:
         - Baru hitung progress & streak
 
         Tracker bertugas MENJAGA URUTAN INI.
+        auto_freeze=False → murni baca (pemanggil sudah memanggil apply_auto_freeze).
         """
         ref = ref or date.today()
         start = self.week_start(ref)
         habits = self.list_habits(active_only=True)
 
-        per_habit = []
+        # ---- AUTO FREEZE ---- 
+        if auto_freeze:
+            habits = self._apply_auto_freeze(habits, ref)
+
+        # ---- PROGRESS & STREAK ----
+        if self._use_numpy:
+            return _analytics().NumpyAnalytics(habits, until=ref).weekly_summary(ref)
+
+        rows = [self._cached_row(h, start, ref) for h in habits]
+        return self.aggregate_summary(rows, ref)
+
+    def habit_summary(self, habit_id: str, ref: Optional[date] = None, auto_freeze: bool = True) -> Dict[str, Any]:
+        """
+        Satu baris weekly summary untuk satu habit saja
+        (auto-freeze tetap diterapkan dulu, sama seperti weekly_summary).
+        Dipakai UI supaya satu klik tidak menghitung ulang semua habit.
+        """
+        ref = ref or date.today()
+        habit = self._require_habit(habit_id)
+        if auto_freeze:
+            habit = self._apply_auto_freeze([habit], ref)[0]
+        return self._cached_row(habit, self.week_start(ref), ref)
+
+    def aggregate_summary(self, rows: List[Dict[str, Any]], ref: Optional[date] = None) -> Dict[str, Any]:
+        """Gabungkan baris per habit (urutan = urutan tampil) menjadi weekly summary."""
+        ref = ref or date.today()
+        start = self.week_start(ref)
+
         total_done = 0
-        total_target = _toggle = 0
+        total_target = 0
 
         # mencari best streak
         best_longest = 0
@@ -116,37 +672,18 @@ class HabitTracker:
         best_longest_name = "-"
         best_current_name = "-"
 
-        for h in habits:
-            # ---- AUTO FREEZE ---- 
-            # (Side effect boleh disini karena: idempotent dan domain yang menentukan)
-            if h.auto_freeze_yesterday_if_needed(ref):
-                self.save()
-
-            # ---- PROGRESS & STREAK ----
-            progress = h.calculate_weekly_progress(start)
-            current = h.current_streak(ref)
-            longest = h.longest_streak()
-
-            per_habit.append({
-                "id": h.get_id(),
-                "name": h.get_name(),
-                **progress,
-                "current_streak": current,
-                "longest_streak": longest,
-                "freeze_left": h.freeze_remaining_for_week(ref),
-            })
-
-            total_done += progress["done_days"]
-            total_target += progress["target_days"]
+        for r in rows:
+            total_done += r["done_days"]
+            total_target += r["target_days"]
 
             # best streak calculation
-            if longest > best_longest:
-                best_longest = longest
-                best_longest_name = h.get_name()
+            if r["longest_streak"] > best_longest:
+                best_longest = r["longest_streak"]
+                best_longest_name = r["name"]
 
-            if current > best_current:
-                best_current = current
-                best_current_name = h.get_name()
+            if r["current_streak"] > best_current:
+                best_current = r["current_streak"]
+                best_current_name = r["name"]
 
         overall_rate = (total_done / total_target) * 100 if total_target else 0.0
 
@@ -154,7 +691,7 @@ class HabitTracker:
             "week_start": start.isoformat(),
             "week_end": (start + timedelta(days=6)).isoformat(),
             "overall_completion_rate": round(overall_rate, 2),
-            "habits": per_habit,
+            "habits": rows,
             "best_longest": {"name": best_longest_name, "days": best_longest},
             "best_current": {"name": best_current_name, "days": best_current},
         }
@@ -171,13 +708,17 @@ class HabitTracker:
         """
 
         summary = self.weekly_summary(ref)
-        rows = summary["habits"]
 
         with open(filepath, "w", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            w.writerow(["week_start", summary["week_start"], "week_end", summary["week_end"]])
-            w.writerow([])
-            w.writerow([
+            csv.writer(f).writerows(self.week_csv_rows(summary))
+
+    @staticmethod
+    def week_csv_rows(summary: Dict[str, Any]) -> List[List[Any]]:
+        """Baris CSV (termasuk header) dari hasil weekly_summary; dipakai export & server."""
+        rows: List[List[Any]] = [
+            ["week_start", summary["week_start"], "week_end", summary["week_end"]],
+            [],
+            [
                 "Habit",
                 "Done Days",
                 "Target Days",
@@ -186,22 +727,305 @@ class HabitTracker:
                 "Freeze Left",
                 "Current Streak",
                 "Longest Streak",
+            ],
+        ]
+        for r in summary["habits"]:
+            rows.append([
+                r["name"],
+                r["done_days"],
+                r["target_days"],
+                r["completion_rate"],
+                r.get("badge", ""),
+                r.get("freeze_left", 0),
+                r["current_streak"],
+                r["longest_streak"],
             ])
-            for r in rows:
-                w.writerow([
-                    r["name"],
-                    r["done_days"],
-                    r["target_days"],
-                    r["completion_rate"],
-                    r.get("badge", ""),
-                    r.get("freeze_left", 0),
-                    r["current_streak"],
-                    r["longest_streak"],
-                ])
+        return rows
+
+    HISTORY_COLUMNS = [
+        "period_start",
+        "period_end",
+        "habit_id",
+        "habit",
+        "done_days",
+        "frozen_days",
+        "target_days",
+        "completion_rate",
+        "current_streak",
+    ]
+
+    def iter_history_rows(
+        self,
+        start: date,
+        end: date,
+        granularity: str = "day",
+        active_only: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generator baris histori per (periode, habit), urut periode lalu habit.
+
+        - granularity: "day" | "week" (Senin-Minggu) | "month"
+        - periode dipotong ke rentang [start, end]
+        - READ-ONLY: tidak ada auto-freeze, tidak ada save
+        - baris dibuat satu per satu → memori tidak tumbuh dengan panjang rentang
+        """
+        if granularity not in ("day", "week", "month"):
+            raise ValueError("granularity harus 'day', 'week', atau 'month'.")
+        if end < start:
+            raise ValueError("Tanggal akhir tidak boleh sebelum tanggal awal.")
+
+        habits = self.list_habits(active_only=active_only)
+        p_start = start
+        while p_start <= end:
+            p_end = min(self._period_end(p_start, granularity), end)
+            target = (p_end - p_start).days + 1
+
+            for h in habits:
+                if granularity == "day":
+                    done = int(h.is_done_on(p_start))
+                    frozen = int(h.is_frozen_on(p_start))
+                else:
+                    done = h.count_done_between(p_start, p_end)
+                    frozen = h.count_frozen_between(p_start, p_end)
+
+                yield {
+                    "period_start": p_start.isoformat(),
+                    "period_end": p_end.isoformat(),
+                    "habit_id": h.get_id(),
+                    "habit": h.get_name(),
+                    "done_days": done,
+                    "frozen_days": frozen,
+                    "target_days": target,
+                    "completion_rate": round((done / target) * 100, 2),
+                    "current_streak": h.current_streak(p_end),
+                }
+
+            p_start = p_end + timedelta(days=1)
+
+    def export_history(
+        self,
+        filepath: str,
+        start: date,
+        end: date,
+        granularity: str = "day",
+        fmt: Optional[str] = None,
+        active_only: bool = False,
+    ) -> int:
+        """
+        Tulis histori [start, end] secara streaming ke CSV atau JSONL.
+        fmt: "csv" | "jsonl" (default: dari ekstensi file)
+        Return jumlah baris yang ditulis.
+        """
+        import csv
+        import json
+
+        fmt = fmt or ("jsonl" if filepath.lower().endswith((".jsonl", ".ndjson")) else "csv")
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError("Format export harus 'csv' atau 'jsonl'.")
+
+        rows = self.iter_history_rows(start, end, granularity, active_only)
+        count = 0
+        with open(filepath, "w", newline="", encoding="utf-8") as f:
+            if fmt == "csv":
+                w = csv.DictWriter(f, fieldnames=self.HISTORY_COLUMNS)
+                w.writeheader()
+                for row in rows:
+                    w.writerow(row)
+                    count += 1
+            else:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    count += 1
+        return count
+
+    def export_snapshot(self, filepath: str, active_only: bool = False) -> int:
+        """
+        Tulis snapshot biner (lihat snapshot.py) untuk proses analitik read-only.
+        READ-ONLY terhadap tracker: tidak ada auto-freeze, tidak ada save.
+        Return jumlah habit yang ditulis.
+        """
+        from snapshot import write_snapshot
+
+        return write_snapshot(filepath, self.list_habits(active_only=active_only))
 
     # -------- Internal helper --------
+    def _habit_view(self, active_only: bool) -> Collection[Habit]:
+        # TANPA salinan: pemanggil publik yang menyalin bila perlu
+        if not active_only:
+            return self.__habits.values()
+        if self.__active_cache is None:
+            self.__active_cache = [h for hid, h in self.__habits.items() if hid in self.__active_ids]
+        return self.__active_cache
+
+    @staticmethod
+    def _match_prefix(habits: Iterable[Habit], prefix: str) -> List[Habit]:
+        prefix = prefix.strip().casefold()
+        return [h for h in habits if h.get_name().casefold().startswith(prefix)]
+
+    def _habit_sort_key(self, sort: Optional[str], ref: date) -> Optional[Callable[[Habit], Any]]:
+        if sort is None:
+            return None
+        if sort == "name":
+            return lambda h: h.get_name().casefold()
+        if sort == "streak":
+            return lambda h: h.current_streak(ref)
+        if sort == "longest":
+            return lambda h: h.longest_streak()
+        if sort == "rate":
+            start = self.week_start(ref)
+            return lambda h: self._cached_row(h, start, ref)["completion_rate"]
+        raise ValueError(f"Sort tidak dikenal: {sort}")
+
+    @staticmethod
+    def _page(
+        items: Collection[Any],
+        offset: int,
+        limit: int,
+        key: Optional[Callable[[Any], Any]],
+        descending: bool,
+    ) -> List[Any]:
+        _check_page(offset, limit)
+        end = offset + limit
+        if key is None:
+            ordered = reversed(items) if descending else iter(items)
+            return list(islice(ordered, offset, end))
+        # nsmallest / nlargest = sorted(...)[:end] (stabil), tapi O(n log end)
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        return pick(end, items, key=key)[offset:]
+
+    def _apply_auto_freeze(self, habits: Iterable[Habit], ref: date) -> List[Habit]:
+        # (Side effect boleh disini karena: idempotent dan domain yang menentukan)
+        # return habit yang sama, kecuali di snapshot: habit yang di-freeze diganti salinan pribadinya
+        freezes: List[Dict[str, Any]] = []
+        yesterday = (ref - timedelta(days=1)).isoformat()
+        result: List[Habit] = []
+        for h in habits:
+            if self._copy_on_write and h.would_auto_freeze(ref):
+                h = self._own(h)
+            if h.auto_freeze_yesterday_if_needed(ref):
+                freezes.append({"op": "freeze", "id": h.get_id(), "day": yesterday})
+            result.append(h)
+
+        # semua freeze dalam satu pass → satu mutasi, bukan satu save per habit
+        if freezes:
+            self._mark_dirty(*freezes)
+        return result
+
+    def _own(self, h: Habit) -> Habit:
+        # snapshot: clone dipakai bersama snapshot lain / job simpan → ganti dengan salinan pribadi
+        own = h.clone()
+        self.__habits[own.get_id()] = own
+        self.__active_cache = None
+        return own
+
+    def _cached_row(self, h: Habit, start: date, ref: date) -> Dict[str, Any]:
+        # dihitung ulang hanya jika habit berubah sejak baris terakhir untuk ref ini
+        return self._row_cache.get_or_compute(h, ref, lambda habit: self._habit_row(habit, start, ref))
+
+    def _habit_row(self, h: Habit, start: date, ref: date) -> Dict[str, Any]:
+        progress = h.calculate_weekly_progress(start)
+        return {
+            "id": h.get_id(),
+            "name": h.get_name(),
+            **progress,
+            "current_streak": h.current_streak(ref),
+            "longest_streak": h.longest_streak(),
+            "freeze_left": h.freeze_remaining_for_week(ref),
+        }
+
+    @staticmethod
+    def _period_end(p_start: date, granularity: str) -> date:
+        if granularity == "week":
+            return p_start + timedelta(days=6 - p_start.weekday())
+        if granularity == "month":
+            nxt = date(p_start.year + (p_start.month == 12), p_start.month % 12 + 1, 1)
+            return nxt - timedelta(days=1)
+        return p_start
+
+    def _mark_dirty(self, *changes: Dict[str, Any]) -> None:
+        """
+        changes = change record (format: lihat storage.BaseStorage.apply_changes)
+        """
+        self._changes.extend(changes)
+        self._pending += 1
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        if self._auto_flush and not self._batch_depth and self._flush_due():
+            self.flush()
+
+    def _flush_due(self) -> bool:
+        if not self._pending:
+            return False
+        if self._pending >= self._flush_every:
+            return True
+        if self._flush_interval_ms is None or self._dirty_since is None:
+            return False
+        waited_ms = (time.monotonic() - self._dirty_since) * 1000
+        return waited_ms >= self._flush_interval_ms
+
+    def _snapshot_payload(self) -> Dict[str, Any]:
+        return {"habits": [h.to_dict() for h in self.__habits.values()]}
+
+    def _frozen_habits(self) -> List[Habit]:
+        """
+        Clone read-only semua habit (urutan sama) untuk thread lain.
+        Clone disimpan & dipakai ulang selama versinya sama dengan habit asli,
+        jadi biaya per panggilan ≈ jumlah habit yang berubah, bukan ukuran histori.
+        Clone tidak boleh diubah di thread pemilik tracker.
+        """
+        clones = self._clones
+        frozen: List[Habit] = []
+        for hid, h in self.__habits.items():
+            c = clones.get(hid)
+            if c is None or c.version() != h.version():
+                c = clones[hid] = h.clone()
+            frozen.append(c)
+        if len(clones) > len(frozen):               # habit yang sudah dihapus
+            for hid in [hid for hid in clones if hid not in self.__habits]:
+                del clones[hid]
+        return frozen
+
+    def _clear_dirty(self) -> None:
+        self._force_snapshot = False
+        self._pending = 0
+        self._changes.clear()
+        self._dirty_since = None
+
     def _require_habit(self, habit_id: str) -> Habit:
-        for h in self.__habits:
-            if h.get_id() == habit_id:
-                return h
-        raise ValueError("Habit tidak ditemukan.")
+        habit = self.__habits.get(habit_id)
+        if habit is None:
+            raise ValueError("Habit tidak ditemukan.")
+        return habit
+
+    def _set_active_index(self, habit: Habit) -> None:
+        hid = habit.get_id()
+        if habit.is_active() != (hid in self.__active_ids):
+            if habit.is_active():
+                self.__active_ids.add(hid)
+            else:
+                self.__active_ids.discard(hid)
+            self.__active_cache = None
+
+    def _reindex_active(self) -> None:
+        self.__active_ids = {hid for hid, h in self.__habits.items() if h.is_active()}
+        self.__active_cache = None
+
+
+# key sort untuk baris summary (lihat HabitTracker.SORT_KEYS)
+_ROW_SORT_KEYS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "name": lambda r: r["name"].casefold(),
+    "streak": lambda r: r["current_streak"],
+    "longest": lambda r: r["longest_streak"],
+    "rate": lambda r: r["completion_rate"],
+}
+
+
+def _check_page(offset: int, limit: int) -> None:
+    if offset < 0 or limit < 0:
+        raise ValueError("offset dan limit tidak boleh negatif.")
+
+
+def _analytics():
+    # di-import saat dipakai saja: NumPy butuh ~100 ms untuk di-load (berat untuk CLI)
+    import analytics
+    return analytics
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
-from typing import Dict
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
 
 from tracker import HabitTracker
+from watcher import DataWatcher
+from worker import BackgroundWorker
 
 
 class HabitTrackerUI(ttk.Frame):
@@ -17,19 +19,66 @@ class HabitTrackerUI(ttk.Frame):
       - UI hanya enampilkan hasil dari HabitTracker
     """
 
-    def __init__(self, master: tk.Tk, tracker: HabitTracker) -> None:
+    # ribuan habit: hanya jendela yang terlihat yang punya widget / baris Treeview
+    CHECK_ROWS = 15                 # slot checkbox (checklist di-scroll per jendela)
+    TREE_PAGE = 100                 # baris summary per halaman yang dimuat
+    SELECTOR_PAGE = 100             # habit per halaman di selector Edit / Hapus
+    SORTABLE_COLUMNS = {"name": "name", "rate": "rate", "cur": "streak", "long": "longest"}
+
+    def __init__(
+        self,
+        master: tk.Tk,
+        tracker: HabitTracker,
+        background: bool = False,
+        watcher: Optional[DataWatcher] = None,
+    ) -> None:
+        """
+        background=True → simpan, summary & export CSV jalan di worker thread
+        (hasil dikirim balik lewat polling `after()`), window tidak ikut freeze.
+        watcher → perubahan file oleh proses lain dicek berkala (hot reload),
+        hanya baris habit yang berubah yang dirender ulang.
+        """
         super().__init__(master, padding=12)
 
         self._tracker = tracker
-        self._vars: Dict[str, tk.BooleanVar] = {}       # checkbox state untuk checklist harian
+        self._worker = BackgroundWorker() if background else None
+        self._watcher = watcher
+        self._closed = False                            # close() sudah dipanggil: widget tidak boleh disentuh lagi
+        self._toggled_since_summary: set[str] = set()   # toggle selama summary background berjalan
+        self._recheck_total = False                     # angka agregat berikutnya: cek apakah daftar summary berubah
         self._selected_date = date.today()              # tanggal aktif yang sedang dilihat (hari ini / tanggal lain)
 
+        # checklist virtual: CHECK_ROWS widget tetap, di-bind ulang ke habit di jendela yang terlihat
+        self._vars: List[tk.BooleanVar] = []            # checkbox state per slot
+        self._checks: List[ttk.Checkbutton] = []        # widget checklist per slot (dipakai ulang)
+        self._check_ids: List[Optional[str]] = []       # habit di tiap slot (None = slot kosong)
+        self._check_offset = 0                          # index habit pertama yang terlihat
+        self._check_total = 0                           # jumlah habit aktif yang cocok dengan filter
+
         # selection state (MUST exist before refresh)
         self._selected_habit_id: str | None = None      # habit yang sedang dipilih untuk Edit / Hapus
         self._habit_id_map: list[str] = []
+        self._habit_names: list[str] = []
+        self._selector_total = 0                        # habit aktif yang cocok dengan filter (yang dimuat bisa lebih sedikit)
+
+        # render terakhir, untuk reconcile (hanya yang berubah yang disentuh)
+        self._rows: Dict[str, Dict[str, Any]] = {}      # baris summary per habit
+        self._tree_values: Dict[str, Tuple] = {}        # values + warna yang sudah tampil di Treeview
+        self._tree_order: List[str] = []
+        self._tree_total = 0                            # jumlah baris summary keseluruhan (yang dimuat bisa lebih sedikit)
+        self._sort: Optional[str] = None                # key sort Treeview (lihat HabitTracker.SORT_KEYS)
+        self._sort_desc = False
+
+        # check-in dari proses lain (di-merge saat simpan / hot reload) → render ulang habit itu saja
+        self._tracker.on_external_change = self._on_external_change
 
         self._build_layout()                            # membangun UI
         self.refresh()                                  # render data awal
+        self._schedule_flush()                          # write-behind: flush berkala
+        if self._worker is not None:
+            self._poll_worker()
+        if self._watcher is not None:
+            self.after(self.WATCH_POLL_MS, self._schedule_watch)
 
     # ---------- UI build ----------
     def _build_layout(self) -> None:
@@ -51,12 +100,16 @@ class HabitTrackerUI(ttk.Frame):
         selector_frame = ttk.LabelFrame(left, text="Pilih Habit (untuk Edit / Hapus)")
         selector_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
 
+        # diisi per halaman dari habit_page (filter "Cari" yang sama), bukan dari jendela checklist
         self._habit_listbox = tk.Listbox(
             selector_frame,
             height=4,
             exportselection=False
         )
+        self._selector_scroll = ttk.Scrollbar(selector_frame, orient="vertical", command=self._habit_listbox.yview)
+        self._selector_scroll.pack(side="right", fill="y", pady=5)
         self._habit_listbox.pack(fill="x", padx=5, pady=5)
+        self._habit_listbox.configure(yscrollcommand=self._on_selector_scroll)
         self._habit_listbox.bind("<<ListboxSelect>>", self._on_select_habit)    # event: user memilih habit
 
         # ----- Header -----
@@ -82,11 +135,41 @@ class HabitTrackerUI(ttk.Frame):
         ttk.Button(btns, text="Pilih Tanggal", command=self._on_pick_date).grid(row=0, column=3, padx=3)
         ttk.Button(btns, text="Hari Ini", command=self._on_today).grid(row=0, column=4, padx=3)
 
-        # ----- Checklist -----
+        # ----- Filter (awalan nama) -----
+        search = ttk.Frame(left)
+        search.grid(row=2, column=0, sticky="ew", padx=10, pady=(8, 0))
+        search.columnconfigure(1, weight=1)
+        ttk.Label(search, text="Cari:").grid(row=0, column=0, padx=(0, 4))
+        self._filter_var = tk.StringVar()
+        entry = ttk.Entry(search, textvariable=self._filter_var)
+        entry.grid(row=0, column=1, sticky="ew")
+        entry.bind("<KeyRelease>", self._on_filter)
+
+        # ----- Checklist (virtual) -----
         self._list_frame = ttk.Frame(left)
         self._list_frame.grid(row=3, column=0, sticky="nsew", padx=10, pady=10)
         self._list_frame.columnconfigure(0, weight=1)
 
+        self._check_scroll = ttk.Scrollbar(self._list_frame, orient="vertical", command=self._on_check_scroll)
+        self._check_scroll.grid(row=0, column=1, rowspan=self.CHECK_ROWS, sticky="ns")
+        for slot in range(self.CHECK_ROWS):
+            var = tk.BooleanVar(value=False)
+            cb = ttk.Checkbutton(
+                self._list_frame,
+                text="",
+                variable=var,
+                command=lambda _slot=slot: self._on_toggle_slot(_slot),
+            )
+            self._vars.append(var)
+            self._checks.append(cb)
+            self._check_ids.append(None)            # belum di-grid sampai dipakai
+
+        # scroll roda mouse (Windows / macOS: MouseWheel, X11: Button-4/5)
+        for widget in (self._list_frame, *self._checks):
+            widget.bind("<MouseWheel>", self._on_check_wheel)
+            widget.bind("<Button-4>", self._on_check_wheel)
+            widget.bind("<Button-5>", self._on_check_wheel)
+
         # ================= RIGHT PANEL =================
         right = ttk.LabelFrame(self, text="Weekly Summary & Streak")
         right.grid(row=0, column=1, sticky="nsew")
@@ -111,7 +194,12 @@ class HabitTrackerUI(ttk.Frame):
             show="headings",
             height=12,
         )
-        self._tree.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+        self._tree.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=10)
+
+        # halaman berikutnya dimuat saat scroll mendekati baris terakhir yang sudah dimuat
+        self._tree_scroll = ttk.Scrollbar(right, orient="vertical", command=self._tree.yview)
+        self._tree_scroll.grid(row=1, column=1, sticky="ns", padx=(0, 10), pady=10)
+        self._tree.configure(yscrollcommand=self._on_tree_scroll)
 
         for col, w in [
             ("name", 200),
@@ -122,13 +210,21 @@ class HabitTrackerUI(ttk.Frame):
             ("cur", 70),
             ("long", 70),
         ]:
-            self._tree.heading(col, text=col.capitalize())
+            sort = self.SORTABLE_COLUMNS.get(col)
+            if sort is None:
+                self._tree.heading(col, text=col.capitalize())
+            else:
+                self._tree.heading(col, text=col.capitalize(), command=lambda _sort=sort: self._on_sort(_sort))
             self._tree.column(col, width=w, anchor="center" if col != "name" else "w")
 
         self.pack(fill="both", expand=True)
 
     # ---------- Refresh ----------
     def refresh(self) -> None:
+        """
+        Render ulang berdasarkan data tracker, tapi secara diff:
+        widget yang sudah ada dipakai ulang, hanya yang berubah yang di-update.
+        """
         import datetime as _dt
 
         self._today_label.config(
@@ -138,34 +234,209 @@ class HabitTrackerUI(ttk.Frame):
             )
         )
 
-        # ----- rebuild habit selector -----
-        self._habit_listbox.delete(0, tk.END)
-        self._habit_id_map.clear()
-        self._selected_habit_id = None
-
-        for h in self._tracker.list_habits(active_only=True):
-            self._habit_listbox.insert(tk.END, h.get_name())
-            self._habit_id_map.append(h.get_id())
-
-        # ----- rebuild checklist -----
-        for w in self._list_frame.winfo_children():
-            w.destroy()
-        self._vars.clear()
+        self._render_checklist()
+        self._render_selector()
+        self._refresh_summary()
+
+    def _refresh_summary(self, reset: bool = False) -> None:
+        """
+        Weekly summary per halaman: hanya baris yang sudah pernah dimuat (minimal satu halaman)
+        yang dihitung ulang & dirender; reset=True (filter / sort berubah) → kembali ke halaman pertama.
+        """
+        loaded = self.TREE_PAGE if reset else max(self.TREE_PAGE, len(self._tree_order))
+        params = self._summary_params(offset=0, limit=loaded)
+        if reset:
+            self._tree.yview_moveto(0)
+
+        if self._worker is None:
+            self._apply_summary(self._tracker.summary_page(**params))
+            return
+
+        # thread UI hanya mengambil snapshot (clone habit yang berubah saja);
+        # auto-freeze & hitungan di worker, freeze yang terjadi di salinan diterapkan balik di _on_summary_done
+        snap = self._tracker.snapshot()
+        self._toggled_since_summary.clear()
+        self._worker.submit(
+            "summary",
+            lambda: (snap.summary_page(**params), snap.changed_ids()),
+            on_done=self._on_summary_done,
+            on_error=self._on_worker_error,
+        )
 
-        for i, (hid, name, done) in enumerate(
-            self._tracker.get_checklist_for_date(self._selected_date)):
-            var = tk.BooleanVar(value=done)
-            self._vars[hid] = var
-            cb = ttk.Checkbutton(
-                self._list_frame,
-                text=name,
-                variable=var,
-                command=lambda _hid=hid: self._on_toggle(_hid),
-            )
-            cb.grid(row=i, column=0, sticky="w", pady=3)
+    def _on_summary_done(self, result: Tuple[Dict[str, Any], List[str]]) -> None:
+        summary, frozen_ids = result
+        self._tracker.apply_auto_freeze(habit_ids=frozen_ids)      # hanya habit itu; ikut tersimpan
+        if not self._closed:
+            self._apply_summary(summary)
+
+    def _apply_summary(self, summary: Dict[str, Any]) -> None:
+        self._rows = {h["id"]: h for h in summary["habits"]}
+        self._tree_total = summary["total"]
+        self._render_summary_head(summary)
+        self._sync_tree(summary["habits"])
+
+        # habit yang di-toggle saat summary dihitung: hasil salinan sudah basi
+        for hid in self._toggled_since_summary:
+            if hid in self._rows:
+                self._refresh_habit(hid)
+        self._toggled_since_summary.clear()
+
+    def _refresh_habit(self, habit_id: str) -> None:
+        """Hitung ulang & render ulang summary untuk SATU habit saja."""
+        self._refresh_rows([habit_id])
+
+    def _refresh_rows(self, habit_ids: List[str], recheck_total: bool = False) -> None:
+        """
+        Render ulang baris habit tertentu (di thread UI, hanya baris itu) + angka agregat.
+        recheck_total=True → jika jumlah baris summary berubah (habit jadi nonaktif), daftar disusun ulang.
+        """
+        for habit_id in habit_ids:
+            row = self._tracker.habit_summary(habit_id)
+            if habit_id in self._rows:              # baris di halaman yang belum dimuat tidak dirender
+                self._rows[habit_id] = row
+                self._render_tree_row(row)
+        self._recheck_total = self._recheck_total or recheck_total
+        self._refresh_head()
+
+    def _refresh_head(self) -> None:
+        """Angka agregat dari SEMUA habit (baris lain diambil dari row cache tracker)."""
+        params = self._summary_params(offset=0, limit=0)
+        if self._worker is None:
+            self._on_head_done(self._tracker.summary_page(**params, auto_freeze=False))
+            return
+
+        # agregat melewati semua habit → di worker, dari snapshot; klik beruntun cukup satu job (key sama)
+        snap = self._tracker.snapshot()
+        self._worker.submit(
+            "head",
+            lambda: snap.summary_page(**params, auto_freeze=False),
+            on_done=self._on_head_done,
+            on_error=self._on_worker_error,
+        )
 
-        # ----- weekly summary -----
-        summary = self._tracker.weekly_summary()
+    def _on_head_done(self, head: Dict[str, Any]) -> None:
+        if self._closed:
+            return
+        self._render_summary_head(head)
+        recheck, self._recheck_total = self._recheck_total, False
+        if recheck and head["total"] != self._tree_total:   # habit keluar dari daftar → susun ulang
+            self._refresh_summary()
+
+    def _load_more_rows(self) -> None:
+        """Muat halaman summary berikutnya (dipanggil saat Treeview di-scroll sampai bawah)."""
+        page = self._tracker.summary_page(
+            **self._summary_params(offset=len(self._tree_order), limit=self.TREE_PAGE), auto_freeze=False
+        )
+        self._tree_total = page["total"]
+        # urutan bisa bergeser sejak halaman sebelumnya dimuat → jangan dobel
+        new = [r for r in page["habits"] if r["id"] not in self._rows]
+        if not new:
+            self._tree_total = len(self._tree_order)    # tidak ada lagi yang bisa dimuat sampai refresh
+            return
+        for r in new:
+            self._rows[r["id"]] = r
+        self._sync_tree([self._rows[hid] for hid in self._tree_order] + new)
+
+    def _summary_params(self, offset: int, limit: int) -> Dict[str, Any]:
+        return {
+            "offset": offset,
+            "limit": limit,
+            "prefix": self._filter_var.get(),
+            "sort": self._sort,
+            "descending": self._sort_desc,
+        }
+
+    # ----- habit selector -----
+    def _render_selector(self, reset: bool = False) -> None:
+        """Isi ulang halaman selector yang sudah dimuat; reset=True (filter berubah) → halaman pertama."""
+        loaded = self.SELECTOR_PAGE if reset else max(self.SELECTOR_PAGE, len(self._habit_id_map))
+        habits, self._selector_total = self._tracker.habit_page(
+            0, loaded, active_only=True, prefix=self._filter_var.get() or None
+        )
+        self._sync_selector([(h.get_id(), h.get_name()) for h in habits])
+
+    def _on_selector_scroll(self, first: str, last: str) -> None:
+        self._selector_scroll.set(first, last)
+        if float(last) < 1.0 or len(self._habit_id_map) >= self._selector_total:
+            return
+        # scroll sampai bawah → muat halaman berikutnya
+        habits, self._selector_total = self._tracker.habit_page(
+            len(self._habit_id_map), self.SELECTOR_PAGE, active_only=True, prefix=self._filter_var.get() or None
+        )
+        known = set(self._habit_id_map)
+        new = [(h.get_id(), h.get_name()) for h in habits if h.get_id() not in known]
+        if new:
+            self._sync_selector(list(zip(self._habit_id_map, self._habit_names)) + new)
+        else:
+            self._selector_total = len(self._habit_id_map)     # urutan bergeser; sisanya saat refresh
+
+    def _sync_selector(self, items: List[Tuple[str, str]]) -> None:
+        ids = [hid for hid, _ in items]
+        names = [name for _, name in items]
+
+        if names != self._habit_names:
+            for i, name in enumerate(names):
+                if i < len(self._habit_names):
+                    if self._habit_names[i] == name:
+                        continue
+                    self._habit_listbox.delete(i)
+                self._habit_listbox.insert(i, name)
+            if len(self._habit_names) > len(names):
+                self._habit_listbox.delete(len(names), tk.END)
+
+        self._habit_id_map = ids
+        self._habit_names = names
+
+        # pertahankan pilihan jika habit-nya masih ada
+        self._habit_listbox.selection_clear(0, tk.END)
+        if self._selected_habit_id in ids:
+            self._habit_listbox.selection_set(ids.index(self._selected_habit_id))
+        else:
+            self._selected_habit_id = None
+
+    # ----- checklist -----
+    def _render_checklist(self) -> None:
+        """Ambil satu jendela checklist dari tracker lalu bind ke slot widget."""
+        prefix = self._filter_var.get()
+        page, total = self._tracker.checklist_page(self._selected_date, self._check_offset, self.CHECK_ROWS, prefix)
+        last = max(0, total - self.CHECK_ROWS)
+        if self._check_offset > last:               # habit dihapus / filter menyempit → geser ke akhir
+            self._check_offset = last
+            page, total = self._tracker.checklist_page(self._selected_date, last, self.CHECK_ROWS, prefix)
+        self._check_total = total
+
+        self._sync_checklist(page)
+        if total:
+            self._check_scroll.set(self._check_offset / total, (self._check_offset + len(page)) / total)
+        else:
+            self._check_scroll.set(0.0, 1.0)
+
+    def _sync_checklist(self, checklist: List[Tuple[str, str, bool]]) -> None:
+        for slot, cb in enumerate(self._checks):
+            if slot >= len(checklist):
+                if self._check_ids[slot] is not None:
+                    cb.grid_remove()
+                    self._check_ids[slot] = None
+                continue
+
+            hid, name, done = checklist[slot]
+            var = self._vars[slot]
+            if var.get() != done:
+                var.set(done)
+            if cb.cget("text") != name:
+                cb.config(text=name)
+            if self._check_ids[slot] is None:
+                cb.grid(row=slot, column=0, sticky="w", pady=3)
+            self._check_ids[slot] = hid
+
+    def _scroll_checklist(self, offset: int) -> None:
+        offset = max(0, min(offset, self._check_total - self.CHECK_ROWS))
+        if offset != self._check_offset:
+            self._check_offset = offset
+            self._render_checklist()
+
+    # ----- summary -----
+    def _render_summary_head(self, summary: Dict[str, Any]) -> None:
         self._summary_head.config(
             text=(
                 f"🗓️ Minggu: {summary['week_start']} → {summary['week_end']}\n"
@@ -177,25 +448,48 @@ class HabitTrackerUI(ttk.Frame):
             )
         )
 
-        self._tree.delete(*self._tree.get_children())
-        for h in summary["habits"]:
-            tag = f"streak_{h['id']}"
-            self._tree.insert(
-                "",
-                "end",
-                iid=h["id"],
-                values=(
-                    h["name"],
-                    f"{h['done_days']}/7",
-                    h["completion_rate"],
-                    h.get("badge") or "⏳ Keep Going",
-                    f"🧊 {h.get('freeze_left', 0)}",
-                    h["current_streak"],
-                    h["longest_streak"],
-                ),
-                tags=(tag,),
-            )
-            self._tree.tag_configure(tag, foreground=self._streak_color(h["current_streak"]))
+    def _sync_tree(self, rows: List[Dict[str, Any]]) -> None:
+        order = [h["id"] for h in rows]
+        alive = set(order)
+
+        stale = [iid for iid in self._tree_order if iid not in alive]
+        if stale:
+            self._tree.delete(*stale)
+            for iid in stale:
+                self._tree_values.pop(iid, None)
+
+        for h in rows:
+            self._render_tree_row(h)
+
+        if order != self._tree_order:
+            for index, iid in enumerate(order):
+                self._tree.move(iid, "", index)
+            self._tree_order = order
+
+    def _render_tree_row(self, h: Dict[str, Any]) -> None:
+        iid = h["id"]
+        values = (
+            h["name"],
+            f"{h['done_days']}/7",
+            h["completion_rate"],
+            h.get("badge") or "⏳ Keep Going",
+            f"🧊 {h.get('freeze_left', 0)}",
+            h["current_streak"],
+            h["longest_streak"],
+        )
+        color = self._streak_color(h["current_streak"])
+        rendered = self._tree_values.get(iid)
+        if rendered == (values, color):
+            return                                      # tidak berubah → Tk tidak disentuh
+
+        tag = f"streak_{iid}"
+        if rendered is None:
+            self._tree.insert("", "end", iid=iid, values=values, tags=(tag,))
+        else:
+            self._tree.item(iid, values=values)
+        if rendered is None or rendered[1] != color:
+            self._tree.tag_configure(tag, foreground=color)
+        self._tree_values[iid] = (values, color)
 
     # ---------- Selection ----------
     def _on_select_habit(self, event) -> None:
@@ -207,10 +501,51 @@ class HabitTrackerUI(ttk.Frame):
             raise ValueError("Pilih habit terlebih dahulu.")
         return self._selected_habit_id
 
+    # ---------- Scroll / filter / sort ----------
+    def _on_check_scroll(self, action: str, amount: str, unit: str = "units") -> None:
+        # protokol command Scrollbar: ("moveto", fraksi) atau ("scroll", n, "units" | "pages")
+        if action == "moveto":
+            self._scroll_checklist(int(float(amount) * self._check_total))
+        else:
+            step = self.CHECK_ROWS if unit == "pages" else 1
+            self._scroll_checklist(self._check_offset + int(amount) * step)
+
+    def _on_check_wheel(self, event) -> None:
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll_checklist(self._check_offset - 3)
+        else:
+            self._scroll_checklist(self._check_offset + 3)
+
+    def _on_tree_scroll(self, first: str, last: str) -> None:
+        self._tree_scroll.set(first, last)
+        if float(last) >= 1.0 and len(self._tree_order) < self._tree_total:
+            self._load_more_rows()
+
+    def _on_filter(self, _event=None) -> None:
+        self._check_offset = 0
+        self._render_checklist()
+        self._render_selector(reset=True)
+        self._refresh_summary(reset=True)
+
+    def _on_sort(self, sort: str) -> None:
+        if self._sort == sort:
+            self._sort_desc = not self._sort_desc
+        else:
+            self._sort = sort
+            self._sort_desc = sort != "name"        # angka: terbesar dulu
+        self._refresh_summary(reset=True)
+
     # ---------- Actions ----------
-    def _on_toggle(self, habit_id: str) -> None:
-        self._tracker.set_done_on_date(habit_id, self._selected_date, bool(self._vars[habit_id].get()))
-        self.refresh()
+    def _on_toggle_slot(self, slot: int) -> None:
+        habit_id = self._check_ids[slot]
+        if habit_id is not None:
+            self._on_toggle(habit_id, bool(self._vars[slot].get()))
+
+    def _on_toggle(self, habit_id: str, done: bool) -> None:
+        self._tracker.set_done_on_date(habit_id, self._selected_date, done)
+        self._refresh_habit(habit_id)           # checkbox sudah benar, cukup summary habit ini
+        if self._worker is not None:
+            self._toggled_since_summary.add(habit_id)
 
     def _on_pick_date(self) -> None:
         s = simpledialog.askstring("Pilih Tanggal", "Masukkan tanggal (YYYY-MM-DD):")
@@ -247,8 +582,100 @@ class HabitTrackerUI(ttk.Frame):
             defaultextension=".csv",
             filetypes=[("CSV Files", "*.csv")],
         )
-        if path:
+        if not path:
+            return
+        if self._worker is None:
             self._tracker.export_week_csv(path)
+            return
+
+        snap = self._tracker.snapshot()
+
+        def export() -> List[str]:
+            snap.export_week_csv(path)
+            return snap.changed_ids()
+
+        self._worker.submit(
+            "export",
+            export,
+            on_done=lambda frozen_ids: self._tracker.apply_auto_freeze(habit_ids=frozen_ids),
+            on_error=self._on_worker_error,
+        )
+
+    # ---------- Persistence ----------
+    FLUSH_POLL_MS = 500
+
+    WORKER_POLL_MS = 50
+
+    WATCH_POLL_MS = 1000
+
+    def _schedule_flush(self) -> None:
+        # tracker sendiri yang memutuskan apakah flush sudah waktunya
+        if self._worker is None:
+            self._tracker.flush_if_due()
+        elif self._tracker.flush_due() and not self._worker.is_busy("save"):
+            # satu job simpan sekaligus; mutasi selama job jalan ikut job berikutnya
+            job = self._tracker.detach_flush()
+            if job is not None:
+                self._worker.submit("save", job, on_done=self._on_saved, on_error=self._on_save_error)
+        self.after(self.FLUSH_POLL_MS, self._schedule_flush)
+
+    def _poll_worker(self) -> None:
+        self._worker.poll()
+        self.after(self.WORKER_POLL_MS, self._poll_worker)
+
+    def _schedule_watch(self) -> None:
+        if self._watcher is None:                   # close() sudah dipanggil
+            return
+        # stat file murah; baca ulang + diff per habit hanya saat file diubah proses lain
+        if self._worker is None:
+            if self._watcher.check():               # interval sudah diatur after()
+                self._watcher.apply()
+        elif not self._worker.is_busy("save") and not self._worker.is_busy("watch"):
+            self._worker.submit("watch", self._watcher.check, on_done=self._on_watched, on_error=self._on_worker_error)
+        self.after(self.WATCH_POLL_MS, self._schedule_watch)
+
+    def _on_watched(self, changed: bool) -> None:
+        # job simpan yang masih jalan membawa data lama → delta diambil setelah job itu selesai
+        if changed and self._watcher is not None and not self._worker.is_busy("save"):
+            self._watcher.apply()
+
+    def _on_saved(self, _result: Any) -> None:
+        if not self._worker.is_busy("save"):    # job simpan berikutnya sudah jalan → tunggu giliran itu
+            self._tracker.sync_external()       # perubahan proses lain → memori (+ refresh lewat callback)
+
+    def _on_external_change(self, habit_ids: List[str]) -> None:
+        """Habit yang diubah proses lain: checklist (satu jendela) + baris summary habit itu saja."""
+        self._render_checklist()
+        self._render_selector()                 # nama / status aktif bisa berubah
+        if not all(hid in self._rows for hid in habit_ids):
+            self._refresh_summary()             # habit baru / dihapus / di luar halaman yang dimuat
+            return
+        try:
+            self._refresh_rows(habit_ids, recheck_total=True)
+        except ValueError:                      # habit sudah tidak ada
+            self._refresh_summary()
+
+    def _on_save_error(self, error: Exception) -> None:
+        self._tracker.mark_unsaved()            # dicoba lagi sebagai snapshot penuh
+        self._on_worker_error(error)
+
+    def _on_worker_error(self, error: Exception) -> None:
+        if not self._closed:                    # window sudah tutup → flush terakhir yang melapor
+            messagebox.showerror("Error", str(error))
+
+    def close(self) -> None:
+        """
+        Dipanggil setelah mainloop selesai (widget sudah dihancurkan), sebelum flush terakhir:
+        - hot reload berhenti & callback render dilepas dari tracker
+          → sync_external di flush terakhir tidak menyentuh widget (TclError)
+        - job background yang tersisa diselesaikan; hasilnya hanya diterapkan ke tracker
+        """
+        self._closed = True
+        self._watcher = None
+        self._tracker.on_external_change = None
+        if self._worker is not None:
+            self._worker.shutdown(wait=True)
+            self._worker.poll()
 
     # ---------- UI helper ----------
     def _streak_color(self, streak: int) -> str:
@@ -0,0 +1,63 @@
+"""
+Hot reload: perubahan file data oleh proses lain (cron, CLI, GUI kedua) masuk ke tracker
+yang sedang jalan tanpa load ulang penuh. Polling stat saja, tanpa dependency tambahan.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional
+import time
+
+from storage import BaseStorage
+from tracker import HabitTracker
+
+
+class DataWatcher:
+    """
+    DataWatcher = polling perubahan storage oleh proses lain
+
+    - check(): murah selama file tidak berubah (satu os.stat); jika berubah, storage membaca ulang
+      dan menghitung delta per habit (lihat JsonStorage.refresh_external).
+      Boleh dipanggil dari thread mana pun (worker / flusher)
+    - apply(): terapkan delta ke tracker → tracker.on_external_change(ids),
+      jadi UI cukup merender habit yang berubah.
+      Dipanggil di thread pemilik tracker, saat tidak ada job simpan yang masih jalan
+    - poll(): check + apply, dibatasi interval (untuk loop satu thread)
+
+    Storage tanpa hot reload (journal / sqlite / memory) → check() selalu False.
+    """
+
+    def __init__(
+        self,
+        tracker: HabitTracker,
+        storage: BaseStorage,
+        interval_ms: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._tracker = tracker
+        self._storage = storage
+        self._interval = interval_ms / 1000
+        self._clock = clock
+        self._last_check: Optional[float] = None
+
+    def due(self) -> bool:
+        """Interval polling sudah lewat sejak check() terakhir?"""
+        return self._last_check is None or self._clock() - self._last_check >= self._interval
+
+    def check(self) -> bool:
+        """True → ada delta dari proses lain yang menunggu apply()."""
+        self._last_check = self._clock()
+        return self._storage.refresh_external()
+
+    def apply(self) -> List[str]:
+        """Terapkan delta yang sudah terkumpul; return id habit yang berubah."""
+        return self._tracker.sync_external()
+
+    def poll(self) -> List[str]:
+        if not self.due() or not self.check():
+            return []
+        return self.apply()
+
+    @staticmethod
+    def supported(storage: Any) -> bool:
+        """Storage ini bisa mendeteksi perubahan proses lain tanpa save?"""
+        return type(storage).refresh_external is not BaseStorage.refresh_external
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Optional, Tuple
+import threading
+
+
+Callback = Optional[Callable[[Any], None]]
+
+
+class BackgroundWorker:
+    """
+    BackgroundWorker = satu thread untuk pekerjaan berat di luar event loop UI
+
+    - Job dikirim lewat submit(key, fn, on_done, on_error)
+    - Job dengan key sama yang BELUM mulai diganti job terbaru
+      (klik beruntun = satu job pending, bukan antrean panjang)
+    - fn jalan di worker thread; callback TIDAK langsung dipanggil di sana,
+      tapi dikumpulkan dan dijalankan saat poll() dipanggil
+      dari thread UI (misalnya lewat `after()` Tkinter)
+
+    Worker tidak tahu Tkinter, jadi bisa dipakai ulang di luar UI.
+    """
+
+    def __init__(self, name: str = "habit-worker") -> None:
+        self._cond = threading.Condition()
+        self._pending: OrderedDict[str, Tuple[Callable[[], Any], Callback, Callback]] = OrderedDict()
+        self._results: Deque[Tuple[Callback, Any]] = deque()
+        self._running: Optional[str] = None
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    # ---------- API (thread UI) ----------
+    def submit(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        on_done: Callback = None,
+        on_error: Callback = None,
+    ) -> None:
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Worker sudah dihentikan.")
+            self._pending[key] = (fn, on_done, on_error)     # key sama → job lama diganti
+            self._cond.notify()
+
+    def is_busy(self, key: Optional[str] = None) -> bool:
+        """Ada job (dengan key tertentu) yang masih pending / sedang jalan?"""
+        with self._cond:
+            if key is None:
+                return bool(self._pending) or self._running is not None
+            return key in self._pending or self._running == key
+
+    def poll(self) -> int:
+        """Jalankan callback hasil job yang sudah selesai. Return jumlah callback."""
+        count = 0
+        while True:
+            with self._cond:
+                if not self._results:
+                    return count
+                callback, value = self._results.popleft()
+            if callback is not None:
+                callback(value)
+            count += 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Berhenti menerima job; job yang sudah masuk tetap diselesaikan."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if wait:
+            self._thread.join()
+
+    # ---------- worker thread ----------
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                key, (fn, on_done, on_error) = self._pending.popitem(last=False)
+                self._running = key
+
+            try:
+                result: Tuple[Callback, Any] = (on_done, fn())
+            except Exception as e:
+                result = (on_error, e)
+
+            with self._cond:
+                self._results.append(result)
+                self._running = None
@@ -0,0 +1,8 @@
+"""
+Modul aplikasi memakai import datar (`from habit import ...`) karena dijalankan dari
+folder habit_tracker/, jadi folder itu dimasukkan ke sys.path untuk test.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "habit_tracker"))
@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import bench                                        # noqa: E402
+from datagen import generate_dataset                # noqa: E402
+from storage import MemoryStorage                   # noqa: E402
+from tracker import HabitTracker                    # noqa: E402
+
+END = date(2025, 12, 31)
+
+
+def _monday(iso):
+    d = date.fromisoformat(iso)
+    return d.toordinal() - d.weekday()
+
+
+def test_dataset_is_deterministic_per_seed():
+    a = generate_dataset(20, 1.0, seed=7, end=END)
+    assert json.dumps(a) == json.dumps(generate_dataset(20, 1.0, seed=7, end=END))
+    assert a != generate_dataset(20, 1.0, seed=8, end=END)
+
+
+def test_dataset_follows_density_and_freeze_cap():
+    sparse = generate_dataset(30, 1.0, completion_density=0.2, freeze_density=1.0, seed=1, end=END,
+                              freeze_max_per_week=2)
+    dense = generate_dataset(30, 1.0, completion_density=0.9, freeze_density=0.0, seed=1, end=END)
+
+    def done_ratio(data):
+        done = sum(len(r["completion_dates"]) for r in data["habits"])
+        days = sum((END - date.fromisoformat(r["created_at"])).days + 1 for r in data["habits"])
+        return done / days
+
+    assert done_ratio(sparse) < 0.35 < 0.75 < done_ratio(dense)
+    assert not any(r["frozen_dates"] for r in dense["habits"])
+    for r in sparse["habits"]:
+        assert max(Counter(map(_monday, r["frozen_dates"])).values(), default=0) <= 2
+        assert not set(r["frozen_dates"]) & set(r["completion_dates"])
+
+    t = HabitTracker(MemoryStorage(sparse))
+    t.load()
+    assert len(t.list_habits()) == 30
+
+
+def test_suite_report_is_json_and_comparable(tmp_path, capsys):
+    args = argparse.Namespace(habits=8, years=0.2, completion_density=0.7, freeze_density=0.3,
+                              seed=3, repeat=2, toggles=2)
+    report = json.loads(json.dumps(bench.run_suite(args)))
+    assert report["meta"]["params"]["habits"] == 8
+    for name, r in report["results"].items():
+        assert r["p50_ms"] >= 0, name
+
+    slower = {"results": {name: dict(r, p50_ms=r["p50_ms"] * 10 + 1) for name, r in report["results"].items()}}
+    assert bench.compare(slower, report, threshold=1.2) == sum(1 for r in report["results"].values() if r["p50_ms"])
+    assert bench.compare(report, report, threshold=1.2) == 0
+    capsys.readouterr()
@@ -0,0 +1,50 @@
+from datetime import date
+import json
+
+import pytest
+
+import cli
+from storage import JsonStorage
+from tracker import HabitTracker
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    paths = []
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.json"
+        tracker = HabitTracker(JsonStorage(str(path)))
+        tracker.add_habit("Baca buku")
+        paths.append(str(path))
+    return paths
+
+
+def test_export_many_files_without_placeholder_prints_hint(data_files, tmp_path, capsys):
+    argv = ["-f", data_files[0], "-f", data_files[1], "export", str(tmp_path / "out.csv")]
+
+    assert cli.main(argv) == 2
+    err = capsys.readouterr().err
+    assert "{name}" in err and err.startswith("export:")
+    assert not (tmp_path / "out.csv").exists()
+
+
+def test_export_many_files_with_placeholder(data_files, tmp_path, capsys):
+    out = str(tmp_path / "out" / "{name}.csv")
+
+    assert cli.main(["-f", data_files[0], "-f", data_files[1], "export", out]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["output"] for r in lines] == [out.replace("{name}", n) for n in ("a", "b")]
+
+
+def test_checkin_by_name(data_files, capsys):
+    assert cli.main(["-f", data_files[0], "checkin", "baca buku", "--date", "2025-06-04"]) == 0
+    assert json.loads(capsys.readouterr().out)["done"] is True
+
+    tracker = HabitTracker(JsonStorage(data_files[0]))
+    tracker.load()
+    assert tracker.list_habits()[0].is_done_on(date(2025, 6, 4))
+
+
+def test_missing_file_is_reported_per_file(tmp_path, capsys):
+    assert cli.main(["-f", str(tmp_path / "nope.json"), "summary"]) == 1
+    assert "tidak ditemukan" in capsys.readouterr().err
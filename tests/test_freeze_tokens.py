@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from daybits import WeekCounts
+from habit import DailyHabit, Habit
+
+MONDAY = date(2025, 6, 2)
+
+
+def _day(n):
+    return MONDAY + timedelta(days=n)
+
+
+def _counts(h):
+    return h._freeze_weeks.items()
+
+
+def _counts_from_bitmap(h):
+    weeks = {}
+    for o in h._frozen_dates.ordinals():
+        weeks[WeekCounts.monday(o)] = weeks.get(WeekCounts.monday(o), 0) + 1
+    return sorted(weeks.items())
+
+
+def test_tokens_reset_at_week_boundary():
+    h = Habit("h1", "Lari", date(2025, 1, 1))
+    assert h.try_freeze_date(_day(6))                   # Minggu
+    assert h.freeze_remaining_for_week(_day(0)) == 0
+    assert not h.try_freeze_date(_day(5))
+    assert h.freeze_remaining_for_week(_day(7)) == 1    # Senin berikutnya → minggu baru
+    assert h.try_freeze_date(_day(7))
+    assert h.try_freeze_date(_day(6))                   # sudah frozen → tidak makan token lagi
+    assert _counts(h) == [(_day(0).toordinal(), 1), (_day(7).toordinal(), 1)]
+
+
+def test_counter_rebuilt_by_from_dict():
+    h = DailyHabit("h1", "Lari", date(2025, 1, 1))
+    DailyHabit.FREEZE_MAX_PER_WEEK = 2
+    try:
+        assert h.try_freeze_dates([_day(1), _day(3), _day(4), _day(20), _day(-3)]) == [
+            _day(-3), _day(1), _day(3), _day(20)]
+        for lazy in (False, True):
+            back = Habit.from_dict(h.to_dict(), lazy=lazy)
+            assert _counts(back) == _counts(h) == _counts_from_bitmap(h)
+            assert back.freeze_remaining_for_week(_day(2)) == 0
+            assert back.freeze_remaining_for_week(_day(21)) == 1
+            assert not back.try_freeze_date(_day(5))
+    finally:
+        del DailyHabit.FREEZE_MAX_PER_WEEK
+
+
+def test_counter_follows_merge_replay_and_clone():
+    h = Habit("h1", "Lari", date(2025, 1, 1))
+    h.merge_history(frozen=[_day(1), _day(2)], done=[_day(10)])   # merge tidak memakai aturan token
+    assert h.freeze_remaining_for_week(_day(0)) == 0
+    h.merge_history(unfrozen=[_day(1), _day(2)])
+    assert h.freeze_remaining_for_week(_day(0)) == 1
+    assert _counts(h) == _counts_from_bitmap(h) == []
+
+    c = h.clone()
+    assert c.try_freeze_date(_day(3))
+    assert h.freeze_remaining_for_week(_day(3)) == 1              # salinan tidak berbagi counter
+
+    for d in (0, 2, 4, 8, 9):
+        h.mark_done(_day(d))
+    added, _ = h.replay_freezes()
+    assert added == [_day(-1), _day(1), _day(7)]                  # hari ke-3 kehabisan token minggu itu
+    assert _counts(h) == _counts_from_bitmap(h)
+    assert h.freeze_remaining_for_week(_day(3)) == 0
@@ -0,0 +1,96 @@
+"""
+Habit berbasis bitmap + StreakIndex dibandingkan dengan model lama (set[date]),
+yang disalin apa adanya di sini sebagai referensi perilaku.
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from habit import Habit
+
+FIRST = date(2025, 1, 6)
+
+
+class SetHabit:
+    FREEZE_MAX_PER_WEEK = 1
+
+    def __init__(self):
+        self.done, self.frozen = set(), set()
+
+    @staticmethod
+    def week_start(d):
+        return d - timedelta(days=d.weekday())
+
+    def freeze_remaining_for_week(self, ref):
+        ws = self.week_start(ref)
+        used = sum(1 for fd in self.frozen if self.week_start(fd) == ws)
+        return max(0, self.FREEZE_MAX_PER_WEEK - used)
+
+    def try_freeze_date(self, d):
+        if d in self.frozen:
+            return True
+        if self.freeze_remaining_for_week(d) > 0:
+            self.frozen.add(d)
+            return True
+        return False
+
+    def auto_freeze_yesterday_if_needed(self, ref):
+        y = ref - timedelta(days=1)
+        if ref in self.done and y not in self.done and y not in self.frozen:
+            return self.try_freeze_date(y)
+        return False
+
+    def current_streak(self, ref):
+        streak, d = 0, ref
+        while d in self.done or d in self.frozen:
+            streak += 1
+            d -= timedelta(days=1)
+        return streak
+
+    def longest_streak(self):
+        days = sorted(self.done | self.frozen)
+        if not days:
+            return 0
+        best = run = 1
+        for a, b in zip(days, days[1:]):
+            run = run + 1 if b == a + timedelta(days=1) else 1
+            best = max(best, run)
+        return best
+
+
+def _check(h, ref):
+    probe = [FIRST + timedelta(days=k) for k in range(-3, 95, 4)]
+    assert [h.is_done_on(d) for d in probe] == [d in ref.done for d in probe]
+    assert [h.is_frozen_on(d) for d in probe] == [d in ref.frozen for d in probe]
+    assert [h.current_streak(d) for d in probe] == [ref.current_streak(d) for d in probe]
+    assert [h.freeze_remaining_for_week(d) for d in probe] == [ref.freeze_remaining_for_week(d) for d in probe]
+    assert h.longest_streak() == ref.longest_streak()
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_bitmap_habit_matches_set_model(seed):
+    rng = random.Random(seed)
+    h, ref = Habit("x", "x", FIRST), SetHabit()
+    for step in range(600):
+        d = FIRST + timedelta(days=rng.randrange(90))
+        op = rng.random()
+        if op < 0.5:
+            h.mark_done(d)
+            ref.done.add(d)
+        elif op < 0.7:
+            h.unmark_done(d)
+            ref.done.discard(d)
+        elif op < 0.85:
+            assert h.try_freeze_date(d) == ref.try_freeze_date(d)
+        else:
+            assert h.auto_freeze_yesterday_if_needed(d) == ref.auto_freeze_yesterday_if_needed(d)
+        if step % 25 == 0:
+            _check(h, ref)
+    _check(h, ref)
+
+    data = h.to_dict()
+    assert data["completion_dates"] == sorted(d.isoformat() for d in ref.done)
+    assert data["frozen_dates"] == sorted(d.isoformat() for d in ref.frozen)
+    _check(Habit.from_dict(data), ref)
+    _check(Habit.from_dict(data, lazy=True), ref)
@@ -0,0 +1,90 @@
+import random
+from datetime import date, timedelta
+
+from daybits import DayBitmap
+from habit import Habit
+from streaks import StreakIndex
+
+BASE = date(2025, 6, 2).toordinal()          # Senin
+
+
+def _longest(days):
+    best = cur = 0
+    for o in range(min(days, default=0) - 1, max(days, default=0) + 2):
+        cur = cur + 1 if o in days else 0
+        best = max(best, cur)
+    return best
+
+
+def test_streak_index_matches_brute_force():
+    rng = random.Random(7)
+    idx, days = StreakIndex(), set()
+    for _ in range(2000):
+        o = BASE + rng.randrange(60)
+        if rng.random() < 0.6:
+            idx.add(o)
+            days.add(o)
+        else:
+            idx.remove(o)
+            days.discard(o)
+        assert idx.longest() == _longest(days)
+
+    probe = BASE + 30
+    expected = 0
+    while probe - expected in days:
+        expected += 1
+    assert idx.run_ending_at(probe) == expected
+
+    bm = DayBitmap()
+    for o in days:
+        bm.add_ordinal(o)
+    rebuilt = StreakIndex.from_bitmaps(bm, DayBitmap())
+    assert list(rebuilt._starts) == list(idx._starts) and rebuilt.longest() == idx.longest()
+
+
+def test_daybitmap_ordinals_and_counts():
+    rng = random.Random(3)
+    days = {BASE + rng.randrange(400) for _ in range(150)}
+    bm = DayBitmap(date.fromordinal(o) for o in days)
+    assert bm.ordinals() == sorted(days)
+    assert list(bm) == [date.fromordinal(o) for o in sorted(days)]
+    for lo in range(BASE - 10, BASE + 410, 5):
+        assert bm.count_ordinals(lo, lo + 6) == sum(lo <= o <= lo + 6 for o in days)
+
+
+def test_freeze_tokens_follow_frozen_days():
+    h = Habit("h1", "Lari", date(2025, 1, 1))
+    monday = date.fromordinal(BASE)
+    assert h.try_freeze_date(monday + timedelta(days=2))
+    assert h.freeze_remaining_for_week(monday + timedelta(days=6)) == 0
+    assert not h.try_freeze_date(monday + timedelta(days=4))
+    assert h.try_freeze_date(monday + timedelta(days=7))            # minggu berikutnya
+
+    h.merge_history(unfrozen=[monday + timedelta(days=2)])           # token minggu itu kembali
+    assert h.freeze_remaining_for_week(monday) == 1
+
+    restored = Habit.from_dict(h.to_dict())
+    assert restored.to_dict() == h.to_dict()
+    assert restored.freeze_remaining_for_week(monday + timedelta(days=7)) == 0
+
+
+def test_history_rows_count_through_public_api():
+    from storage import MemoryStorage
+    from tracker import HabitTracker
+
+    t = HabitTracker(MemoryStorage(), auto_flush=False)
+    hid = t.add_habit("Lari").get_id()
+    monday = date.fromordinal(BASE)
+    for k in (0, 1, 3, 8, 9, 30):
+        t.set_done_on_date(hid, monday + timedelta(days=k), True)
+    habit = t.list_habits()[0]
+    assert habit.try_freeze_dates([monday + timedelta(days=2), monday + timedelta(days=7)])
+    assert habit.count_done_between(monday, monday + timedelta(days=6)) == 3
+    assert habit.count_frozen_between(monday, monday + timedelta(days=6)) == 1
+
+    rows = list(t.iter_history_rows(monday, monday + timedelta(days=13), "week"))
+    assert [(r["done_days"], r["frozen_days"]) for r in rows] == [
+        (habit.count_done_between(monday + timedelta(days=w * 7), monday + timedelta(days=w * 7 + 6)),
+         habit.count_frozen_between(monday + timedelta(days=w * 7), monday + timedelta(days=w * 7 + 6)))
+        for w in (0, 1)
+    ] == [(3, 1), (2, 1)]
@@ -0,0 +1,89 @@
+import random
+from datetime import date
+
+import pytest
+
+from storage import JsonStorage, MemoryStorage
+from tracker import HabitTracker
+
+
+def _check(t, model):
+    """Index id & index aktif harus sama dengan model {id: aktif} (urutan sisip dijaga)."""
+    assert [h.get_id() for h in t.list_habits()] == list(model)
+    assert [h.get_id() for h in t.list_habits(active_only=True)] == [hid for hid, a in model.items() if a]
+    assert [h.get_id() for h in t.iter_habits(active_only=True)] == [hid for hid, a in model.items() if a]
+    for hid in model:
+        assert t.habit_summary(hid, date(2025, 6, 4), auto_freeze=False)["id"] == hid
+
+
+def test_index_follows_add_delete_and_active_changes():
+    rng = random.Random(5)
+    t = HabitTracker(MemoryStorage(), auto_flush=False)
+    model, deleted = {}, []
+    for step in range(300):
+        op = rng.random()
+        if op < 0.35 or not model:
+            hid = t.add_habit(f"habit {step}").get_id()
+            model[hid] = True
+        elif op < 0.5:
+            hid = rng.choice(list(model))
+            t.delete_habit(hid)
+            del model[hid]
+            deleted.append(hid)
+        else:
+            hid = rng.choice(list(model))
+            model[hid] = rng.random() < 0.5
+            t.set_habit_active(hid, model[hid])
+        if step % 25 == 0:
+            _check(t, model)
+    _check(t, model)
+    for hid in deleted[:5]:
+        with pytest.raises(ValueError):
+            t.edit_habit(hid, "hantu")
+
+    t.flush()
+    fresh = HabitTracker(t._storage)
+    fresh.load()
+    _check(fresh, model)
+    _check(t.snapshot(), model)
+
+
+def test_index_follows_external_changes():
+    t = HabitTracker(MemoryStorage(), auto_flush=False)
+    a, b, c = (t.add_habit(n).get_id() for n in ("Lari", "Baca", "Tidur"))
+    other = HabitTracker(MemoryStorage(), auto_flush=False)
+    new = other.add_habit("Yoga")
+    new.set_active(False)
+
+    active = t.list_habits(active_only=True)        # cache index aktif terisi
+    assert len(active) == 3
+    touched = t.apply_external_changes([
+        {"op": "active", "id": b, "value": False},
+        {"op": "delete", "id": c},
+        {"op": "add", "habit": new.to_dict()},
+        {"op": "active", "id": "tidak-ada", "value": False},
+    ])
+    assert touched == [b, c, new.get_id()]
+    _check(t, {a: True, b: False, new.get_id(): False})
+
+    t.apply_external_changes([{"op": "active", "id": new.get_id(), "value": True}])
+    _check(t, {a: True, b: False, new.get_id(): True})
+    with pytest.raises(ValueError):
+        t.set_habit_active(c, True)
+
+
+def test_lazy_and_active_only_load_build_the_same_index(tmp_path):
+    t = HabitTracker(JsonStorage(str(tmp_path / "habits.json")), auto_flush=False)
+    ids = [t.add_habit(f"habit {i}").get_id() for i in range(6)]
+    for hid in ids[::3]:
+        t.set_habit_active(hid, False)
+    t.flush()
+    model = {hid: i % 3 != 0 for i, hid in enumerate(ids)}
+
+    lazy = HabitTracker(t._storage)
+    lazy.load(lazy=True)
+    _check(lazy, model)
+
+    active = HabitTracker(t._storage)
+    active.load(active_only=True)
+    _check(active, {hid: True for hid, a in model.items() if a})
@@ -0,0 +1,96 @@
+from datetime import date
+
+from storage import JsonStorage, MemoryStorage
+from tracker import HabitTracker
+from watcher import DataWatcher
+
+D1, D2 = date(2025, 6, 2), date(2025, 6, 3)
+
+
+def _open(path, **kwargs):
+    storage = JsonStorage(path)
+    t = HabitTracker(storage, **kwargs)
+    t.load()
+    return t, storage
+
+
+def _by_name(tracker):
+    return {h.get_name(): h for h in tracker.list_habits()}
+
+
+def _setup(tmp_path):
+    path = str(tmp_path / "habits.json")
+    seed, _ = _open(path)
+    for name in ("Lari", "Baca", "Tidur"):
+        seed.add_habit(name)
+    seed.flush()
+    return path
+
+
+def test_external_edits_arrive_without_losing_local_changes(tmp_path):
+    path = _setup(tmp_path)
+    gui, storage = _open(path, auto_flush=False)
+    seen = []
+    gui.on_external_change = seen.append
+    watcher = DataWatcher(gui, storage)
+    ids = {h.get_name(): h.get_id() for h in gui.list_habits()}
+
+    gui.set_done_on_date(ids["Lari"], D1, True)             # belum disimpan
+    assert not watcher.check()                              # file belum berubah → hanya stat
+
+    cron, _ = _open(path)
+    cron.set_done_on_date(ids["Lari"], D2, True)
+    cron.edit_habit(ids["Baca"], "Baca buku")
+    cron.delete_habit(ids["Tidur"])
+    added = cron.add_habit("Meditasi").get_id()
+
+    assert watcher.check()
+    changed = watcher.apply()
+    assert set(changed) == {ids["Lari"], ids["Baca"], ids["Tidur"], added}
+    assert seen == [changed]
+
+    habits = _by_name(gui)
+    assert sorted(habits) == ["Baca buku", "Lari", "Meditasi"]
+    assert habits["Lari"].is_done_on(D1) and habits["Lari"].is_done_on(D2)
+    assert gui.is_dirty()                                   # check-in lokal masih menunggu flush
+    assert not watcher.check()
+
+    gui.flush()
+    again, _ = _open(path)
+    lari = _by_name(again)["Lari"]
+    assert lari.is_done_on(D1) and lari.is_done_on(D2) and "Tidur" not in _by_name(again)
+
+
+def test_save_between_check_and_apply_keeps_external_edit(tmp_path):
+    path = _setup(tmp_path)
+    gui, storage = _open(path, auto_flush=False)
+    watcher = DataWatcher(gui, storage)
+    lari = _by_name(gui)["Lari"].get_id()
+
+    cron, _ = _open(path)
+    cron.set_done_on_date(lari, D2, True)
+    assert watcher.check()
+
+    gui.set_done_on_date(lari, D1, True)
+    gui.flush()                                             # save sebelum delta diambil: merge dari dasar lama
+    watcher.apply()
+    assert _by_name(gui)["Lari"].is_done_on(D2)
+    assert _by_name(_open(path)[0])["Lari"].is_done_on(D1)
+
+
+def test_poll_respects_interval_and_unsupported_storage(tmp_path):
+    path = _setup(tmp_path)
+    gui, storage = _open(path, auto_flush=False)
+    now = [0.0]
+    watcher = DataWatcher(gui, storage, interval_ms=1000, clock=lambda: now[0])
+    assert watcher.poll() == []
+
+    cron, _ = _open(path)
+    cron.add_habit("Meditasi")
+    now[0] = 0.5
+    assert watcher.poll() == [] and "Meditasi" not in _by_name(gui)      # interval belum lewat
+    now[0] = 1.0
+    assert len(watcher.poll()) == 1 and "Meditasi" in _by_name(gui)
+
+    assert DataWatcher.supported(storage)
+    assert not DataWatcher.supported(MemoryStorage())
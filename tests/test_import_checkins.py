@@ -0,0 +1,67 @@
+import json
+from datetime import date
+
+import pytest
+
+from storage import MemoryStorage
+from tracker import HabitTracker
+
+DAY = date(2025, 6, 4)
+
+
+def _tracker():
+    t = HabitTracker(MemoryStorage())
+    return t, t.add_habit("Lari").get_id()
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_csv_short_row_defaults_to_done(tmp_path):
+    t, hid = _tracker()
+    t.set_done_on_date(hid, date(2025, 6, 3), True)
+    path = _write(tmp_path, "in.csv", f"habit_id,date,done\n{hid},2025-06-04\n{hid},2025-06-03,no\n")
+    assert t.import_checkins(path) == 2
+    habit = t.list_habits()[0]
+    assert habit.is_done_on(DAY) and not habit.is_done_on(date(2025, 6, 3))
+
+
+def test_jsonl_values(tmp_path):
+    t, hid = _tracker()
+    lines = [
+        {"habit_id": hid, "date": "2025-06-02"},
+        {"habit_id": hid, "date": "2025-06-03", "done": None},
+        {"habit_id": hid, "date": "2025-06-04", "done": "yes"},
+        {"habit_id": hid, "date": "2025-06-05", "done": 0},
+    ]
+    path = _write(tmp_path, "in.jsonl", "\n".join(json.dumps(r) for r in lines) + "\n\n")
+    assert t.import_checkins(path) == 4
+    habit = t.list_habits()[0]
+    assert [habit.is_done_on(date(2025, 6, d)) for d in (2, 3, 4, 5)] == [True, True, True, False]
+
+
+@pytest.mark.parametrize("bad, message", [
+    ("[1, 2]", "Baris 2: check-in harus berupa objek"),
+    ('"x"', "Baris 2: check-in harus berupa objek"),
+    ('{"habit_id": "a", "date": ', "Baris 2: JSON tidak valid"),
+    ('{"date": "2025-06-04"}', "Baris 2: data check-in tidak valid"),
+    ('{"habit_id": "a", "date": "2025-06-04", "done": "maybe"}', "Baris 2: nilai done tidak valid"),
+    ('{"habit_id": "a", "date": "2025-06-04", "done": [true]}', "Baris 2: nilai done tidak valid"),
+])
+def test_jsonl_bad_line_reports_line_number(tmp_path, bad, message):
+    t, hid = _tracker()
+    good = json.dumps({"habit_id": hid, "date": "2025-06-04"})
+    path = _write(tmp_path, "in.jsonl", f"{good}\n{bad}\n")
+    with pytest.raises(ValueError, match=message):
+        t.import_checkins(path)
+    assert not t.list_habits()[0].is_done_on(DAY)           # satu baris salah → tidak ada yang diterapkan
+
+
+def test_csv_missing_habit_id_reports_line_number(tmp_path):
+    t, hid = _tracker()
+    path = _write(tmp_path, "in.csv", f"date,habit_id\n2025-06-04,{hid}\n2025-06-05\n")
+    with pytest.raises(ValueError, match="Baris 3: data check-in tidak valid"):
+        t.import_checkins(path)
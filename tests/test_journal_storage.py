@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from storage import CorruptDataError, JournalStorage
+from tracker import HabitTracker
+
+START = date(2025, 1, 1)
+
+
+def _fill(storage, days=60):
+    t = HabitTracker(storage)
+    hid = t.add_habit("Lari").get_id()
+    for k in range(days):
+        t.set_done_on_date(hid, START + timedelta(days=k), True)
+    t.flush()
+    return t, hid
+
+
+def _loaded(storage):
+    t = HabitTracker(storage)
+    t.load()
+    return t
+
+
+def test_rotation_compacts_journal_into_snapshot(tmp_path):
+    path = str(tmp_path / "habits.json")
+    storage = JournalStorage(path, compact_threshold=512, background=False)
+    t, hid = _fill(storage)
+
+    assert os.path.exists(path)
+    assert not os.path.exists(path + ".journal.old")
+    assert os.path.getsize(path + ".journal") < 512           # journal baru, sisa sesudah rotate
+    again = _loaded(JournalStorage(path))
+    assert again.list_habits()[0].to_dict() == t.list_habits()[0].to_dict()
+
+
+def test_crash_during_compaction_keeps_rotated_journal(tmp_path):
+    path = str(tmp_path / "habits.json")
+    storage = JournalStorage(path, compact_threshold=10**9)
+    t, hid = _fill(storage, days=10)
+
+    os.replace(path + ".journal", path + ".journal.old")        # crash: sudah rotate, belum dilebur
+    with open(path + ".journal", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "done", "id": hid, "day": "2025-03-01"}) + "\n")
+        f.write('{"op": "done", "id": "')                       # baris terpotong (crash saat append)
+
+    expected = sorted(t.list_habits()[0].to_dict()["completion_dates"] + ["2025-03-01"])
+    recovered = JournalStorage(path, compact_threshold=1, background=False)
+    assert _loaded(recovered).list_habits()[0].to_dict()["completion_dates"] == expected
+
+    recovered._start_compaction()                                # sisa .old dilebur dulu
+    assert not os.path.exists(path + ".journal.old")
+    assert _loaded(JournalStorage(path)).list_habits()[0].to_dict()["completion_dates"] == expected
+
+
+def test_concurrent_triggers_start_one_compactor(tmp_path, monkeypatch):
+    path = str(tmp_path / "habits.json")
+    storage = JournalStorage(path, compact_threshold=1)
+    _fill(storage, days=3)
+    storage.wait_for_compaction()
+
+    started, release = [], threading.Event()
+    original = JournalStorage._compact_old_journal
+
+    def slow_compact(self):
+        started.append(threading.current_thread().name)
+        release.wait(5)
+        original(self)
+
+    monkeypatch.setattr(JournalStorage, "_compact_old_journal", slow_compact)
+    with open(path + ".journal", "a", encoding="utf-8") as f:
+        f.write("\n")
+    triggers = [threading.Thread(target=storage._start_compaction) for _ in range(8)]
+    for th in triggers:
+        th.start()
+    for th in triggers:
+        th.join(5)
+    release.set()
+    storage.wait_for_compaction()
+    assert started == ["journal-compactor"]
+
+
+def test_corrupt_snapshot_aborts_compaction(tmp_path):
+    path = str(tmp_path / "habits.json")
+    storage = JournalStorage(path, compact_threshold=10**9)
+    t, hid = _fill(storage, days=5)
+    storage.compact()
+    t.set_done_on_date(hid, START + timedelta(days=20), True)
+    t.flush()
+
+    with open(path, "r+", encoding="utf-8") as f:               # snapshot rusak di tengah file
+        f.seek(40)
+        f.write("\x00garbage")
+    with open(path, "rb") as f:
+        corrupt = f.read()
+
+    with pytest.raises(CorruptDataError):
+        storage.compact()
+    with open(path, "rb") as f:
+        assert f.read() == corrupt                               # snapshot lama tidak ditimpa
+    assert os.path.exists(path + ".journal.old")                 # journal tetap ada untuk dicoba lagi
+
+    auto = JournalStorage(path, compact_threshold=1, background=False)
+    assert auto.apply_changes([{"op": "done", "id": hid, "day": "2025-03-01"}])
+    assert isinstance(auto.compaction_error, CorruptDataError)
+    with open(path, "rb") as f:
+        assert f.read() == corrupt
+
+
+def test_append_is_fsynced_before_returning(tmp_path, monkeypatch):
+    path = str(tmp_path / "habits.json")
+    storage = JournalStorage(path, compact_threshold=10**9)
+    synced = []
+    real_fsync = os.fsync
+
+    def fsync(fd):
+        synced.append(os.path.getsize(path + ".journal"))
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    storage.apply_changes([{"op": "done", "id": "x", "day": "2025-01-01"}])
+    assert synced == [os.path.getsize(path + ".journal")]
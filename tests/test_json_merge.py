@@ -0,0 +1,150 @@
+import fcntl
+import json
+import os
+from datetime import date
+
+import pytest
+
+from storage import JsonStorage, LockTimeoutError, merge_habit_records
+from tracker import HabitTracker
+
+D1, D2, D3 = "2025-06-02", "2025-06-03", "2025-06-04"
+
+
+def _rec(hid, name="Lari", done=(), frozen=(), active=True):
+    return {"type": "Habit", "id": hid, "name": name, "created_at": "2025-01-01",
+            "is_active": active, "completion_dates": list(done), "frozen_dates": list(frozen)}
+
+
+# ---------- merge_habit_records ----------
+def test_rename_vs_delete_keeps_renamed_habit():
+    base = {"a": _rec("a")}
+    merged, external = merge_habit_records(base, [_rec("a", name="Jogging")], [])
+    assert merged == [_rec("a", name="Jogging")] and external == []
+
+    merged, external = merge_habit_records(base, [], [_rec("a", name="Jogging")])
+    assert merged == [_rec("a", name="Jogging")]
+    assert external == [{"op": "add", "habit": _rec("a", name="Jogging")}]
+
+
+def test_concurrent_renames_prefer_ours_but_keep_their_dates():
+    base = {"a": _rec("a")}
+    merged, external = merge_habit_records(
+        base, [_rec("a", name="Ours")], [_rec("a", name="Theirs", done=[D1])]
+    )
+    assert merged == [_rec("a", name="Ours", done=[D1])]
+    assert external == [{"op": "done", "id": "a", "day": D1}]
+
+
+def test_freeze_vs_done_conflict_is_resolved_per_date():
+    base = {"a": _rec("a", done=[D1], frozen=[D2])}
+    ours = _rec("a", done=[D1, D3], frozen=[D2])             # centang D3
+    theirs = _rec("a", done=[], frozen=[D3])                 # batal D1, unfreeze D2, freeze D3
+    merged, external = merge_habit_records(base, [ours], [theirs])
+    assert merged[0]["completion_dates"] == [D3]
+    assert merged[0]["frozen_dates"] == [D3]
+    assert {(c["op"], c["day"]) for c in external} == {("undone", D1), ("unfreeze", D2), ("freeze", D3)}
+
+
+def test_unrelated_habits_from_both_sides_are_kept_in_order():
+    merged, _ = merge_habit_records({}, [_rec("a")], [_rec("b"), "bukan habit"])
+    assert [h["id"] for h in merged] == ["a", "b"]
+
+
+# ---------- JsonStorage ----------
+def _tracker(path, **kwargs):
+    t = HabitTracker(JsonStorage(path), **kwargs)
+    t.load()
+    return t
+
+
+def test_two_writers_merge_rename_delete_and_checkins(tmp_path):
+    path = str(tmp_path / "habits.json")
+    seed = HabitTracker(JsonStorage(path))
+    a, b = seed.add_habit("Lari").get_id(), seed.add_habit("Baca").get_id()
+    seed.flush()
+
+    gui, cron = _tracker(path, auto_flush=False), _tracker(path)
+    cron.edit_habit(a, "Jogging")
+    cron.delete_habit(b)
+    cron.flush()
+
+    gui.set_done_on_date(a, date(2025, 6, 2), True)
+    gui.set_done_on_date(b, date(2025, 6, 2), True)          # habit yang dihapus cron tapi diubah di sini
+    gui.flush()
+
+    final = _tracker(path)
+    habits = {h.get_id(): h for h in final.list_habits()}
+    assert habits[a].get_name() == "Jogging" and habits[a].is_done_on(date(2025, 6, 2))
+    assert b in habits                                       # perubahan menang atas hapus
+    assert gui.list_habits()[0].get_name() == "Jogging"     # rename cron ikut ke memori gui
+
+
+def test_file_without_version_is_merged_and_versioned(tmp_path):
+    path = str(tmp_path / "habits.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"habits": [_rec("a")]}, f)                 # format lama, tanpa "version"
+
+    t = _tracker(path)
+    with open(path, "w", encoding="utf-8") as f:            # penulis lama mengubah file
+        json.dump({"habits": [_rec("a", done=[D1])]}, f)
+    t.set_done_on_date("a", date.fromisoformat(D2), True)
+    t.flush()
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["version"] == 1
+    assert data["habits"][0]["completion_dates"] == [D1, D2]
+
+
+def test_same_version_after_touch_is_not_merged(tmp_path):
+    path = str(tmp_path / "habits.json")
+    t = HabitTracker(JsonStorage(path))
+    hid = t.add_habit("Lari").get_id()
+    t.flush()
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))   # stat berubah, isi & version sama
+    t.delete_habit(hid)
+    t.flush()
+    assert _tracker(path).list_habits() == []               # tidak "dihidupkan lagi" oleh merge
+    assert t._storage.pop_external_changes() == []
+
+
+def test_mismatched_version_triggers_merge(tmp_path):
+    path = str(tmp_path / "habits.json")
+    t = HabitTracker(JsonStorage(path))
+    hid = t.add_habit("Lari").get_id()
+    t.flush()
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["version"] += 5
+    data["habits"][0]["completion_dates"] = [D1]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    t.set_done_on_date(hid, date.fromisoformat(D2), True)
+    t.flush()
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["version"] == data["version"] + 1
+    assert saved["habits"][0]["completion_dates"] == [D1, D2]
+
+
+def test_lock_timeout_keeps_changes_pending(tmp_path):
+    path = str(tmp_path / "habits.json")
+    t = HabitTracker(JsonStorage(path, lock_timeout=0.05), auto_flush=False)
+    hid = t.add_habit("Lari").get_id()
+    t.flush()
+
+    t.set_done_on_date(hid, date(2025, 6, 2), True)
+    with open(path + ".lock", "a+b") as holder:              # proses lain memegang lock
+        fcntl.flock(holder.fileno(), fcntl.LOCK_EX)
+        with pytest.raises(LockTimeoutError):
+            t.flush()
+        assert t.is_dirty()
+        fcntl.flock(holder.fileno(), fcntl.LOCK_UN)
+
+    assert t.flush()
+    assert _tracker(path).list_habits()[0].is_done_on(date(2025, 6, 2))
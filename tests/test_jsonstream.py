@@ -0,0 +1,89 @@
+import io
+import json
+
+import pytest
+
+from jsonstream import codec_for_path, iter_array_items, sniff_codec, text_reader, text_writer
+from storage import CorruptDataError, JsonStorage
+
+DOC = {
+    "owner": "Budi \"B\" \\ café 😀",
+    "habits": [
+        {"id": "a", "name": "Baca ], {buku}", "completion_dates": ["2025-06-02"], "n": 12345678901234},
+        {"id": "b", "name": "tab\tnewline\né😀", "nested": [[1, [2]], {"x": None}]},
+        -0.5e-3,
+        "string item",
+    ],
+    "version": 7,
+}
+
+
+def _items(text, chunk_size=4, meta=None):
+    return list(iter_array_items(io.StringIO(text), "habits", meta, chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_items_and_meta_survive_any_chunking(chunk_size, ensure_ascii):
+    text = json.dumps(DOC, ensure_ascii=ensure_ascii, indent=1)
+    meta = {}
+    items = _items(text, chunk_size, meta)
+    assert [value for value, _ in items] == DOC["habits"]
+    assert [json.loads(raw) for _, raw in items] == DOC["habits"]     # teks elemen utuh
+    assert meta == {"owner": DOC["owner"], "version": 7}
+
+
+def test_empty_and_missing_array():
+    assert _items('{"habits": []}') == []
+    assert _items("{}") == []
+    meta = {}
+    assert _items('{"version": 1}', meta=meta) == [] and meta == {"version": 1}
+
+
+def test_every_truncation_is_an_error():
+    text = json.dumps(DOC)
+    for cut in range(len(text)):
+        with pytest.raises(json.JSONDecodeError):
+            _items(text[:cut], chunk_size=5)
+
+
+@pytest.mark.parametrize("bad", ['{"habits": [1 2]}', '{"habits": [1,]}', '{1: 2}', '[1, 2]', '{"habits": [1]]'])
+def test_malformed_json_raises(bad):
+    with pytest.raises(json.JSONDecodeError):
+        _items(bad)
+
+
+@pytest.mark.parametrize("codec", [None, "gzip", "xz", "lzma"])
+def test_compressed_roundtrip(codec):
+    raw = io.BytesIO()
+    with text_writer(raw, codec) as f:
+        json.dump(DOC, f, ensure_ascii=False)
+    raw.seek(0)
+    assert sniff_codec(raw) == (codec if codec != "lzma" else None)      # .lzma tanpa magic → dari ekstensi
+    with text_reader(raw, codec) as f:
+        assert [v for v, _ in iter_array_items(f, "habits")] == DOC["habits"]
+
+
+@pytest.mark.parametrize("name", ["habits.json.gz", "habits.json.xz"])
+def test_storage_reads_and_keeps_compression(tmp_path, name):
+    path = str(tmp_path / name)
+    records = [{"id": "a", "name": "Lari", "created_at": "2025-01-01", "is_active": True,
+                "completion_dates": ["2025-06-02"], "frozen_dates": []}]
+    JsonStorage(path).save({"habits": records})
+    with open(path, "rb") as f:
+        assert sniff_codec(f) == codec_for_path(path)
+    assert list(JsonStorage(path).iter_habits()) == records
+
+
+@pytest.mark.parametrize("name", ["habits.json.gz", "habits.json.xz"])
+def test_truncated_compressed_file_is_corrupt(tmp_path, name):
+    path = str(tmp_path / name)
+    JsonStorage(path).save({"habits": [{"id": str(i), "name": "x" * 50} for i in range(200)]})
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[: len(data) // 2])
+
+    with pytest.raises(CorruptDataError):
+        list(JsonStorage(path).iter_habits())
+    assert JsonStorage(path).load() == {"habits": []}
@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from datagen import generate_dataset                # noqa: E402
+from habit import Habit                             # noqa: E402
+from storage import JsonStorage                     # noqa: E402
+from tracker import HabitTracker                    # noqa: E402
+
+END = date(2025, 6, 30)
+
+
+def _loaded(path, lazy):
+    t = HabitTracker(JsonStorage(path))
+    t.load(lazy=lazy)
+    return t
+
+
+def _results(t):
+    return (
+        t.weekly_summary(END, auto_freeze=False),
+        [(h.get_id(), h.current_streak(END), h.longest_streak(), h.to_dict()) for h in t.list_habits()],
+    )
+
+
+def test_lazy_load_defers_history_until_used(tmp_path):
+    path = str(tmp_path / "habits.json")
+    JsonStorage(path).save(generate_dataset(12, 0.5, seed=4, end=END))
+
+    lazy = _loaded(path, lazy=True)
+    habits = lazy.list_habits()
+    assert not any(h.is_hydrated() for h in habits)
+    assert habits[0].is_done_on(END) in (True, False)
+    assert habits[0].is_hydrated() and not any(h.is_hydrated() for h in habits[1:])
+
+    assert _results(lazy) == _results(_loaded(path, lazy=False))
+
+
+def test_untouched_habits_are_saved_from_raw_strings(tmp_path):
+    path = str(tmp_path / "habits.json")
+    JsonStorage(path).save(generate_dataset(5, 0.5, seed=9, end=END))
+    with open(path, encoding="utf-8") as f:
+        before = {r["id"]: r for r in json.load(f)["habits"]}
+
+    t = _loaded(path, lazy=True)
+    first = t.list_habits()[0]
+    t.set_done_on_date(first.get_id(), END, not first.is_done_on(END))
+    t.flush()
+
+    assert [h.is_hydrated() for h in t.list_habits()] == [True, False, False, False, False]
+    with open(path, encoding="utf-8") as f:
+        after = {r["id"]: r for r in json.load(f)["habits"]}
+    for hid, record in before.items():
+        if hid != first.get_id():
+            for key in ("name", "created_at", "is_active", "completion_dates", "frozen_dates"):
+                assert after[hid][key] == record[key]
+
+
+def test_raw_history_round_trip_and_unpadded_dates():
+    data = {
+        "type": "DailyHabit", "id": "h1", "name": "Lari", "created_at": "2025-6-1",
+        "completion_dates": ["2025-06-03", "2025-6-2", "2025-06-03"],
+        "frozen_dates": ["2025-6-4"],
+    }
+    lazy = Habit.from_dict(data, lazy=True)
+    assert lazy.to_dict()["completion_dates"] == ["2025-06-03", "2025-6-2"]   # mentah: hanya dedup + urut
+    assert not lazy.is_hydrated()
+
+    eager = Habit.from_dict(data)
+    assert eager.to_dict()["created_at"] == "2025-06-01"
+    for h in (lazy, eager):
+        assert h.is_done_on(date(2025, 6, 2)) and h.is_done_on(date(2025, 6, 3))
+        assert h.is_frozen_on(date(2025, 6, 4))
+    assert lazy.to_dict() == eager.to_dict()
+    assert eager.to_dict()["completion_dates"] == ["2025-06-02", "2025-06-03"]
@@ -0,0 +1,109 @@
+import os
+import shutil
+import threading
+from datetime import date
+
+from habit import Habit
+from metrics import Instrumentation, instrument
+from storage import JsonStorage
+from tracker import HabitTracker
+
+
+def _saved(path):
+    t = HabitTracker(JsonStorage(path))
+    for name in ("Lari", "Baca", "Tidur"):
+        t.add_habit(name)
+    t.flush()
+    return t
+
+
+def test_streaming_load_is_timed_and_counts_bytes(tmp_path):
+    path = str(tmp_path / "habits.json")
+    _saved(path)
+
+    tracker = HabitTracker(JsonStorage(path))
+    with instrument(tracker, per_habit=False) as inst:
+        tracker.load()
+        snap = inst.snapshot()
+
+    assert len(tracker.list_habits()) == 3
+    assert snap["timers"]["storage.iter_habits"]["count"] == 1
+    assert snap["timers"]["tracker.load"]["count"] == 1
+    assert snap["counters"]["storage.bytes_read"] == os.path.getsize(path)
+    assert "iter_habits" not in vars(tracker._storage)          # disable() mengembalikan method asli
+
+
+def test_write_behind_flushes_are_attributed_to_actions(tmp_path):
+    tracker = HabitTracker(JsonStorage(str(tmp_path / "habits.json")), flush_every=1000)
+    with instrument(tracker, per_habit=False) as inst:
+        hid = tracker.add_habit("Lari").get_id()
+        for day in range(1, 5):
+            tracker.set_done_on_date(hid, date(2025, 6, day), True)
+
+        job = tracker.detach_flush()                # seperti UI / server: job jalan di thread lain
+        worker = threading.Thread(target=job)
+        worker.start()
+        worker.join()
+
+        tracker.set_done_on_date(hid, date(2025, 6, 5), True)
+        tracker.flush()                             # flush sinkron di luar aksi
+        tracker.checklist_page(date(2025, 6, 5))
+        snap = inst.snapshot()
+
+    actions = snap["writes_per_action"]
+    assert actions["add_habit"] == {"actions": 1, "writes": 1, "mean": 1.0}
+    assert actions["set_done_on_date"] == {"actions": 5, "writes": 2, "mean": 0.4}
+    assert snap["counters"]["storage.writes"] == 2
+    assert snap["timers"]["tracker.checklist_page"]["count"] == 1
+
+
+
+def _workload(path, out_dir, hids, instrumented):
+    """Skenario yang sama persis di tracker baru; dengan / tanpa instrumentasi."""
+    tracker = HabitTracker(JsonStorage(path), flush_every=3)
+    inst = instrument(tracker) if instrumented else None   # per_habit=True: method Habit ikut dibungkus
+    ref = date(2025, 6, 11)
+    results = []
+    try:
+        tracker.load()
+        for day in (2, 3, 5, 9, 10):
+            tracker.set_done_on_date(hids[0], date(2025, 6, day), True)
+        results.append(tracker.bulk_set_done([(hids[1], date(2025, 6, d), True) for d in range(1, 11)]))
+        csv_in = os.path.join(out_dir, "in.csv")
+        with open(csv_in, "w", encoding="utf-8") as f:
+            f.write(f"habit_id,date,done\n{hids[2]},2025-06-08\n{hids[1]},2025-06-04,no\n")
+        results.append(tracker.import_checkins(csv_in))
+        results.append(tracker.weekly_summary(ref))
+        results.append(tracker.habit_summary(hids[0], ref))
+        results.append([(h.get_id(), h.current_streak(ref), h.longest_streak()) for h in tracker.list_habits()])
+        tracker.export_week_csv(os.path.join(out_dir, "week.csv"), ref)
+        results.append(tracker.export_history(
+            os.path.join(out_dir, "history.jsonl"), date(2025, 6, 1), ref, fmt="jsonl"))
+        tracker.flush()
+    finally:
+        if inst is not None:
+            inst.disable()
+    for name in ("week.csv", "history.jsonl", os.path.basename(path)):
+        with open(os.path.join(out_dir, name), encoding="utf-8") as f:
+            results.append(f.read())
+    return results, inst
+
+
+def test_instrumentation_does_not_change_results(tmp_path):
+    seed = str(tmp_path / "seed.json")
+    hids = [h.get_id() for h in _saved(seed).list_habits()]
+    originals = {name: getattr(Habit, name) for name in Instrumentation.HABIT_METHODS}
+
+    runs = {}
+    for label in ("off", "on"):
+        out = tmp_path / label
+        out.mkdir()
+        path = str(out / "habits.json")
+        shutil.copy(seed, path)
+        runs[label] = _workload(path, str(out), hids, instrumented=(label == "on"))
+
+    assert runs["on"][0] == runs["off"][0]
+    snap = runs["on"][1].snapshot()
+    assert snap["timers"]["habit.current_streak"]["count"] >= len(hids)
+    assert snap["writes_per_action"]["import_checkins"]["actions"] == 1
+    assert {name: getattr(Habit, name) for name in originals} == originals   # disable() mengembalikan class
@@ -0,0 +1,59 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from storage import MemoryStorage
+from tracker import HabitTracker
+
+FIRST = date(2024, 12, 30)                   # Senin
+
+
+def _records(seed, n=40, days=120):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        density = rng.choice([0.0, 0.2, 0.6, 0.95])
+        done = {FIRST + timedelta(days=k) for k in range(days) if rng.random() < density}
+        frozen = {FIRST + timedelta(days=k) for k in range(days) if rng.random() < 0.05} - done
+        records.append({
+            "type": rng.choice(["Habit", "DailyHabit"]),
+            "id": f"h{i:03d}",
+            "name": f"habit {i}",
+            "created_at": FIRST.isoformat(),
+            "is_active": rng.random() < 0.8,
+            "completion_dates": sorted(d.isoformat() for d in done),
+            "frozen_dates": sorted(d.isoformat() for d in frozen),
+        })
+    return records
+
+
+def _tracker(records, use_numpy):
+    t = HabitTracker(MemoryStorage({"habits": [dict(r) for r in records]}), auto_flush=False, use_numpy=use_numpy)
+    t.load()
+    return t
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_summary_matches_python(seed):
+    records = _records(seed)
+    rng = random.Random(seed)
+    refs = [FIRST - timedelta(days=3), FIRST, FIRST + timedelta(days=6), FIRST + timedelta(days=7)]
+    refs += [FIRST + timedelta(days=rng.randrange(0, 140)) for _ in range(6)]   # termasuk setelah histori
+
+    for auto_freeze in (False, True):
+        python, vector = _tracker(records, False), _tracker(records, True)
+        for ref in refs:
+            expected = python.weekly_summary(ref, auto_freeze=auto_freeze)
+            assert vector.weekly_summary(ref, auto_freeze=auto_freeze) == expected
+            page = vector.summary_page(ref, offset=5, limit=10, auto_freeze=False)
+            assert page == python.summary_page(ref, offset=5, limit=10, auto_freeze=False)
+        assert [h.to_dict() for h in vector.list_habits()] == [h.to_dict() for h in python.list_habits()]
+
+
+def test_numpy_summary_of_empty_and_history_less_trackers():
+    for records in ([], [{**_records(0, n=1)[0], "is_active": True, "completion_dates": [], "frozen_dates": []}]):
+        python, vector = _tracker(records, False), _tracker(records, True)
+        assert vector.weekly_summary(FIRST, auto_freeze=False) == python.weekly_summary(FIRST, auto_freeze=False)
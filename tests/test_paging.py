@@ -0,0 +1,71 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from storage import MemoryStorage
+from tracker import HabitTracker
+
+REF = date(2025, 6, 4)
+
+
+@pytest.fixture(scope="module")
+def tracker():
+    rng = random.Random(5)
+    t = HabitTracker(MemoryStorage(), auto_flush=False)
+    for i in range(120):
+        h = t.add_habit(rng.choice(["Baca", "baca", "Lari", "Tidur"]) + f" {i:03d}")
+        for k in range(14):
+            if rng.random() < 0.5:
+                t.set_done_on_date(h.get_id(), REF - timedelta(days=k), True)
+        if i % 7 == 0:
+            t.set_habit_active(h.get_id(), False)
+    return t
+
+
+def _ids(habits):
+    return [h.get_id() for h in habits]
+
+
+@pytest.mark.parametrize("offset, limit", [(0, 10), (15, 25), (100, 50), (200, 5), (0, 0)])
+def test_habit_page_slices_the_full_list(tracker, offset, limit):
+    for active_only in (False, True):
+        full = tracker.list_habits(active_only=active_only)
+        page, total = tracker.habit_page(offset, limit, active_only=active_only)
+        assert _ids(page) == _ids(full[offset:offset + limit]) and total == len(full)
+
+        page, total = tracker.habit_page(offset, limit, active_only=active_only, descending=True)
+        assert _ids(page) == _ids(full[::-1][offset:offset + limit])
+
+
+def test_habit_page_prefix_and_sort(tracker):
+    baca = [h for h in tracker.list_habits(active_only=True) if h.get_name().lower().startswith("baca")]
+    page, total = tracker.habit_page(3, 8, active_only=True, prefix="BAC")
+    assert total == len(baca) and _ids(page) == _ids(baca[3:11])
+
+    by_name = sorted(tracker.list_habits(), key=lambda h: h.get_name().casefold())
+    page, total = tracker.habit_page(20, 10, sort="name")
+    assert _ids(page) == _ids(by_name[20:30]) and total == 120
+
+    with pytest.raises(ValueError):
+        tracker.habit_page(-1, 10)
+
+
+def test_summary_page_pages_rows_but_aggregates_everything(tracker):
+    full = tracker.weekly_summary(REF, auto_freeze=False)
+    total = len(full["habits"])
+    seen = []
+    for offset in range(0, total + 20, 20):
+        page = tracker.summary_page(REF, offset=offset, limit=20, auto_freeze=False)
+        assert page["total"] == total and page["offset"] == offset
+        assert page["overall_completion_rate"] == full["overall_completion_rate"]
+        assert page["best_current"] == full["best_current"]
+        seen += page["habits"]
+    assert seen == full["habits"]
+
+    top = tracker.summary_page(REF, offset=0, limit=5, sort="streak", descending=True, auto_freeze=False)
+    assert [r["current_streak"] for r in top["habits"]] == sorted(
+        (r["current_streak"] for r in full["habits"]), reverse=True)[:5]
+
+    lari = tracker.summary_page(REF, offset=0, limit=1000, prefix="lari", auto_freeze=False)
+    assert lari["total"] == len(lari["habits"]) == sum(r["name"].startswith("Lari") for r in full["habits"])
@@ -0,0 +1,77 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from habit import Habit
+from storage import MemoryStorage
+from tracker import HabitTracker
+
+FIRST = date(2025, 1, 6)                     # Senin
+
+
+def _done_days(rng, days=200):
+    density = rng.choice([0.3, 0.6, 0.85])
+    return [FIRST + timedelta(days=k) for k in range(days) if rng.random() < density]
+
+
+def _day_by_day(done):
+    """Aturan lama: auto-freeze dijalankan sekali per hari, berurutan."""
+    h = Habit("x", "x", FIRST)
+    h.merge_history(done=done)
+    day = FIRST
+    while day <= done[-1]:
+        h.auto_freeze_yesterday_if_needed(day)
+        day += timedelta(days=1)
+    return h
+
+
+@pytest.mark.parametrize("cap", [1, 2])
+def test_replay_equals_running_auto_freeze_every_day(monkeypatch, cap):
+    monkeypatch.setattr(Habit, "FREEZE_MAX_PER_WEEK", cap)
+    rng = random.Random(cap)
+    for _ in range(20):
+        done = _done_days(rng)
+        expected = _day_by_day(done)
+
+        h = Habit("x", "x", FIRST)
+        h.merge_history(done=done, frozen=[done[0] + timedelta(days=1), FIRST - timedelta(days=30)])
+        added, removed = h.replay_freezes(reset=True)
+        assert h.to_dict()["frozen_dates"] == expected.to_dict()["frozen_dates"]
+        assert FIRST - timedelta(days=30) in removed
+        assert h.longest_streak() == expected.longest_streak()
+        assert h.current_streak(done[-1]) == expected.current_streak(done[-1])
+        assert h.replay_freezes(reset=True) == ([], [])               # idempoten
+
+
+def test_replay_keep_existing_freezes_uses_their_tokens():
+    h = Habit("x", "x", FIRST)
+    h.merge_history(done=[FIRST + timedelta(days=3)], frozen=[FIRST])    # token minggu ini sudah dipakai
+    assert h.replay_freezes(reset=False) == ([], [])
+    assert h.replay_freezes(reset=True) == ([FIRST + timedelta(days=2)], [FIRST])
+
+
+def test_tracker_replay_persists_once_per_batch():
+    saves = []
+
+    class Storage(MemoryStorage):
+        def save(self, data):
+            saves.append(data)
+            super().save(data)
+
+    records = []
+    for i, done in enumerate(([0, 2, 4], [0, 1, 2], [5, 7])):
+        records.append({
+            "id": f"h{i}", "name": f"habit {i}", "created_at": FIRST.isoformat(),
+            "completion_dates": [(FIRST + timedelta(days=k)).isoformat() for k in done],
+        })
+    t = HabitTracker(Storage({"habits": records}))
+    t.load()
+
+    stats = t.replay_freezes()
+    assert stats == {"habits": 3, "changed": 3, "frozen": 4, "unfrozen": 0}
+    assert len(saves) == 1
+    frozen = {h["id"]: h["frozen_dates"] for h in saves[0]["habits"]}
+    assert frozen["h1"] == [(FIRST - timedelta(days=1)).isoformat()]
+    assert t.replay_freezes(["h0"]) == {"habits": 1, "changed": 0, "frozen": 0, "unfrozen": 0}
+    assert len(saves) == 1
@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+
+from storage import MemoryStorage
+from tracker import HabitTracker
+
+REF = date(2025, 6, 4)
+
+
+def _tracker(n, **kwargs):
+    t = HabitTracker(MemoryStorage(), auto_flush=False, **kwargs)
+    ids = [t.add_habit(f"habit {i}").get_id() for i in range(n)]
+    return t, ids
+
+
+def _misses_after_toggle(t, hid):
+    t.weekly_summary(REF, auto_freeze=False)
+    t.set_done_on_date(hid, REF, True)
+    hits, misses = t._row_cache.hits, t._row_cache.misses
+    t.weekly_summary(REF, auto_freeze=False)
+    return t._row_cache.hits - hits, t._row_cache.misses - misses
+
+
+def test_single_toggle_recomputes_one_row_beyond_4096_habits():
+    t, ids = _tracker(5000)
+    assert _misses_after_toggle(t, ids[1234]) == (4999, 1)
+    assert len(t._row_cache) == 5000
+
+
+def test_refs_are_evicted_lru_but_rows_of_one_ref_stay_together():
+    t, ids = _tracker(50, summary_cache_refs=2)
+    weeks = [REF - timedelta(weeks=k) for k in range(3)]
+    for ref in weeks:
+        t.weekly_summary(ref, auto_freeze=False)
+    stats = t._row_cache.stats()
+    assert stats["refs"] == 2 and stats["size"] == 100
+
+    misses = t._row_cache.misses
+    t.weekly_summary(weeks[-1], auto_freeze=False)          # ref terbaru masih utuh
+    assert t._row_cache.misses == misses
+    t.weekly_summary(weeks[0], auto_freeze=False)           # ref tertua sudah dibuang
+    assert t._row_cache.misses == misses + 50
+
+
+def test_deleted_habit_leaves_every_ref():
+    t, ids = _tracker(3)
+    t.weekly_summary(REF, auto_freeze=False)
+    t.weekly_summary(REF - timedelta(weeks=1), auto_freeze=False)
+    t.delete_habit(ids[0])
+    assert len(t._row_cache) == 4
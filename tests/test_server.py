@@ -0,0 +1,98 @@
+import http.client
+import json
+import threading
+
+import pytest
+from datetime import date
+
+import server
+from server import HabitService, _parse_checkin, serve
+from storage import MemoryStorage
+from tracker import HabitTracker
+
+DAY = date(2025, 6, 4)
+
+
+class BlockingStorage(MemoryStorage):
+    """save() menunggu sampai diizinkan → flush sedang berjalan di luar lock."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def save(self, data):
+        self.entered.set()
+        assert self.release.wait(5)
+        super().save(data)
+
+
+def _service(storage):
+    tracker = HabitTracker(storage, auto_flush=False)
+    hid = tracker.add_habit("Lari").get_id()
+    return HabitService(tracker, flush_interval_ms=60_000), tracker, hid
+
+
+def test_flush_serializes_outside_write_lock():
+    storage = BlockingStorage()
+    service, tracker, hid = _service(storage)
+    flusher = threading.Thread(target=service.flush)
+    flusher.start()
+    try:
+        assert storage.entered.wait(5)
+        assert service.checkin([(hid, DAY, True)]) == 1     # tidak terblokir oleh job flush
+        assert tracker.is_dirty()
+    finally:
+        storage.release.set()
+        flusher.join(5)
+        service.close()
+    assert storage.load()["habits"][0]["completion_dates"] == ["2025-06-04"]   # check-in ikut flush saat close()
+
+
+@pytest.mark.parametrize("value, expected", [(True, True), (False, False), (1, True), (0, False)])
+def test_parse_checkin_accepts_bool_and_0_1(value, expected):
+    assert _parse_checkin(1, {"habit_id": "h", "date": "2025-06-04", "done": value})[2] is expected
+
+
+@pytest.mark.parametrize("value", ["false", "0", "true", "", None, 2, 1.0, [], {}])
+def test_parse_checkin_rejects_non_boolean_done(value):
+    with pytest.raises(ValueError, match="done"):
+        _parse_checkin(1, {"habit_id": "h", "done": value})
+
+
+@pytest.fixture
+def http_server(monkeypatch):
+    monkeypatch.setattr(server, "STREAM_CHUNK_SIZE", 64)      # paksa banyak chunk
+    tracker = HabitTracker(MemoryStorage(), auto_flush=False)
+    for name in ("Lari", "Baca"):
+        hid = tracker.add_habit(name).get_id()
+        tracker.set_done_on_date(hid, DAY, True)
+    httpd = serve(tracker, port=0, flush_interval_ms=60_000)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    conn = http.client.HTTPConnection(*httpd.server_address, timeout=5)
+    yield conn
+    conn.close()
+    httpd.shutdown()
+    httpd.service.close()
+
+
+def test_export_history_is_streamed_chunked(http_server):
+    http_server.request("GET", "/export?start=2025-06-01&end=2025-06-07")
+    r = http_server.getresponse()
+    assert r.status == 200 and r.getheader("Transfer-Encoding") == "chunked"
+    lines = r.read().decode().splitlines()
+    assert lines[0].startswith("period_start,") and len(lines) == 1 + 7 * 2
+    assert sum(line.startswith("2025-06-04,") and ",1," in line for line in lines) == 2
+
+    # koneksi keep-alive tetap bisa dipakai sesudah body chunked
+    http_server.request("GET", "/export?start=2025-06-01&end=2025-06-30&granularity=month&format=jsonl")
+    r = http_server.getresponse()
+    rows = [json.loads(line) for line in r.read().splitlines()]
+    assert [row["done_days"] for row in rows] == [1, 1]
+
+
+def test_export_invalid_params_still_get_400(http_server):
+    http_server.request("GET", "/export?start=2025-06-07&end=2025-06-01")
+    r = http_server.getresponse()
+    assert r.status == 400 and "error" in json.loads(r.read())
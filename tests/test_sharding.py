@@ -0,0 +1,64 @@
+import os
+from datetime import date
+
+import pytest
+
+import sharding
+from sharding import ShardedTracker
+from storage import SqliteStorage
+
+REF = date(2025, 6, 4)
+
+
+@pytest.fixture
+def closed(monkeypatch):
+    calls = []
+    original = SqliteStorage.close
+
+    def close(self):
+        calls.append(self._filepath)
+        original(self)
+
+    monkeypatch.setattr(SqliteStorage, "close", close)
+    return calls
+
+
+def _shards(root, users, ext=".json"):
+    with ShardedTracker(str(root), ext=ext) as st:
+        for user in users:
+            t = st.tracker(user)
+            t.set_done_on_date(t.add_habit("Lari").get_id(), REF, True)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_invalid_user_is_reported_per_shard(tmp_path, max_workers):
+    _shards(tmp_path / "shards", ["ana", "budi"])
+    st = ShardedTracker(str(tmp_path / "shards"))
+    results = {r["user"]: r for r in st.weekly_summaries(REF, users=["ana", "../x", "budi"], max_workers=max_workers)}
+
+    assert results["../x"]["error"].startswith("ValueError")
+    assert [results[u]["summary"]["habits"][0]["done_days"] for u in ("ana", "budi")] == [1, 1]
+
+    out = {r["user"]: r for r in st.export_week_csv_all(str(tmp_path / "out"), REF, users=["", "ana"], max_workers=1)}
+    assert "error" in out[""] and out["ana"]["path"].endswith("ana.csv")
+
+
+def test_worker_and_tracker_close_sqlite_storage(tmp_path, closed):
+    root = tmp_path / "shards"
+    _shards(root, ["ana", "budi", "cici"], ext=".db")
+    assert len(closed) == 3                                  # close() / LRU melepas storage-nya
+
+    st = ShardedTracker(str(root), ext=".db", max_open=1)
+    st.tracker("ana")
+    st.tracker("budi")                                       # ana tergusur → storage ditutup
+    assert closed[-1].endswith("ana.db")
+
+    del closed[:]
+    results = list(st.weekly_summaries(REF, max_workers=1))  # budi dilepas dulu, lalu satu storage per shard
+    assert sorted(r["user"] for r in results) == ["ana", "budi", "cici"]
+    assert sorted(os.path.basename(p) for p in closed) == ["ana.db", "budi.db", "budi.db", "cici.db"]
+
+    del closed[:]
+    with pytest.raises(ValueError):
+        sharding._summarize_shard(str(root / "ana.db"), None, "not-a-date")
+    assert closed == [str(root / "ana.db")]
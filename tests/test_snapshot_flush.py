@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+
+from storage import JsonStorage, MemoryStorage
+from tracker import HabitTracker
+
+REF = date(2025, 6, 4)
+
+
+def _tracker(n=5):
+    t = HabitTracker(MemoryStorage(), auto_flush=False)
+    ids = [t.add_habit(f"habit {i}").get_id() for i in range(n)]
+    for hid in ids:
+        for k in range(1, 20):
+            t.set_done_on_date(hid, REF - timedelta(days=k), True)
+    return t, ids
+
+
+def test_snapshot_reuses_clones_and_shares_row_cache():
+    t, ids = _tracker()
+    t.summary_page(REF, auto_freeze=False)
+    hits = t._row_cache.hits
+
+    snap = t.snapshot()
+    snap.summary_page(REF, auto_freeze=False)
+    assert t._row_cache.hits == hits + len(ids)          # tidak ada baris yang dihitung ulang
+
+    again = t.snapshot()
+    assert again.list_habits()[0] is snap.list_habits()[0]   # habit tidak berubah → clone sama
+
+    t.set_done_on_date(ids[0], REF, False)
+    changed = t.snapshot().list_habits()
+    assert changed[0] is not snap.list_habits()[0] and changed[1] is snap.list_habits()[1]
+
+
+def test_snapshot_auto_freeze_is_copy_on_write():
+    t = HabitTracker(MemoryStorage(), auto_flush=False)
+    hid = t.add_habit("Lari").get_id()
+    t.set_done_on_date(hid, REF, True)                   # kemarin bolong → auto-freeze kandidat
+    t.flush()
+
+    shared = t.snapshot()
+    snap = t.snapshot()
+    summary = snap.summary_page(REF)
+    assert summary["habits"][0]["current_streak"] == 2
+    assert snap.changed_ids() == [hid]
+
+    yesterday = REF - timedelta(days=1)
+    assert not shared.list_habits()[0].is_frozen_on(yesterday)     # clone bersama tidak ikut berubah
+    assert not t.list_habits()[0].is_frozen_on(yesterday)
+
+    t.apply_auto_freeze(REF, habit_ids=snap.changed_ids())
+    assert t.list_habits()[0].is_frozen_on(yesterday) and t.is_dirty()
+
+
+def test_detached_flush_writes_state_at_detach_time(tmp_path):
+    path = str(tmp_path / "habits.json")
+    t = HabitTracker(JsonStorage(path), auto_flush=False)
+    hid = t.add_habit("Baca").get_id()
+    t.set_done_on_date(hid, REF, True)
+
+    job = t.detach_flush()
+    t.set_done_on_date(hid, REF + timedelta(days=1), True)      # setelah detach → job berikutnya
+    t.edit_habit(hid, "Baca buku")
+    job()
+
+    disk = HabitTracker(JsonStorage(path))
+    disk.load()
+    h = disk.list_habits()[0]
+    assert h.get_name() == "Baca" and h.is_done_on(REF) and not h.is_done_on(REF + timedelta(days=1))
+    assert t.is_dirty()
@@ -0,0 +1,45 @@
+import os
+import struct
+from datetime import date
+
+import pytest
+
+import snapshot
+from snapshot import SnapshotReader, write_snapshot
+from habit import Habit
+
+
+def _open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+@pytest.fixture
+def snap_path(tmp_path):
+    h = Habit("h1", "Lari", date(2025, 1, 1))
+    h.mark_done(date(2025, 1, 2))
+    path = str(tmp_path / "habits.snap")
+    write_snapshot(path, [h])
+    return path
+
+
+def test_reader_roundtrip(snap_path):
+    with SnapshotReader(snap_path) as r:
+        assert r.habit_ids() == ["h1"] and r.is_done_on("h1", date(2025, 1, 2))
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:10],                                     # header terpotong
+    lambda data: b"NOTASNAP" + data[8:],                        # magic salah
+    lambda data: data[:8] + struct.pack("<H", snapshot.VERSION + 1) + data[10:],
+    lambda data: data[:snapshot._HEADER.size + 4],              # directory terpotong
+], ids=["header", "magic", "version", "directory"])
+def test_invalid_file_raises_and_releases_handles(snap_path, corrupt):
+    with open(snap_path, "rb") as f:
+        data = f.read()
+    with open(snap_path, "wb") as f:
+        f.write(corrupt(data))
+
+    before = _open_fds()
+    with pytest.raises(ValueError):
+        SnapshotReader(snap_path)
+    assert _open_fds() == before                                # file & mmap sudah ditutup
@@ -0,0 +1,77 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from storage import SqliteStorage
+from tracker import HabitTracker
+
+START = date(2025, 6, 2)
+
+
+def _tracker(storage):
+    t = HabitTracker(storage)
+    t.load()
+    return t
+
+
+def test_wal_mode_and_schema(tmp_path):
+    path = str(tmp_path / "habits.db")
+    storage = SqliteStorage(path)
+    try:
+        assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        tables = {name for (name,) in storage._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {"habits", "completions", "freezes"} <= tables
+    finally:
+        storage.close()
+
+
+def test_tracker_pushes_row_changes_instead_of_snapshots(tmp_path, monkeypatch):
+    path = str(tmp_path / "habits.db")
+    storage = SqliteStorage(path)
+    saves = []
+    monkeypatch.setattr(storage, "save", lambda data: saves.append(data))
+
+    t = _tracker(storage)
+    hid = t.add_habit("Lari").get_id()
+    for k in range(5):
+        t.set_done_on_date(hid, START + timedelta(days=k), True)
+    t.set_done_on_date(hid, START + timedelta(days=2), False)
+    t.edit_habit(hid, "Lari pagi")
+    t.flush()
+    assert saves == []
+    expected = t.list_habits()[0].to_dict()
+    storage.close()
+
+    conn = sqlite3.connect(path)
+    days = [d for (d,) in conn.execute("SELECT day FROM completions WHERE habit_id = ? ORDER BY day", (hid,))]
+    conn.close()
+    assert days == expected["completion_dates"]
+
+    reopened = SqliteStorage(path)
+    try:
+        assert _tracker(reopened).list_habits()[0].to_dict() == expected
+    finally:
+        reopened.close()
+
+
+def test_apply_changes_is_atomic(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "habits.db"))
+    try:
+        t = _tracker(storage)
+        hid = t.add_habit("Lari").get_id()
+        t.flush()
+
+        with pytest.raises(sqlite3.IntegrityError):
+            storage.apply_changes([
+                {"op": "done", "id": hid, "day": "2025-06-02"},
+                {"op": "rename", "id": hid, "name": "Lari pagi"},
+                {"op": "done", "id": "tidak-ada", "day": "2025-06-03"},     # foreign key gagal
+            ])
+        habit = storage.load()["habits"][0]
+        assert habit["name"] == "Lari" and habit["completion_dates"] == []
+
+        storage.save({"habits": [{**habit, "completion_dates": ["2025-06-04"]}]})
+        assert storage.load()["habits"][0]["completion_dates"] == ["2025-06-04"]
+    finally:
+        storage.close()
@@ -0,0 +1,66 @@
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from storage import MemoryStorage
+from tracker import HabitTracker
+from ui import HabitTrackerUI
+
+
+@pytest.fixture
+def ui():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("tidak ada display untuk Tk")
+    root.withdraw()
+    t = HabitTracker(MemoryStorage(), auto_flush=False)
+    for i in range(5):
+        t.add_habit(f"habit {i}")
+    view = HabitTrackerUI(root, t)
+    yield view
+    view.close()
+    root.destroy()
+
+
+def _spy(monkeypatch, obj, name, calls):
+    original = getattr(obj, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append((name, args))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(obj, name, wrapper)
+
+
+@pytest.fixture
+def tk_calls(ui, monkeypatch):
+    calls = []
+    for name in ("insert", "item", "delete", "move", "tag_configure"):
+        _spy(monkeypatch, ui._tree, name, calls)
+    for var in ui._vars:
+        _spy(monkeypatch, var, "set", calls)
+    for cb in ui._checks:
+        _spy(monkeypatch, cb, "config", calls)
+    return calls
+
+
+def test_refresh_without_changes_touches_no_widget(ui, tk_calls):
+    ui.refresh()
+    assert tk_calls == []
+
+
+def test_toggle_rerenders_only_that_row(ui, tk_calls):
+    hid = ui._check_ids[2]
+    before = {iid: ui._tree_values[iid] for iid in ui._tree_order}
+
+    ui._vars[2].set(True)                           # seperti klik user pada checkbox
+    tk_calls.clear()
+    ui._on_toggle_slot(2)
+
+    touched = {args[0] for name, args in tk_calls if name in ("item", "tag_configure")}
+    assert touched <= {hid, f"streak_{hid}"} and hid in touched
+    assert not [c for c in tk_calls if c[0] in ("insert", "delete", "move", "set", "config")]
+    assert ui._tree_values[hid][0][1] == "1/7"
+    assert {iid: v for iid, v in ui._tree_values.items() if iid != hid} == {
+        iid: v for iid, v in before.items() if iid != hid}
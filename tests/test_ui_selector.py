@@ -0,0 +1,55 @@
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from storage import MemoryStorage
+from tracker import HabitTracker
+from ui import HabitTrackerUI
+
+
+@pytest.fixture
+def ui():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("tidak ada display untuk Tk")
+    root.withdraw()
+    t = HabitTracker(MemoryStorage(), auto_flush=False)
+    for i in range(250):
+        t.add_habit(f"habit {i:03d}")
+    t.set_habit_active(t.list_habits()[1].get_id(), False)
+    view = HabitTrackerUI(root, t)
+    yield view
+    view.close()
+    root.destroy()
+
+
+def _names(ui):
+    return list(ui._habit_names)
+
+
+def test_selector_is_filled_from_habit_pages(ui):
+    active = ui._tracker.list_habits(active_only=True)
+    page = HabitTrackerUI.SELECTOR_PAGE
+    assert ui._habit_id_map == [h.get_id() for h in active[:page]]       # bukan hanya jendela checklist
+
+    ui._on_selector_scroll("0.2", "0.6")                                 # belum sampai bawah
+    assert len(ui._habit_id_map) == page
+    ui._on_selector_scroll("0.9", "1.0")
+    assert ui._habit_id_map == [h.get_id() for h in active[:2 * page]]
+    for _ in range(3):
+        ui._on_selector_scroll("0.9", "1.0")
+    assert ui._habit_id_map == [h.get_id() for h in active]
+
+
+def test_selector_follows_filter_and_keeps_selection(ui):
+    ui._filter_var.set("habit 24")
+    ui._on_filter()
+    assert _names(ui) == [f"habit {i}" for i in range(240, 250)]
+
+    ui._habit_listbox.selection_set(3)
+    ui._on_select_habit(None)
+    selected = ui._selected_habit_id
+    ui._tracker.edit_habit(ui._habit_id_map[0], "habit 24x")
+    ui.refresh()
+    assert _names(ui)[0] == "habit 24x" and ui._selected_habit_id == selected
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from worker import BackgroundWorker
+
+
+@pytest.fixture
+def worker():
+    w = BackgroundWorker()
+    yield w
+    w.shutdown(wait=True)
+
+
+def _wait_idle(w, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while w.is_busy():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_callbacks_run_on_polling_thread(worker):
+    got = []
+    worker.submit("sum", lambda: (threading.current_thread().name, 1 + 2),
+                  on_done=lambda v: got.append((threading.current_thread().name, v)))
+    _wait_idle(worker)
+    assert got == []                                    # belum poll → callback belum jalan
+    assert worker.poll() == 1
+    assert got == [(threading.current_thread().name, ("habit-worker", 3))]
+    assert worker.poll() == 0
+
+
+def test_error_goes_to_on_error_and_worker_keeps_running(worker):
+    done, errors = [], []
+
+    def boom():
+        raise OSError("disk penuh")
+
+    worker.submit("save", boom, on_done=done.append, on_error=errors.append)
+    worker.submit("next", lambda: "ok", on_done=done.append)
+    _wait_idle(worker)
+    worker.poll()
+    assert done == ["ok"]
+    assert len(errors) == 1 and isinstance(errors[0], OSError)
+
+
+def test_pending_job_with_same_key_is_replaced(worker):
+    release = threading.Event()
+    ran = []
+    worker.submit("block", release.wait)
+    while not worker.is_busy("block") or "block" in worker._pending:
+        time.sleep(0.001)                               # job pertama sudah jalan
+    for i in range(5):
+        worker.submit("summary", lambda i=i: ran.append(i))
+    assert worker.is_busy("summary")
+    release.set()
+    _wait_idle(worker)
+    assert ran == [4]
+
+
+def test_shutdown_finishes_queued_jobs_then_rejects_new_ones():
+    w = BackgroundWorker()
+    got = []
+    w.submit("a", lambda: time.sleep(0.02) or "a", on_done=got.append)
+    w.submit("b", lambda: "b", on_done=got.append)
+    w.shutdown(wait=True)
+    w.poll()
+    assert got == ["a", "b"]
+    with pytest.raises(RuntimeError):
+        w.submit("c", lambda: None)
+
+
+def test_ui_delivers_results_through_after():
+    tk = pytest.importorskip("tkinter")
+    from storage import MemoryStorage
+    from tracker import HabitTracker
+    from ui import HabitTrackerUI
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("tidak ada display untuk Tk")
+    root.withdraw()
+    ui = HabitTrackerUI(root, HabitTracker(MemoryStorage(), auto_flush=False), background=True)
+    try:
+        got = []
+        ui._worker.submit("probe", lambda: threading.current_thread().name,
+                          on_done=lambda v: got.append((v, threading.current_thread().name)))
+        deadline = time.monotonic() + 5
+        while not got and time.monotonic() < deadline:
+            root.update()                               # event loop menjalankan _poll_worker lewat after()
+            time.sleep(0.01)
+        assert got == [("habit-worker", threading.current_thread().name)]
+    finally:
+        ui.close()
+        root.destroy()
@@ -0,0 +1,123 @@
+import threading
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import tracker as tracker_module
+from storage import JournalStorage, JsonStorage, MemoryStorage
+from tracker import HabitTracker
+
+DAY = date(2025, 6, 2)
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.saves = 0
+
+    def save(self, data):
+        self.saves += 1
+        super().save(data)
+
+
+def _days(n):
+    return [DAY + timedelta(days=k) for k in range(n)]
+
+
+def test_flush_every_coalesces_mutations():
+    storage = CountingStorage()
+    t = HabitTracker(storage, flush_every=5)
+    hid = t.add_habit("Lari").get_id()
+    for d in _days(3):
+        t.set_done_on_date(hid, d, True)
+    assert storage.saves == 0 and t.is_dirty()
+
+    t.set_done_on_date(hid, DAY + timedelta(days=3), True)     # mutasi ke-5
+    assert storage.saves == 1 and not t.is_dirty()
+
+    with t.batch():
+        for d in _days(12):
+            t.set_done_on_date(hid, d, False)
+    assert storage.saves == 2                                   # satu tulis di akhir batch
+    assert storage.load()["habits"][0]["completion_dates"] == []
+
+
+def test_flush_interval_uses_oldest_pending_mutation(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(tracker_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    storage = CountingStorage()
+    t = HabitTracker(storage, flush_every=1000, flush_interval_ms=500)
+    hid = t.add_habit("Lari").get_id()
+    now[0] += 0.3
+    t.set_done_on_date(hid, DAY, True)
+    assert storage.saves == 0 and not t.flush_if_due()
+
+    now[0] += 0.2                                               # 500 ms sejak mutasi PERTAMA
+    assert t.flush_due() and t.flush_if_due()
+    assert storage.saves == 1 and not t.flush_due()
+
+
+def test_exit_and_flush_write_everything(tmp_path):
+    path = str(tmp_path / "habits.json")
+    with HabitTracker(JsonStorage(path), flush_every=10**6, flush_interval_ms=10**9) as t:
+        hid = t.add_habit("Lari").get_id()
+        for d in _days(20):
+            t.set_done_on_date(hid, d, True)
+    again = HabitTracker(JsonStorage(path))
+    again.load()
+    assert again.list_habits()[0].to_dict()["completion_dates"] == [d.isoformat() for d in _days(20)]
+
+
+@pytest.mark.parametrize("make_storage", [
+    lambda path: JsonStorage(path),
+    lambda path: JournalStorage(path, compact_threshold=10**9),
+])
+def test_detach_flush_loses_nothing_written_meanwhile(tmp_path, make_storage):
+    path = str(tmp_path / "habits.json")
+    t = HabitTracker(make_storage(path), auto_flush=False)
+    hid = t.add_habit("Lari").get_id()
+    first, later = _days(10), _days(20)[10:]
+    for d in first:
+        t.set_done_on_date(hid, d, True)
+
+    job = t.detach_flush()
+    assert job is not None and not t.is_dirty()
+    for d in later:                                             # mutasi selama job jalan di thread lain
+        t.set_done_on_date(hid, d, True)
+    worker = threading.Thread(target=job)
+    worker.start()
+    worker.join()
+
+    on_disk = HabitTracker(make_storage(path))
+    on_disk.load()
+    assert on_disk.list_habits()[0].to_dict()["completion_dates"] == [d.isoformat() for d in first]
+
+    assert t.is_dirty() and t.flush()                           # flush terakhir saat close
+    on_disk = HabitTracker(make_storage(path))
+    on_disk.load()
+    assert on_disk.list_habits()[0].to_dict()["completion_dates"] == [d.isoformat() for d in first + later]
+
+
+def test_failed_job_is_rewritten_as_full_snapshot(tmp_path):
+    path = str(tmp_path / "habits.json")
+    storage = JournalStorage(path, compact_threshold=10**9)
+    t = HabitTracker(storage, auto_flush=False)
+    hid = t.add_habit("Lari").get_id()
+    t.flush()
+    t.set_done_on_date(hid, DAY, True)
+
+    def broken(changes):
+        raise OSError("disk penuh")
+
+    job = t.detach_flush()
+    storage.apply_changes = broken
+    with pytest.raises(OSError):
+        job()
+    t.mark_unsaved()
+    del storage.apply_changes
+
+    assert t.flush()                                            # snapshot penuh, bukan journal saja
+    again = HabitTracker(JournalStorage(path))
+    again.load()
+    assert again.list_habits()[0].is_done_on(DAY)